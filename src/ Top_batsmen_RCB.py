@@ -7,47 +7,54 @@ of their total runs.
 """
 
 import csv
-import matplotlib.pyplot as plt
 
-# Function to read CSV data and return a list of dictionaries
+import backends
+import cli
+import compressed
+import leaderboard
+
+# Delivery columns used by calculate()
+DELIVERY_COLUMNS = ["batting_team", "batsman", "batsman_runs"]
+
+# Function to stream CSV rows one at a time
 def read_data(file_path):
     """
-    Reads IPL delivery data from a CSV file.
+    Reads IPL delivery data from a CSV file (plain, .gz or .zst).
 
     Args:
         file_path (str): Path to the CSV file containing delivery data.
 
-    Returns:
-        list: List of dictionaries representing each delivery record.
+    Yields:
+        dict: One delivery record at a time.
     """
-    data = []
-    with open(file_path, 'r', encoding='utf-8') as file:
-        deliveries_data = csv.DictReader(file)
-        # Append each delivery row as a dictionary
-        for match in deliveries_data:
-            data.append(match)
-    return data
+    with compressed.open_text(file_path) as file:
+        # Yield rows lazily so only the current row is held in memory
+        yield from csv.DictReader(file)
 
 
-# Function to calculate top 10 RCB batsmen by total runs
-def calculate(data):
+# Function to create a running accumulator for a team's batsman runs
+def accumulator(team="Royal Challengers Bangalore", count=10):
     """
-    Calculates the top 10 batsmen for Royal Challengers Bangalore by total runs.
+    Creates an accumulator that sums a team's batsman runs one delivery at a time.
+
+    The accumulator can be registered with the single-pass delivery scan in
+    delivery_scan.py so that several analyses share one read of deliveries.csv.
 
     Args:
-        data (list): List of IPL delivery records (dicts).
+        team (str): Batting team to rank batsmen for (RCB by default).
+        count (int): Number of batsmen to keep (10 by default).
 
     Returns:
-        dict: Dictionary of top 10 batsmen and their total runs.
+        tuple: (update, finalize) functions. update(delivery) adds one delivery
+               record and finalize() returns the top 10 batsmen.
     """
     batsman_runs = {}
 
-    # Loop through each delivery
-    for match in data:
-        # Consider only deliveries where RCB is batting
-        if match["batting_team"] == "Royal Challengers Bangalore":
-            batsman = match["batsman"]
-            runs = int(match["batsman_runs"])
+    def update(delivery):
+        # Consider only deliveries where the team is batting
+        if delivery["batting_team"] == team:
+            batsman = delivery["batsman"]
+            runs = int(delivery["batsman_runs"])
 
             # Sum runs for each batsman
             if batsman in batsman_runs:
@@ -55,43 +62,91 @@ def calculate(data):
             else:
                 batsman_runs[batsman] = runs
 
-    # Sort batsmen by total runs and take top 10
-    top_batsmen = dict(sorted(batsman_runs.items(), key=lambda x: x[1], reverse=True)[:10])
-    return top_batsmen
+    def finalize():
+        # Select the top batsmen by total runs with a bounded heap
+        return leaderboard.top_k(batsman_runs, count)
+
+    return update, finalize
+
+
+# Function to calculate top 10 batsmen of a team (RCB by default) by total runs
+def calculate(data, team="Royal Challengers Bangalore", count=10):
+    """
+    Calculates the top 10 batsmen for a team by total runs.
+
+    Args:
+        data (iterable): IPL delivery records (dicts).
+        team (str): Batting team to rank batsmen for (RCB by default).
+        count (int): Number of batsmen to keep (10 by default).
+
+    Returns:
+        dict: Dictionary of top 10 batsmen and their total runs.
+    """
+    update, finalize = accumulator(team, count)
+
+    # Loop through each delivery
+    for delivery in data:
+        update(delivery)
+
+    return finalize()
 
 
 # Function to plot top 10 RCB batsmen
-def plot(top_batsmen):
+def plot(top_batsmen, show=True):
     """
     Plots a bar chart of the top 10 RCB batsmen by total runs.
 
     Args:
         top_batsmen (dict): Dictionary of batsmen names and their total runs.
+        show (bool): Display the chart after saving it (False for batch rendering).
     """
+    # Imported here so computing without plotting never loads matplotlib
+    import matplotlib.pyplot as plt  # pylint: disable=import-outside-toplevel
+    import charts  # pylint: disable=import-outside-toplevel
+
     batsmen = list(top_batsmen.keys())
     runs = list(top_batsmen.values())
 
-    plt.figure(figsize=(10, 6))
+    charts.figure("bar")
     plt.bar(batsmen, runs, color='red')
     plt.title('Top 10 Batsmen for Royal Challengers Bangalore')
     plt.xlabel('Batsmen')
     plt.ylabel('Total Runs')
     plt.xticks(rotation=45)             # Rotate labels for readability
     plt.tight_layout()                  # Adjust layout
-    plt.savefig("plots/top10_batsmen_rcb.png", dpi=300)  # Save figure
-    plt.show()
+    charts.save("plots/top10_batsmen_rcb.png")  # Save figure
+    if show:
+        plt.show()
+
+
+# Function to compute the chart data with the configured backend
+def compute():
+    """
+    Computes the top 10 RCB batsmen with the IPL_BACKEND backend.
+
+    Returns:
+        dict: Dictionary of top 10 batsmen and their total runs.
+    """
+    return backends.compute("top_batsmen", team="Royal Challengers Bangalore", count=10)
 
 
 # Main execution function
-def execute():
+def execute(show=True, output_format=None):
     """
     Reads delivery data, calculates top 10 RCB batsmen, and plots the results.
+
+    Args:
+        show (bool): Display the chart after saving it.
+        output_format (str, optional): "json" or "csv" to print the result
+            instead of plotting it.
     """
-    file_path = "data/deliveries.csv"
-    data = read_data(file_path)           # Read delivery CSV data
-    top_batsmen = calculate(data)         # Calculate top 10 batsmen
-    plot(top_batsmen)                     # Generate bar chart
+    top_batsmen = compute()    # Calculate top 10 batsmen
+    if output_format:
+        cli.emit(top_batsmen, output_format, ["batsman", "runs"])
+    else:
+        plot(top_batsmen, show)               # Generate bar chart
 
 
 # Run the script
-execute()
+if __name__ == "__main__":
+    execute(output_format=cli.output_format(__doc__))
@@ -6,26 +6,28 @@ using match data from a CSV file and generates a stacked bar chart visualization
 """
 
 import csv
-import matplotlib.pyplot as plt
 
-# Function to read CSV data and return a list of dictionaries
+import backends
+import cli
+import compressed
+
+# Match columns used by calculate()
+MATCH_COLUMNS = ["season", "team1", "team2"]
+
+# Function to stream CSV rows one at a time
 def read_data(file_path):
     """
-    Reads IPL match data from a CSV file.
+    Reads IPL match data from a CSV file (plain, .gz or .zst).
 
     Args:
         file_path (str): Path to the CSV file containing match data.
 
-    Returns:
-        list: List of dictionaries, each representing a match record.
+    Yields:
+        dict: One match record at a time.
     """
-    data = []
-    with open(file_path, 'r', encoding='utf-8') as file:
-        matches_reader = csv.DictReader(file)
-        # Append each row (match) as a dictionary
-        for match in matches_reader:
-            data.append(match)
-    return data
+    with compressed.open_text(file_path) as file:
+        # Yield rows lazily so only the current row is held in memory
+        yield from csv.DictReader(file)
 
 
 # Function to calculate number of matches played by each team per season
@@ -34,7 +36,7 @@ def calculate(data):
     Calculates the number of matches played by each team per season.
 
     Args:
-        data (list): List of IPL match records (dicts).
+        data (iterable): IPL match records (dicts).
 
     Returns:
         dict: Nested dictionary where keys are seasons and values are dictionaries
@@ -61,49 +63,62 @@ def calculate(data):
 
 
 # Function to plot stacked bar chart of matches played by each team per season
-def plot(matches_count):
+def plot(matches_count, show=True):
     """
     Plots a stacked bar chart of matches played by each team per season.
 
     Args:
         matches_count (dict): Nested dictionary of seasons and team match counts.
+        show (bool): Display the chart after saving it (False for batch rendering).
     """
-    seasons = sorted(matches_count.keys())
-    # Get a sorted list of all teams across all seasons
-    teams = sorted({team for season_data in matches_count.values() for team in season_data})
-
-    # Prepare data: list of matches per team for each season
-    team_data = {team: [matches_count[season].get(team, 0) for season in seasons] for team in teams}
+    # Imported here so computing without plotting never loads matplotlib
+    import matplotlib.pyplot as plt  # pylint: disable=import-outside-toplevel
+    import charts  # pylint: disable=import-outside-toplevel
 
-    # Plot stacked bar chart
-    plt.figure(figsize=(14, 8))
-    bottom = [0] * len(seasons)  # Track cumulative bottom for stacking
-
-    for team, values in team_data.items():
-        plt.bar(seasons, values, bottom=bottom, label=team)
-        # Update bottom for next team
-        bottom = [bottom[i] + values[i] for i in range(len(values))]
+    # Plot stacked bar chart (sorted seasons and teams, one segment per team)
+    charts.figure("wide_stacked")
+    charts.stacked_bars(plt.gca(), matches_count, legend_fontsize='small')
 
     plt.title("Matches Played by Team per Season (Stacked Bar Chart)")
     plt.xlabel("Season")
     plt.ylabel("Number of Matches")
-    plt.legend(bbox_to_anchor=(1.05, 1), loc='upper left', fontsize='small')
     plt.tight_layout()  # Adjust layout to fit labels
-    plt.savefig("plots/matches_played_by_team_per_season.png", dpi=300)  # Save figure
-    plt.show()
+    charts.save("plots/matches_played_by_team_per_season.png")  # Save figure
+    if show:
+        plt.show()
+
+
+# Function to compute the chart data with the configured backend
+def compute():
+    """
+    Computes the matches played by each team per season with the IPL_BACKEND backend.
+
+    Returns:
+        dict: Nested dictionary where keys are seasons and values are dictionaries
+              of teams and their total matches played.
+              Example: { '2008': {'RCB': 14, 'MI': 14, ...}, ... }
+    """
+    return backends.compute("matches_played_by_team")
 
 
 # Main execution function
-def execute():
+def execute(show=True, output_format=None):
     """
     Reads match data, calculates matches played by each team per season,
     and generates a stacked bar chart.
+
+    Args:
+        show (bool): Display the chart after saving it.
+        output_format (str, optional): "json" or "csv" to print the result
+            instead of plotting it.
     """
-    file_path = "data/matches.csv"
-    data = read_data(file_path)             # Read match CSV data
-    matches_count = calculate(data)         # Calculate matches per team per season
-    plot(matches_count)                     # Generate stacked bar chart
+    matches_count = compute()    # Calculate matches per team per season
+    if output_format:
+        cli.emit(matches_count, output_format, ["season", "team", "matches"])
+    else:
+        plot(matches_count, show)               # Generate stacked bar chart
 
 
 # Run the script
-execute()
+if __name__ == "__main__":
+    execute(output_format=cli.output_format(__doc__))
@@ -6,47 +6,66 @@ using match and delivery data from CSV files and generates a bar chart visualiza
 """
 
 import csv
-import matplotlib.pyplot as plt
 
-# Function to read CSV file and return a list of dictionaries
+import backends
+import cli
+import compressed
+
+# Columns used by calculate()
+MATCH_COLUMNS = ["id", "season"]
+DELIVERY_COLUMNS = ["match_id", "bowling_team", "extra_runs"]
+
+# Function to stream CSV rows one at a time
 def read_data(file_path):
     """
-    Reads a CSV file and converts it into a list of dictionaries.
+    Reads a CSV file (plain, .gz or .zst) one row at a time.
 
     Args:
         file_path (str): Path to the CSV file.
 
+    Yields:
+        dict: One row of the CSV at a time.
+    """
+    with compressed.open_text(file_path) as file:
+        # Yield rows lazily so only the current row is held in memory
+        yield from csv.DictReader(file)
+
+
+# Function to create a running accumulator for one season's extra runs
+def accumulator(matches, season="2016"):
+    """
+    Creates an accumulator that sums extra runs per bowling team in a season
+    one delivery at a time.
+
+    Args:
+        matches (iterable): Match records from matches.csv.
+        season (str): Season to count (2016 by default).
+
     Returns:
-        list: List of dictionaries representing each row in the CSV.
+        tuple: (update, finalize) functions. update(delivery) adds one delivery
+               record and finalize() returns the extra runs per team.
     """
-    data = []
-    with open(file_path, 'r', encoding='utf-8') as file:
-        reader = csv.DictReader(file)
-        # Append each row (match/delivery) as a dictionary
-        for match in reader:
-            data.append(match)
-    return data
+    # Get all match IDs from the season
+    season_match_ids = {match["id"] for match in matches if match["season"] == season}
+    return match_accumulator(season_match_ids)
 
 
-# Function to calculate extra runs conceded per team in 2016
-def calculate(matches, deliveries):
+# Function to create a running accumulator for the extra runs of some matches
+def match_accumulator(match_ids):
     """
-    Calculates the total extra runs conceded by each IPL team in 2016.
+    Creates an accumulator that sums extra runs per bowling team over a set
+    of matches, e.g. the matches of one season.
 
     Args:
-        matches (list): List of match records from matches.csv.
-        deliveries (list): List of delivery records from deliveries.csv.
+        match_ids (set): IDs of the matches to count.
 
     Returns:
-        dict: Dictionary with team names as keys and total extra runs conceded as values.
+        tuple: (update, finalize) functions, as returned by accumulator().
     """
-    # Get all match IDs from the 2016 season
-    match_ids_2016 = {match["id"] for match in matches if match["season"] == "2016"}
     extra_runs_by_team = {}
 
-    # Loop through each delivery
-    for delivery in deliveries:
-        if delivery["match_id"] in match_ids_2016:
+    def update(delivery):
+        if delivery["match_id"] in match_ids:
             bowling_team = delivery["bowling_team"]
             extra_runs = int(delivery["extra_runs"])
 
@@ -56,42 +75,113 @@ def calculate(matches, deliveries):
             else:
                 extra_runs_by_team[bowling_team] = extra_runs
 
-    return extra_runs_by_team
+    def finalize():
+        return extra_runs_by_team
+
+    return update, finalize
+
+
+# Function to calculate extra runs conceded per team in a season (2016 by default)
+def calculate(matches, deliveries, season="2016"):
+    """
+    Calculates the total extra runs conceded by each IPL team in a season.
+
+    Args:
+        matches (iterable): Match records from matches.csv.
+        deliveries (iterable): Delivery records from deliveries.csv.
+        season (str): Season to count (2016 by default).
+
+    Returns:
+        dict: Dictionary with team names as keys and total extra runs conceded as values.
+    """
+    update, finalize = accumulator(matches, season)
+
+    # Loop through each delivery
+    for delivery in deliveries:
+        update(delivery)
+
+    return finalize()
+
+
+# Function to calculate extra runs conceded per team over some matches
+def calculate_for_matches(match_ids, deliveries):
+    """
+    Calculates the total extra runs conceded by each team over a set of
+    matches whose IDs are already known (e.g. shared by report_graph.py).
+
+    Args:
+        match_ids (set): IDs of the matches to count.
+        deliveries (iterable): Delivery records from deliveries.csv.
+
+    Returns:
+        dict: Dictionary with team names as keys and total extra runs conceded as values.
+    """
+    update, finalize = match_accumulator(match_ids)
+
+    # Loop through each delivery
+    for delivery in deliveries:
+        update(delivery)
+
+    return finalize()
 
 
 # Function to plot a bar chart of extra runs conceded
-def plot(extra_runs_by_team):
+def plot(extra_runs_by_team, show=True):
     """
     Plots a bar chart showing extra runs conceded per team in IPL 2016.
 
     Args:
         extra_runs_by_team (dict): Dictionary of teams and their extra runs conceded.
+        show (bool): Display the chart after saving it (False for batch rendering).
     """
+    # Imported here so computing without plotting never loads matplotlib
+    import matplotlib.pyplot as plt  # pylint: disable=import-outside-toplevel
+    import charts  # pylint: disable=import-outside-toplevel
+
     teams = list(extra_runs_by_team.keys())
     extras = list(extra_runs_by_team.values())
 
-    plt.figure(figsize=(10, 6))
+    charts.figure("bar")
     plt.bar(teams, extras, color='teal')
     plt.title("Extra Runs Conceded per Team in IPL 2016")
     plt.xlabel("Teams")
     plt.ylabel("Extra Runs")
     plt.xticks(rotation=90)           # Rotate team names for readability
     plt.tight_layout()                # Adjust layout to fit labels
-    plt.savefig("plots/extra_runs_2016.png", dpi=300)  # Save plot as PNG
-    plt.show()
+    charts.save("plots/extra_runs_2016.png")  # Save plot as PNG
+    if show:
+        plt.show()
+
+
+# Function to compute the chart data with the configured backend
+def compute():
+    """
+    Computes the extra runs conceded per team in 2016 with the IPL_BACKEND backend.
+
+    Returns:
+        dict: Dictionary with team names as keys and total extra runs conceded as values.
+    """
+    return backends.compute("extra_runs", season="2016")
 
 
 # Main execution function
-def execute():
+def execute(show=True, output_format=None):
     """
     Reads match and delivery data, calculates extra runs per team in 2016,
     and generates a bar chart.
+
+    Args:
+        show (bool): Display the chart after saving it.
+        output_format (str, optional): "json" or "csv" to print the result
+            instead of plotting it.
     """
-    matches = read_data("data/matches.csv")        # Read match data
-    deliveries = read_data("data/deliveries.csv")  # Read delivery data
-    extra_runs_by_team = calculate(matches, deliveries)  # Calculate extra runs
-    plot(extra_runs_by_team)                        # Plot results
+    extra_runs_by_team = compute()    # Calculate extra runs
+    if output_format:
+        cli.emit(extra_runs_by_team, output_format, ["team", "extra_runs"])
+    else:
+        plot(extra_runs_by_team, show)                  # Plot results
 
 
 # Run the script
-execute()
+if __name__ == "__main__":
+    execute(output_format=cli.output_format(__doc__))
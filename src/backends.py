@@ -0,0 +1,262 @@
+"""
+backends.py
+
+This script computes every analysis with the backend picked by IPL_BACKEND,
+so the chart scripts, queries.py and the single-pass report share one
+dispatch instead of each keeping its own chain of backend branches.
+
+The storage modules name their analyses alike (vectorized.extra_runs,
+sqlite_store.extra_runs, player_stats.extra_runs, ...) and take the same
+parameters in the same order, so an analysis runs on a backend by calling the
+function of that name. A backend that does not implement an analysis, or an
+unknown IPL_BACKEND, raises an error instead of falling back to the CSV loops.
+
+Only the standard library is imported here; each backend imports its
+storage module (and NumPy) when it is used.
+"""
+
+import cli
+import fast_csv
+from delivery_scan import load_analysis
+from render_all import CHART_SCRIPTS
+
+MATCHES_FILE = "data/matches.csv"
+DELIVERIES_FILE = "data/deliveries.csv"
+
+# Analyses: name -> (chart module, function of the script, input files, parameter names)
+ANALYSES = {
+    "top_batsmen": ("top_batsmen_rcb", "calculate", ["deliveries"], ["team", "count"]),
+    "total_runs_by_team": ("total_runs_by_team", "calculate", ["deliveries"], []),
+    "extra_runs": ("extra_runs_2016", "calculate", ["matches", "deliveries"], ["season"]),
+    "economical_bowlers": ("economical_bowlers_2015", "calculate_economical_bowlers",
+                           ["matches", "deliveries"], ["season", "count", "min_balls"]),
+    "matches_per_year": ("matches_per_year", "calculate", ["matches"], []),
+    "matches_played_by_team": ("matches_played_by_team", "calculate", ["matches"], []),
+    "matches_won_per_team": ("matches_won_per_team", "calculate", ["matches"], []),
+}
+
+# Analysis scripts, loaded on first use
+_modules = {}
+
+
+# Function to get an analysis script module by name
+def analysis_module(name):
+    """
+    Loads a chart script once and returns it.
+
+    Args:
+        name (str): Module name from render_all.CHART_SCRIPTS.
+
+    Returns:
+        module: The chart script module.
+    """
+    if name not in _modules:
+        _modules[name] = load_analysis(name, dict(CHART_SCRIPTS)[name])
+    return _modules[name]
+
+
+# Function to open the inputs of an analysis as its script reads them
+def python_inputs(analysis, arguments, matches_path=MATCHES_FILE, deliveries_path=DELIVERIES_FILE):
+    """
+    Streams the needed columns of the CSV files. Season analyses read only
+    that season's deliveries through the match index.
+
+    Args:
+        analysis (str): Analysis name from ANALYSES.
+        arguments (list): Parameter values, in the order of ANALYSES.
+        matches_path (str): Path to matches.csv.
+        deliveries_path (str): Path to deliveries.csv.
+
+    Returns:
+        list: One iterable of records per input file of the analysis.
+    """
+    module_name, _, inputs, parameters = ANALYSES[analysis]
+    module = analysis_module(module_name)
+    data = []
+    for key in inputs:
+        if key == "matches":
+            data.append(fast_csv.read_columns(matches_path, module.MATCH_COLUMNS))
+        elif "season" in parameters:
+            import match_index  # pylint: disable=import-outside-toplevel
+            season = arguments[parameters.index("season")]
+            data.append(match_index.read_season(matches_path, deliveries_path, season,
+                                                module.DELIVERY_COLUMNS))
+        else:
+            data.append(fast_csv.read_columns(deliveries_path, module.DELIVERY_COLUMNS))
+    return data
+
+
+# Function to run an analysis with the CSV loops of its script
+def python_backend(analysis, arguments):
+    """
+    Feeds the streamed CSV columns to the script's function.
+
+    Args:
+        analysis (str): Analysis name from ANALYSES.
+        arguments (list): Parameter values, in the order of ANALYSES.
+
+    Returns:
+        dict: The analysis result.
+    """
+    module_name, function, _, _ = ANALYSES[analysis]
+    data = python_inputs(analysis, arguments)
+    return getattr(analysis_module(module_name), function)(*data, *arguments)
+
+
+# Function to run an analysis vectorized over the columnar cache
+def numpy_backend(analysis, arguments):
+    """
+    Runs the vectorized.py function of an analysis on the memory-mapped cache.
+
+    Args:
+        analysis (str): Analysis name from ANALYSES.
+        arguments (list): Parameter values, in the order of ANALYSES.
+
+    Returns:
+        dict: The analysis result.
+    """
+    import columnar_cache  # pylint: disable=import-outside-toplevel
+    import vectorized  # pylint: disable=import-outside-toplevel
+
+    files = {"matches": MATCHES_FILE, "deliveries": DELIVERIES_FILE}
+    tables = [columnar_cache.load_table(files[key]) for key in ANALYSES[analysis][2]]
+    return backend_function(vectorized, analysis)(*tables, *arguments)
+
+
+# Function to run an analysis vectorized over the Parquet files
+def parquet_backend(analysis, arguments):
+    """
+    Runs the vectorized.py function of an analysis on the needed Parquet
+    columns. Season analyses skip the row groups of other seasons.
+
+    Args:
+        analysis (str): Analysis name from ANALYSES.
+        arguments (list): Parameter values, in the order of ANALYSES.
+
+    Returns:
+        dict: The analysis result.
+    """
+    import parquet_store  # pylint: disable=import-outside-toplevel
+    import vectorized  # pylint: disable=import-outside-toplevel
+
+    module_name, _, inputs, parameters = ANALYSES[analysis]
+    module = analysis_module(module_name)
+    season = arguments[parameters.index("season")] if "season" in parameters else None
+    tables = [parquet_store.load_table(parquet_store.MATCHES_FILE, module.MATCH_COLUMNS)
+              if key == "matches" else
+              parquet_store.load_table(parquet_store.DELIVERIES_FILE, module.DELIVERY_COLUMNS, season)
+              for key in inputs]
+    return backend_function(vectorized, analysis)(*tables, *arguments)
+
+
+# Function to run an analysis as an SQL query
+def sqlite_backend(analysis, arguments):
+    """
+    Runs the sqlite_store.py query of an analysis on data/ipl.sqlite (built
+    or rebuilt from the CSV files when needed).
+
+    Args:
+        analysis (str): Analysis name from ANALYSES.
+        arguments (list): Parameter values, in the order of ANALYSES.
+
+    Returns:
+        dict: The analysis result.
+    """
+    import sqlite_store  # pylint: disable=import-outside-toplevel
+
+    query = backend_function(sqlite_store, analysis)
+    connection = sqlite_store.connect(MATCHES_FILE, DELIVERIES_FILE)
+    try:
+        return query(connection, *arguments)
+    finally:
+        connection.close()
+
+
+# Function to run an analysis on the season x team cube
+def cube_backend(analysis, arguments):
+    """
+    Slices the precomputed season x team cube (match analyses only).
+
+    Args:
+        analysis (str): Analysis name from ANALYSES.
+        arguments (list): Parameter values, in the order of ANALYSES.
+
+    Returns:
+        dict: The analysis result.
+    """
+    import season_cube  # pylint: disable=import-outside-toplevel
+
+    return backend_function(season_cube, analysis)(season_cube.load_cube(MATCHES_FILE), *arguments)
+
+
+# Function to run an analysis on the player stat table
+def players_backend(analysis, arguments):
+    """
+    Looks an analysis up in the player x season x team stat table (batsman,
+    economy and extras analyses only).
+
+    Args:
+        analysis (str): Analysis name from ANALYSES.
+        arguments (list): Parameter values, in the order of ANALYSES.
+
+    Returns:
+        dict: The analysis result.
+    """
+    import player_stats  # pylint: disable=import-outside-toplevel
+
+    function = backend_function(player_stats, analysis)
+    return function(player_stats.load_table(MATCHES_FILE, DELIVERIES_FILE), *arguments)
+
+
+# Backends selectable with IPL_BACKEND
+BACKENDS = {
+    "python": python_backend,
+    "numpy": numpy_backend,
+    "parquet": parquet_backend,
+    "sqlite": sqlite_backend,
+    "cube": cube_backend,
+    "players": players_backend,
+}
+
+
+# Function to find the implementation of an analysis in a storage module
+def backend_function(module, analysis):
+    """
+    Returns the function of a storage module that implements an analysis.
+
+    Args:
+        module (module): Storage module, e.g. vectorized or sqlite_store.
+        analysis (str): Analysis name from ANALYSES.
+
+    Returns:
+        function: The implementation.
+
+    Raises:
+        ValueError: If the backend does not implement the analysis.
+    """
+    function = getattr(module, analysis, None)
+    if function is None:
+        raise ValueError(f"IPL_BACKEND={cli.BACKEND} does not support {analysis} "
+                         f"({module.__name__}.py has no {analysis}())")
+    return function
+
+
+# Function to compute an analysis with the configured backend
+def compute(analysis, **parameters):
+    """
+    Computes an analysis with the backend picked by IPL_BACKEND.
+
+    Args:
+        analysis (str): Analysis name from ANALYSES, e.g. "extra_runs".
+        **parameters: Parameters of the analysis, e.g. season="2016".
+
+    Returns:
+        dict: The analysis result, identical for every backend.
+
+    Raises:
+        ValueError: If IPL_BACKEND is unknown or does not support the analysis.
+    """
+    if cli.BACKEND not in BACKENDS:
+        raise ValueError(f"unknown IPL_BACKEND={cli.BACKEND} (choose from {', '.join(BACKENDS)})")
+    arguments = [parameters[name] for name in ANALYSES[analysis][3]]
+    return BACKENDS[cli.BACKEND](analysis, arguments)
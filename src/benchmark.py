@@ -0,0 +1,281 @@
+"""
+benchmark.py
+
+This script benchmarks every read_data()/calculate() pair on synthetic data
+of increasing size (see synthetic_data.py). Each case runs in a fresh
+process so its wall time and peak memory (max RSS) are measured in
+isolation. Results are saved as JSON tagged with the git commit, so runs
+from different commits can be compared.
+
+Usage:
+    python src/benchmark.py [--sizes 1e5 1e6 ...] [--output results.json]
+    python src/benchmark.py --compare old.json new.json
+"""
+
+import argparse
+import importlib.util
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import compact_records
+import fast_csv
+from delivery_scan import DELIVERY_ANALYSES, load_analysis, scan
+from synthetic_data import generate
+
+DATA_DIR = "bench_data"              # Generated datasets, one folder per size
+RESULTS_DIR = "benchmark_results"
+DEFAULT_SIZES = [10 ** 5, 10 ** 6]
+
+# Benchmarked analyses: (module name, script file, input files, calculate function)
+CASES = [
+    ("top_batsmen_rcb", " Top_batsmen_RCB.py", ("deliveries",), "calculate"),
+    ("total_runs_by_team", "total_runs_by_eac_team.py", ("deliveries",), "calculate"),
+    ("extra_runs_2016", "Extra_runs _conceded_per_team.py", ("matches", "deliveries"), "calculate"),
+    ("economical_bowlers_2015", "top_economic_ballers.py", ("matches", "deliveries"),
+     "calculate_economical_bowlers_2015"),
+    ("matches_per_year", "matches_played_per_year.py", ("matches",), "calculate"),
+    ("matches_played_by_team", " matches_played by_team_by_season.py", ("matches",), "calculate"),
+    ("matches_won_per_team", "matches_won-per_team_per_year.py", ("matches",), "calculate"),
+]
+# vectorized.py function and chart parameters of each analysis (numpy and parquet cases)
+VECTORIZED = {
+    "top_batsmen_rcb": ("top_batsmen", ["Royal Challengers Bangalore"]),
+    "total_runs_by_team": ("total_runs_by_team", []),
+    "extra_runs_2016": ("extra_runs", ["2016"]),
+    "economical_bowlers_2015": ("economical_bowlers", ["2015"]),
+    "matches_per_year": ("matches_per_year", []),
+    "matches_played_by_team": ("matches_played_by_team", []),
+    "matches_won_per_team": ("matches_won_per_team", []),
+}
+BACKENDS = ["python", "fast_csv", "compact", "numpy"]
+if importlib.util.find_spec("pyarrow") is not None:
+    BACKENDS.append("parquet")    # Optional; pyarrow is only imported by these cases
+
+# Season filters the parquet backend pushes down to row groups
+PUSHDOWN_SEASONS = {"extra_runs_2016": "2016", "economical_bowlers_2015": "2015"}
+
+
+# Function to read the peak memory of the current process
+def peak_rss_mb():
+    """
+    Returns the peak resident set size of the current process.
+
+    Returns:
+        float: Peak RSS in MiB.
+    """
+    # VmHWM restarts at exec; ru_maxrss keeps the forking parent's peak on Linux
+    try:
+        with open("/proc/self/status", 'r', encoding='utf-8') as file:
+            for line in file:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024     # Reported in KiB
+    except OSError:
+        pass
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+# Function to run one benchmark case (runs in a fresh process)
+def run_case(case):
+    """
+    Times one analysis with one backend on one dataset.
+
+    Args:
+        case (tuple): (module name, script file, inputs, calculate function,
+                      backend, data folder).
+
+    Returns:
+        dict: Wall time and memory figures of the case.
+    """
+    name, script_file, inputs, function_name, backend, data_dir = case
+    paths = {"matches": os.path.join(data_dir, "matches.csv"),
+             "deliveries": os.path.join(data_dir, "deliveries.csv")}
+
+    module = load_analysis(name, script_file)
+    if backend in ("numpy", "parquet"):
+        # Imported only by these cases so NumPy does not add to the pure-Python peak RSS
+        import columnar_cache  # pylint: disable=import-outside-toplevel
+        import vectorized  # pylint: disable=import-outside-toplevel
+        function, arguments = VECTORIZED[name]
+    start_rss = peak_rss_mb()
+    start = time.perf_counter()
+
+    if backend == "numpy":
+        getattr(vectorized, function)(*(columnar_cache.load_table(paths[key]) for key in inputs),
+                                      *arguments)
+    elif backend == "fast_csv":
+        # Column-projected reader instead of read_data()
+        columns = {"matches": getattr(module, "MATCH_COLUMNS", None),
+                   "deliveries": getattr(module, "DELIVERY_COLUMNS", None)}
+        getattr(module, function_name)(*(fast_csv.read_columns(paths[key], columns[key])
+                                         for key in inputs))
+    elif backend == "parquet":
+        import parquet_store  # pylint: disable=import-outside-toplevel
+        # Projected Parquet columns, with the season filter pushed down for deliveries
+        columns = {"matches": getattr(module, "MATCH_COLUMNS", None),
+                   "deliveries": getattr(module, "DELIVERY_COLUMNS", None)}
+        seasons = {"deliveries": PUSHDOWN_SEASONS.get(name)}
+        getattr(vectorized, function)(*(
+            parquet_store.load_table(parquet_store.parquet_path(paths[key]), columns[key],
+                                     seasons.get(key))
+            for key in inputs), *arguments)
+    elif backend == "compact":
+        # In-memory path: whole files loaded as __slots__ records
+        getattr(module, function_name)(*(compact_records.load_records(paths[key]) for key in inputs))
+    elif backend == "single_pass":
+        matches = list(module.read_data(paths["matches"]))
+        accumulators = {}
+        columns = set()
+        for analysis, analysis_file, needs_matches, _ in DELIVERY_ANALYSES:
+            analysis_module = load_analysis(analysis, analysis_file)
+            accumulators[analysis] = (analysis_module.accumulator(matches) if needs_matches
+                                      else analysis_module.accumulator())
+            columns.update(analysis_module.DELIVERY_COLUMNS)
+        scan(paths["deliveries"], accumulators, sorted(columns))
+    else:
+        getattr(module, function_name)(*(module.read_data(paths[key]) for key in inputs))
+
+    return {"seconds": time.perf_counter() - start,
+            "start_rss_mb": start_rss, "peak_rss_mb": peak_rss_mb()}
+
+
+# Function to run every case on every dataset size
+def run(sizes, data_root=DATA_DIR):
+    """
+    Generates the datasets if needed and benchmarks every case.
+
+    Args:
+        sizes (list): Numbers of delivery rows to benchmark.
+        data_root (str): Folder holding the generated datasets.
+
+    Returns:
+        list: One result dict per (size, analysis, backend).
+    """
+    spawn = multiprocessing.get_context("spawn")
+    results = []
+    for rows in sizes:
+        data_dir = os.path.join(data_root, str(rows))
+        if not os.path.exists(os.path.join(data_dir, "deliveries.csv")):
+            generate(rows, data_dir)
+
+        # Build the columnar cache up front and time it as its own case
+        import columnar_cache  # pylint: disable=import-outside-toplevel
+        start = time.perf_counter()
+        for file_name in ("matches.csv", "deliveries.csv"):
+            columnar_cache.load_table(os.path.join(data_dir, file_name))
+        results.append({"rows": rows, "analysis": "columnar_cache", "backend": "numpy",
+                        "seconds": time.perf_counter() - start})
+
+        if "parquet" in BACKENDS:
+            import parquet_store  # pylint: disable=import-outside-toplevel
+
+            # Export to Parquet up front, also timed as its own case
+            start = time.perf_counter()
+            parquet_store.export(os.path.join(data_dir, "matches.csv"))
+            parquet_store.export(os.path.join(data_dir, "deliveries.csv"),
+                                 matches_path=os.path.join(data_dir, "matches.csv"))
+            results.append({"rows": rows, "analysis": "parquet_export", "backend": "parquet",
+                            "seconds": time.perf_counter() - start})
+
+        cases = [(name, script_file, inputs, function_name, backend, data_dir)
+                 for name, script_file, inputs, function_name in CASES
+                 for backend in BACKENDS]
+        # All delivery analyses together in one shared scan
+        cases.append(("delivery_scan", CASES[0][1], (), None, "single_pass", data_dir))
+
+        for case in cases:
+            # A fresh process per case keeps peak memory figures independent
+            with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as executor:
+                measurement = executor.submit(run_case, case).result()
+            result = {"rows": rows, "analysis": case[0], "backend": case[4]}
+            result.update(measurement)
+            results.append(result)
+            print(f"{rows:>11} {case[0]:<26}{case[4]:<12}{measurement['seconds']:9.3f} s"
+                  f"{measurement.get('peak_rss_mb', 0):9.1f} MiB")
+    return results
+
+
+# Function to identify the commit being benchmarked
+def git_commit():
+    """
+    Returns the current git commit hash, or "unknown" outside a git checkout.
+
+    Returns:
+        str: Commit hash.
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+# Function to compare two saved benchmark runs
+def compare(old_path, new_path):
+    """
+    Prints the time and memory ratio (new / old) of every common case.
+
+    Args:
+        old_path (str): JSON results of the baseline run.
+        new_path (str): JSON results of the run to check.
+    """
+    runs = []
+    for path in (old_path, new_path):
+        with open(path, 'r', encoding='utf-8') as file:
+            report = json.load(file)
+        runs.append({(result["rows"], result["analysis"], result["backend"]): result
+                     for result in report["results"]})
+
+    old, new = runs
+    for key in sorted(old.keys() & new.keys(), key=str):
+        time_ratio = new[key]["seconds"] / old[key]["seconds"] if old[key]["seconds"] else 0
+        line = f"{key[0]:>11} {key[1]:<26}{key[2]:<12} time x{time_ratio:6.2f}"
+        if "peak_rss_mb" in old[key] and "peak_rss_mb" in new[key]:
+            line += f"   memory x{new[key]['peak_rss_mb'] / old[key]['peak_rss_mb']:6.2f}"
+        print(line)
+
+
+# Main execution function
+def execute():
+    """
+    Runs the benchmark suite (or compares two runs) from the command line.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the IPL analyses.")
+    parser.add_argument("--sizes", nargs="+", type=float, default=DEFAULT_SIZES,
+                        help="numbers of delivery rows, e.g. 1e5 1e6 1e7")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="folder for generated data")
+    parser.add_argument("--output", help="JSON file for the results")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"),
+                        help="compare two saved result files instead of running")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "results": run([int(size) for size in args.sizes], args.data_dir),
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit[:12]}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=2)
+    print(f"Results saved to {output}")
+
+
+# Run the script
+if __name__ == "__main__":
+    execute()
@@ -0,0 +1,42 @@
+"""
+cache_files.py
+
+This script locates the files cached next to the source CSV files (columnar
+cache, match index, season cube, player table, ...) and stamps the source
+files to tell when a cache is stale. It only imports the standard library,
+so scripts that just check a cache never pay for importing NumPy.
+"""
+
+import os
+
+CACHE_FOLDER = ".cache"          # Created next to the source CSV
+
+
+# Function to locate the cache folder of a CSV file
+def cache_path(csv_path):
+    """
+    Returns the cache folder used for a CSV file.
+
+    Args:
+        csv_path (str): Path to the source CSV file.
+
+    Returns:
+        str: Path to the folder holding the cached columns.
+    """
+    folder, file_name = os.path.split(os.path.abspath(csv_path))
+    return os.path.join(folder, CACHE_FOLDER, file_name)
+
+
+# Function to record the size and mtime of a source file
+def source_stamp(file_path):
+    """
+    Returns the size and modification time of a file.
+
+    Args:
+        file_path (str): Path to the file.
+
+    Returns:
+        dict: {"size": ..., "mtime_ns": ...}
+    """
+    stat = os.stat(file_path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
@@ -0,0 +1,76 @@
+"""
+cli.py
+
+This script holds the settings and command-line options shared by the
+analysis scripts. It only imports the standard library, so a script that
+just computes numbers never pays for importing NumPy or matplotlib.
+
+Every chart script accepts --format json or --format csv to print its result
+to stdout instead of drawing the chart, e.g. for data pipelines and cron jobs:
+
+    python src/total_runs_by_eac_team.py --format csv
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+
+# Backend picked by the analysis scripts (dispatched in backends.py): "python"
+# (CSV loops), "numpy", "parquet" or "sqlite" ("cube" serves the match charts
+# from season_cube.py, "players" the batsman, economy and extras charts from
+# player_stats.py; other charts raise an error with them)
+BACKEND = os.environ.get("IPL_BACKEND", "python")
+
+# Low-DPI draft charts under plots/preview/ instead of the 300 DPI exports (see charts.py)
+PREVIEW = os.environ.get("IPL_PREVIEW", "0") not in ("", "0")
+
+OUTPUT_FORMATS = ["json", "csv"]
+
+
+# Function to read the command-line options of an analysis script
+def output_format(description=None, argv=None):
+    """
+    Parses the command line of an analysis script.
+
+    Args:
+        description (str, optional): Help text, usually the script's docstring.
+        argv (list, optional): Arguments to parse (sys.argv[1:] by default).
+
+    Returns:
+        str: "json" or "csv" to print the result, or None to plot it.
+    """
+    parser = argparse.ArgumentParser(description=description,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--format", choices=OUTPUT_FORMATS,
+                        help="print the result in this format instead of plotting it")
+    return parser.parse_args(argv).format
+
+
+# Function to print a result as JSON or CSV
+def emit(result, output_format, columns, stream=None):
+    """
+    Writes an analysis result to stdout.
+
+    Args:
+        result (dict): Flat {name: value} or nested {season: {team: value}} result.
+        output_format (str): "json" or "csv".
+        columns (list): CSV header, one name per key level plus the value,
+                        e.g. ["season", "team", "wins"].
+        stream (file, optional): Where to write (stdout by default).
+    """
+    stream = stream or sys.stdout
+    if output_format == "json":
+        json.dump(result, stream, indent=2)
+        stream.write("\n")
+        return
+
+    writer = csv.writer(stream, lineterminator="\n")
+    writer.writerow(columns)
+    for key, value in result.items():
+        if isinstance(value, dict):
+            # One row per inner key for nested results
+            writer.writerows([key, inner_key, inner_value] for inner_key, inner_value in value.items())
+        else:
+            writer.writerow([key, value])
@@ -0,0 +1,249 @@
+"""
+columnar_cache.py
+
+This script converts matches.csv and deliveries.csv into a columnar on-disk
+cache. Numeric columns are stored as .npy arrays and text columns (teams,
+players, venues, umpires, ...) are dictionary-encoded into integer codes.
+Cached columns are loaded with memory mapping, so no CSV text is parsed after
+the first run. The cache is rebuilt automatically when the source CSV changes.
+The source may also be a .gz or .zst archive (see compressed.py); the cache
+is kept under the name of the plain CSV file either way.
+"""
+
+import csv
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from array import array
+
+import numpy as np
+
+import compressed
+from cache_files import cache_path
+
+# Columns stored as integer arrays; every other column is dictionary-encoded
+NUMERIC_COLUMNS = {
+    # matches.csv
+    "id", "season", "dl_applied", "win_by_runs", "win_by_wickets",
+    # deliveries.csv
+    "match_id", "inning", "over", "ball", "is_super_over", "wide_runs",
+    "bye_runs", "legbye_runs", "noball_runs", "penalty_runs",
+    "batsman_runs", "extra_runs", "total_runs",
+}
+
+# Text columns that share one dictionary, so equal names get equal codes
+DICTIONARY_GROUPS = {
+    "team1": "team", "team2": "team", "toss_winner": "team", "winner": "team",
+    "batting_team": "team", "bowling_team": "team",
+    "batsman": "player", "non_striker": "player", "bowler": "player",
+    "player_dismissed": "player", "fielder": "player", "player_of_match": "player",
+    "umpire1": "umpire", "umpire2": "umpire", "umpire3": "umpire",
+}
+
+META_FILE = "meta.json"
+HASH_BLOCK_SIZE = 1 << 20        # 1 MiB blocks when hashing the source file
+ROW_BLOCK_SIZE = 65536           # Rows decoded at a time by read_rows()
+
+
+# Function to hash the contents of a file
+def file_hash(file_path):
+    """
+    Computes the SHA-256 hash of a file, reading it in large blocks.
+
+    Args:
+        file_path (str): Path to the file, or to a CSV file whose archive is
+                         read (see compressed.resolve()).
+
+    Returns:
+        str: Hexadecimal digest of the file contents (compressed, for an archive).
+    """
+    digest = hashlib.sha256()
+    with open(compressed.resolve(file_path), 'rb') as file:
+        for block in iter(lambda: file.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# Function to convert a CSV file into columnar arrays
+def build(csv_path):
+    """
+    Converts a CSV file into the columnar cache in a single streaming pass.
+
+    Args:
+        csv_path (str): Path to the source CSV file (plain, .gz or .zst).
+
+    Returns:
+        dict: Metadata describing the cached columns.
+    """
+    target = cache_path(csv_path)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    source = compressed.resolve(csv_path)
+    stat = os.stat(source)
+
+    with compressed.open_text(source) as file:
+        reader = csv.reader(file)
+        header = next(reader)
+
+        groups = [DICTIONARY_GROUPS.get(name, name) for name in header]
+        codes = {group: {} for name, group in zip(header, groups)
+                 if name not in NUMERIC_COLUMNS}
+        columns = [array('l') for _ in header]
+        lookups = [None if name in NUMERIC_COLUMNS else codes[group]
+                   for name, group in zip(header, groups)]
+
+        for row in reader:
+            for value, column, lookup in zip(row, columns, lookups):
+                if lookup is None:
+                    # Empty numeric fields are stored as 0
+                    column.append(int(value) if value else 0)
+                else:
+                    code = lookup.get(value)
+                    if code is None:
+                        code = lookup[value] = len(lookup)
+                    column.append(code)
+
+    # Write into a temporary folder first so a failed build leaves no cache
+    staging = tempfile.mkdtemp(dir=os.path.dirname(target))
+    for name, column in zip(header, columns):
+        np.save(os.path.join(staging, name + ".npy"), np.asarray(column, dtype=np.int32))
+    for group, lookup in codes.items():
+        with open(os.path.join(staging, group + ".dict.json"), 'w', encoding='utf-8') as file:
+            json.dump(list(lookup), file)
+
+    meta = {
+        "source": os.path.abspath(source),
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha256": file_hash(csv_path),
+        "rows": len(columns[0]) if columns else 0,
+        "columns": header,
+        "dictionaries": {name: group for name, group in zip(header, groups)
+                         if name not in NUMERIC_COLUMNS},
+    }
+    with open(os.path.join(staging, META_FILE), 'w', encoding='utf-8') as file:
+        json.dump(meta, file, indent=2)
+
+    shutil.rmtree(target, ignore_errors=True)
+    os.rename(staging, target)
+    return meta
+
+
+# Function to check whether a cache still matches its source CSV
+def is_valid(csv_path, meta):
+    """
+    Checks a cache against its source CSV.
+
+    The cheap mtime/size check is tried first. If the mtime changed but the
+    size did not, the file is hashed so that a touched but unchanged file does
+    not force a rebuild.
+
+    Args:
+        csv_path (str): Path to the source CSV file.
+        meta (dict): Metadata stored with the cache.
+
+    Returns:
+        bool: True if the cache can be used as is.
+    """
+    stat = os.stat(compressed.resolve(csv_path))
+    if stat.st_size != meta["size"]:
+        return False
+    if stat.st_mtime_ns == meta["mtime_ns"]:
+        return True
+    if file_hash(csv_path) != meta["sha256"]:
+        return False
+
+    # Same contents, new mtime: remember it to skip hashing next time
+    meta["mtime_ns"] = stat.st_mtime_ns
+    with open(os.path.join(cache_path(csv_path), META_FILE), 'w', encoding='utf-8') as file:
+        json.dump(meta, file, indent=2)
+    return True
+
+
+# Function to load a CSV file from the columnar cache
+def load_table(csv_path):
+    """
+    Loads the cached columns of a CSV file, building the cache if it is
+    missing or out of date.
+
+    Args:
+        csv_path (str): Path to the source CSV file.
+
+    Returns:
+        tuple: (columns, dictionaries) where columns maps each column name to a
+               read-only memory-mapped NumPy array and dictionaries maps each
+               text column to the list of labels its codes index into.
+    """
+    folder = cache_path(csv_path)
+    meta = None
+    try:
+        with open(os.path.join(folder, META_FILE), 'r', encoding='utf-8') as file:
+            meta = json.load(file)
+    except (OSError, ValueError):
+        pass
+
+    if meta is None or not is_valid(csv_path, meta):
+        meta = build(csv_path)
+
+    # Memory-map the columns; pages are only read when they are touched
+    columns = {name: np.load(os.path.join(folder, name + ".npy"), mmap_mode='r')
+               for name in meta["columns"]}
+
+    labels = {}
+    for group in set(meta["dictionaries"].values()):
+        with open(os.path.join(folder, group + ".dict.json"), 'r', encoding='utf-8') as file:
+            labels[group] = json.load(file)
+    dictionaries = {name: labels[group] for name, group in meta["dictionaries"].items()}
+
+    return columns, dictionaries
+
+
+# Function to read cached rows in the same shape as csv.DictReader
+def read_rows(csv_path):
+    """
+    Drop-in replacement for read_data() that serves rows from the cache.
+
+    Values are returned as strings exactly like csv.DictReader, so the
+    existing calculate() functions work unchanged.
+
+    Args:
+        csv_path (str): Path to the source CSV file.
+
+    Yields:
+        dict: One record at a time.
+    """
+    columns, dictionaries = load_table(csv_path)
+    names = list(columns)
+    rows = len(columns[names[0]]) if names else 0
+
+    # Decode one block at a time so memory stays bounded
+    for start in range(0, rows, ROW_BLOCK_SIZE):
+        stop = start + ROW_BLOCK_SIZE
+        values = []
+        for name in names:
+            block = columns[name][start:stop].tolist()
+            if name in dictionaries:
+                labels = dictionaries[name]
+                values.append([labels[code] for code in block])
+            else:
+                values.append([str(number) for number in block])
+
+        for row in zip(*values):
+            yield dict(zip(names, row))
+
+
+# Main execution function
+def execute():
+    """
+    Builds (or refreshes) the columnar cache for matches.csv and deliveries.csv.
+    """
+    for csv_path in ("data/matches.csv", "data/deliveries.csv"):
+        columns, _ = load_table(csv_path)
+        rows = len(next(iter(columns.values()))) if columns else 0
+        print(f"{csv_path}: {rows} rows cached in {cache_path(csv_path)}")
+
+
+# Run the script
+if __name__ == "__main__":
+    execute()
@@ -0,0 +1,156 @@
+"""
+compact_records.py
+
+This script loads matches.csv and deliveries.csv into compact in-memory
+records instead of one csv.DictReader dict per row. Only the columns the
+analyses use are kept, runs are parsed to int once, and team, player and
+match ID strings are interned so every row shares the same string objects.
+Records use __slots__ and still support record["column"] lookups, so the
+existing calculate() functions accept them unchanged.
+
+Run it to compare the memory per row of both representations.
+"""
+
+import csv
+import sys
+import tracemalloc
+
+import compressed
+
+SAMPLE_ROWS = 20000    # Rows measured by execute()
+
+
+# Compact record for one delivery
+class Delivery:
+    """
+    One delivery with only the columns used by the analyses.
+    """
+    __slots__ = ("match_id", "batting_team", "bowling_team", "batsman", "bowler",
+                 "batsman_runs", "extra_runs", "total_runs")
+
+    # Columns parsed to int; all others are interned strings
+    NUMERIC = ("batsman_runs", "extra_runs", "total_runs")
+
+    def __init__(self, match_id, batting_team, bowling_team, batsman, bowler,
+                 batsman_runs, extra_runs, total_runs):
+        self.match_id = match_id
+        self.batting_team = batting_team
+        self.bowling_team = bowling_team
+        self.batsman = batsman
+        self.bowler = bowler
+        self.batsman_runs = batsman_runs
+        self.extra_runs = extra_runs
+        self.total_runs = total_runs
+
+    def __getitem__(self, column):
+        # Lets calculate() keep using delivery["column"]
+        return getattr(self, column)
+
+
+# Compact record for one match
+class Match:
+    """
+    One match with only the columns used by the analyses.
+    """
+    __slots__ = ("id", "season", "team1", "team2", "toss_winner", "toss_decision", "winner")
+
+    # Season and IDs stay strings because the analyses compare them as text
+    NUMERIC = ()
+
+    def __init__(self, match_id, season, team1, team2, toss_winner, toss_decision, winner):
+        self.id = match_id
+        self.season = season
+        self.team1 = team1
+        self.team2 = team2
+        self.toss_winner = toss_winner
+        self.toss_decision = toss_decision
+        self.winner = winner
+
+    def __getitem__(self, column):
+        return getattr(self, column)
+
+
+# Function to read a CSV file into compact records
+def read_records(file_path, record_type):
+    """
+    Streams a CSV file as compact records, keeping only the record's columns.
+
+    Args:
+        file_path (str): Path to the CSV file.
+        record_type (type): Delivery or Match.
+
+    Yields:
+        Delivery or Match: One record at a time.
+    """
+    intern = sys.intern
+    with compressed.open_text(file_path) as file:
+        reader = csv.reader(file)
+        header = next(reader)
+
+        # Resolve the column positions once from the header
+        columns = [(header.index(name), name in record_type.NUMERIC)
+                   for name in record_type.__slots__]
+        for row in reader:
+            if not row:
+                continue            # Skip blank lines like csv.DictReader
+            yield record_type(*[int(row[index]) if numeric else intern(row[index])
+                                for index, numeric in columns])
+
+
+# Function to load a whole CSV file as compact records
+def load_records(file_path):
+    """
+    Loads matches.csv or deliveries.csv into a list of compact records.
+    The record type is picked from the header.
+
+    Args:
+        file_path (str): Path to the CSV file.
+
+    Returns:
+        list: Delivery or Match records.
+    """
+    with compressed.open_text(file_path) as file:
+        header = next(csv.reader(file))
+    record_type = Delivery if "match_id" in header else Match
+    return list(read_records(file_path, record_type))
+
+
+# Function to measure memory per row of a loader
+def bytes_per_row(records, rows):
+    """
+    Measures the memory held per row by a reader with tracemalloc.
+
+    Args:
+        records (iterable): Rows produced by the reader being measured.
+        rows (int): Number of rows to keep.
+
+    Returns:
+        float: Bytes allocated per row.
+    """
+    tracemalloc.start()
+    kept = []
+    for row in records:
+        kept.append(row)
+        if len(kept) == rows:
+            break
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size / max(1, len(kept))
+
+
+# Main execution function
+def execute():
+    """
+    Prints the memory per row of csv.DictReader dicts and compact records.
+    """
+    for file_path, record_type in (("data/deliveries.csv", Delivery), ("data/matches.csv", Match)):
+        with open(file_path, 'r', encoding='utf-8') as file:
+            dict_size = bytes_per_row(csv.DictReader(file), SAMPLE_ROWS)
+        compact_size = bytes_per_row(read_records(file_path, record_type), SAMPLE_ROWS)
+        print(f"{file_path}: {dict_size:.0f} bytes/row as dicts, "
+              f"{compact_size:.0f} bytes/row compact ({dict_size / compact_size:.1f}x smaller)")
+
+
+# Run the script
+if __name__ == "__main__":
+    execute()
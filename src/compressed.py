@@ -0,0 +1,222 @@
+"""
+compressed.py
+
+This script opens CSV files that may be compressed, so the analyses can run
+straight from archived .csv.gz and .csv.zst files. The format is detected
+from the file extension or, failing that, from the magic bytes at the start
+of the file. Decompression is streamed through large buffers, and it can
+optionally run in a background thread that overlaps with CSV parsing
+(set IPL_DECOMPRESS_THREAD=1). zlib and zstd release the GIL while they
+work, so the two really run in parallel.
+
+A path such as data/deliveries.csv also finds data/deliveries.csv.gz or
+data/deliveries.csv.zst when the plain file does not exist.
+
+.zst support needs the optional zstandard package (pip install zstandard).
+Run it to time plain, compressed and threaded reads of deliveries.csv.
+"""
+
+import gzip
+import io
+import os
+import queue
+import threading
+import time
+
+try:
+    import zstandard
+except ImportError:     # zstandard is optional; only .zst files need it
+    zstandard = None
+
+BUFFER_SIZE = 1 << 20     # Bytes per read from disk and per decompressed chunk
+QUEUE_CHUNKS = 8          # Decompressed chunks the background thread may run ahead
+THREADED = os.environ.get("IPL_DECOMPRESS_THREAD", "0") == "1"
+
+SUFFIXES = {".gz": "gzip", ".zst": "zstd"}
+MAGIC_BYTES = {b"\x1f\x8b": "gzip", b"\x28\xb5\x2f\xfd": "zstd"}
+
+
+# Function to find a file or its compressed archive
+def resolve(file_path):
+    """
+    Returns the file to read: the path itself if it exists, otherwise its
+    .gz or .zst archive if one exists.
+
+    Args:
+        file_path (str): Path to the (possibly missing) plain file.
+
+    Returns:
+        str: Path of the file to open.
+    """
+    if os.path.exists(file_path):
+        return file_path
+    for suffix in SUFFIXES:
+        if os.path.exists(file_path + suffix):
+            return file_path + suffix
+    return file_path
+
+
+# Function to detect the compression of a file
+def compression(file_path):
+    """
+    Detects whether a file is compressed, by extension or by magic bytes.
+
+    Args:
+        file_path (str): Path to the file (resolved with resolve()).
+
+    Returns:
+        str: "gzip", "zstd", or None for a plain file.
+    """
+    file_path = resolve(file_path)
+    extension = os.path.splitext(file_path)[1]
+    if extension in SUFFIXES:
+        return SUFFIXES[extension]
+
+    with open(file_path, 'rb') as file:
+        start = file.read(4)
+    for magic, name in MAGIC_BYTES.items():
+        if start.startswith(magic):
+            return name
+    return None
+
+
+# Raw stream that is filled by a background decompression thread
+class ThreadedReader(io.RawIOBase):
+    """
+    Reads a binary stream in a background thread, so the decompression of
+    the next chunks overlaps with the parsing of the current one.
+    """
+
+    def __init__(self, source):
+        super().__init__()
+        self.source = source
+        self.chunks = queue.Queue(maxsize=QUEUE_CHUNKS)
+        self.stop = threading.Event()
+        self.pending = memoryview(b"")
+        self.thread = threading.Thread(target=self.fill, daemon=True)
+        self.thread.start()
+
+    def fill(self):
+        # Runs in the background thread; b"" marks the end of the stream
+        try:
+            while not self.stop.is_set():
+                chunk = self.source.read(BUFFER_SIZE)
+                self.chunks.put(chunk)
+                if not chunk:
+                    return
+        except Exception as error:    # pylint: disable=broad-except
+            self.chunks.put(error)    # Raised again in the reading thread
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if not self.pending:
+            chunk = self.chunks.get()
+            if isinstance(chunk, Exception):
+                raise chunk
+            if not chunk:
+                self.chunks.put(chunk)    # Keep reporting the end of the stream
+                return 0
+            self.pending = memoryview(chunk)
+
+        size = min(len(buffer), len(self.pending))
+        buffer[:size] = self.pending[:size]
+        self.pending = self.pending[size:]
+        return size
+
+    def close(self):
+        if not self.closed:
+            self.stop.set()
+            # Unblock the thread if it waits for room in the queue
+            while self.thread.is_alive():
+                try:
+                    self.chunks.get_nowait()
+                except queue.Empty:
+                    self.thread.join(0.01)
+            self.source.close()
+        super().close()
+
+
+# Function to open a possibly compressed file as a binary stream
+def open_binary(file_path, threaded=None):
+    """
+    Opens a plain, gzip or zstd file for streaming binary reads.
+
+    Args:
+        file_path (str): Path to the file (see resolve()).
+        threaded (bool, optional): Decompress in a background thread
+                                   (IPL_DECOMPRESS_THREAD by default).
+
+    Returns:
+        io.BufferedReader: Stream of the decompressed bytes.
+    """
+    file_path = resolve(file_path)
+    kind = compression(file_path)
+    if kind is None:
+        return open(file_path, 'rb', buffering=BUFFER_SIZE)    # pylint: disable=consider-using-with
+
+    raw = open(file_path, 'rb', buffering=BUFFER_SIZE)    # pylint: disable=consider-using-with
+    if kind == "gzip":
+        source = gzip.GzipFile(fileobj=raw, mode='rb')
+    elif zstandard is None:
+        raw.close()
+        raise ImportError(f"Reading {file_path} needs the zstandard package: pip install zstandard")
+    else:
+        # closefd=True closes raw together with the reader
+        source = zstandard.ZstdDecompressor().stream_reader(raw, read_size=BUFFER_SIZE, closefd=True)
+
+    if THREADED if threaded is None else threaded:
+        source = ThreadedReader(source)
+    return io.BufferedReader(source, buffer_size=BUFFER_SIZE)
+
+
+# Function to open a possibly compressed CSV file as text
+def open_text(file_path, threaded=None):
+    """
+    Opens a plain, gzip or zstd CSV file for reading as UTF-8 text.
+
+    Args:
+        file_path (str): Path to the file (see resolve()).
+        threaded (bool, optional): Decompress in a background thread.
+
+    Returns:
+        io.TextIOWrapper: Text stream ready for csv.reader / csv.DictReader.
+    """
+    return io.TextIOWrapper(open_binary(file_path, threaded), encoding='utf-8', newline='')
+
+
+# Main execution function
+def execute():
+    """
+    Writes .gz (and .zst) copies of deliveries.csv and times reading each one.
+    """
+    import csv  # pylint: disable=import-outside-toplevel
+    import shutil  # pylint: disable=import-outside-toplevel
+
+    file_path = "data/deliveries.csv"
+    archives = [file_path + ".gz"] + ([file_path + ".zst"] if zstandard is not None else [])
+    for archive in archives:
+        if not os.path.exists(archive):
+            with open(file_path, 'rb') as source:
+                if archive.endswith(".gz"):
+                    with gzip.open(archive, 'wb', compresslevel=6) as target:
+                        shutil.copyfileobj(source, target, BUFFER_SIZE)
+                else:
+                    with open(archive, 'wb') as target:
+                        zstandard.ZstdCompressor(level=3).copy_stream(source, target)
+
+    print(f"{file_path}: {os.path.getsize(file_path) / 2 ** 20:.1f} MiB")
+    for path in [file_path] + archives:
+        for threaded in (False, True):
+            start = time.perf_counter()
+            with open_text(path, threaded) as file:
+                rows = sum(1 for _ in csv.reader(file))
+            print(f"{path:<28}{os.path.getsize(path) / 2 ** 20:6.1f} MiB  "
+                  f"{'threaded' if threaded else 'inline':<9}{rows} rows in "
+                  f"{time.perf_counter() - start:.2f} s")
+
+
+# Run the script
+if __name__ == "__main__":
+    execute()
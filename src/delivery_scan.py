@@ -0,0 +1,107 @@
+"""
+delivery_scan.py
+
+This script runs every deliveries.csv analysis in a single pass over the file.
+Each analysis registers an accumulator, and every delivery row is fed to all
+registered accumulators as it is read, so the combined report costs one scan
+of deliveries.csv instead of one scan per chart. With any other IPL_BACKEND
+each chart is computed by that backend instead (see backends.py).
+"""
+
+import csv
+import importlib.util
+import os
+
+import cli
+import fast_csv
+
+# Folder holding the analysis scripts (this file lives next to them)
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Delivery-based analyses: (module name, script file, needs matches, plot function)
+DELIVERY_ANALYSES = [
+    ("top_batsmen_rcb", " Top_batsmen_RCB.py", False, "plot"),
+    ("total_runs_by_team", "total_runs_by_eac_team.py", False, "plot"),
+    ("extra_runs_2016", "Extra_runs _conceded_per_team.py", True, "plot"),
+    ("economical_bowlers_2015", "top_economic_ballers.py", True, "plot_economical_bowlers"),
+]
+
+
+# Function to load an analysis script as a module
+def load_analysis(module_name, script_file):
+    """
+    Imports an analysis script from the src/ folder by file name.
+
+    The script file names contain spaces and dashes, so they cannot be
+    imported with a plain import statement.
+
+    Args:
+        module_name (str): Name to register the module under.
+        script_file (str): File name of the script inside src/.
+
+    Returns:
+        module: The loaded analysis module.
+    """
+    spec = importlib.util.spec_from_file_location(
+        module_name, os.path.join(SCRIPTS_DIR, script_file)
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# Function to stream a CSV once and update every registered accumulator
+def scan(file_path, accumulators, columns=None):
+    """
+    Reads a CSV file once and feeds each row to every registered accumulator.
+
+    Args:
+        file_path (str): Path to the CSV file.
+        accumulators (dict): Analysis names mapped to (update, finalize) pairs.
+        columns (list, optional): Columns the accumulators use; all if omitted.
+
+    Returns:
+        dict: Analysis names mapped to their finalized results.
+    """
+    updates = [update for update, _ in accumulators.values()]
+
+    # Update every aggregation on the same row before reading the next one
+    for row in fast_csv.read_columns(file_path, columns):
+        for update in updates:
+            update(row)
+
+    return {name: finalize() for name, (_, finalize) in accumulators.items()}
+
+
+# Main execution function
+def execute():
+    """
+    Reads match data, runs all delivery analyses in one pass over
+    deliveries.csv (or with the IPL_BACKEND backend), and plots each result.
+    """
+    modules = {name: load_analysis(name, script_file)
+               for name, script_file, _, _ in DELIVERY_ANALYSES}
+
+    if cli.BACKEND != "python":
+        # Other backends answer each chart from their own storage
+        results = {name: module.compute() for name, module in modules.items()}
+    else:
+        with open("data/matches.csv", 'r', encoding='utf-8') as file:
+            matches = list(csv.DictReader(file))    # Small file, read once
+
+        # Register every analysis as an accumulator on the shared scan
+        accumulators = {name: modules[name].accumulator(matches) if needs_matches
+                        else modules[name].accumulator()
+                        for name, _, needs_matches, _ in DELIVERY_ANALYSES}
+
+        # Read only the columns some registered analysis uses
+        columns = sorted({column for module in modules.values() for column in module.DELIVERY_COLUMNS})
+        results = scan("data/deliveries.csv", accumulators, columns)   # Single pass
+
+    for name, _, _, plot_function in DELIVERY_ANALYSES:
+        getattr(modules[name], plot_function)(results[name])
+
+
+# Run the script
+if __name__ == "__main__":
+    execute()
@@ -0,0 +1,117 @@
+"""
+fast_csv.py
+
+This script is a column-projected CSV reader for the hot ingestion path.
+It takes the list of columns an analysis needs, resolves their positions
+from the header once and only splits each line as far as the last needed
+column. Lines are read in large blocks. Lines containing quotes (such as
+"Rajiv Gandhi International Stadium, Uppal") fall back to the csv module, so
+quoted commas and newlines are handled correctly.
+
+It is a drop-in replacement for read_data(): rows are dicts keyed by column
+name, holding only the requested columns. Run it to benchmark it against
+csv.DictReader on data/deliveries.csv.
+"""
+
+import csv
+import time
+from operator import itemgetter
+
+import compressed
+
+BLOCK_SIZE = 1 << 20    # Bytes of lines fetched per read
+
+
+# Function to turn CSV lines into projected dicts
+def parse_lines(lines, header, columns=None):
+    """
+    Parses CSV lines (without the header) into dicts of the requested columns.
+
+    Args:
+        lines (iterable): CSV lines, each ending with a newline.
+        header (list): Column names of the file.
+        columns (list, optional): Columns to keep; all columns if omitted.
+
+    Yields:
+        dict: One record with only the requested columns.
+    """
+    columns = list(columns or header)
+    indexes = [header.index(column) for column in columns]
+    last_index = max(indexes)
+    field_count = len(header)
+    # itemgetter returns a tuple only for 2+ indexes; zip() drops the repeat
+    pick = itemgetter(*indexes) if len(indexes) > 1 else itemgetter(indexes[0], indexes[0])
+
+    pending = ""    # Start of a quoted field that continues on the next line
+    for line in lines:
+        if pending:
+            line = pending + line
+            pending = ""
+        elif line in ("\n", "\r\n"):
+            continue            # Skip blank lines like csv.DictReader
+
+        if '"' not in line:
+            # Fast path: split only up to the last needed column
+            fields = line.rstrip("\r\n").split(",", last_index + 1)
+        elif line.count('"') % 2:
+            pending = line      # Quoted newline: wait for the rest of the row
+            continue
+        else:
+            fields = next(csv.reader([line]))
+
+        if len(fields) <= last_index:
+            fields += [None] * (field_count - len(fields))     # Short row
+        yield dict(zip(columns, pick(fields)))
+
+
+# Function to read selected columns of a CSV file
+def read_columns(file_path, columns=None):
+    """
+    Reads a CSV file keeping only the requested columns.
+
+    Args:
+        file_path (str): Path to the CSV file (plain, .gz or .zst).
+        columns (list, optional): Columns to keep; all columns if omitted.
+
+    Yields:
+        dict: One record with only the requested columns.
+    """
+    with compressed.open_text(file_path) as file:
+        header = next(csv.reader([file.readline()]))
+
+        def blocks():
+            # readlines(hint) pulls about BLOCK_SIZE bytes of whole lines per call
+            while True:
+                block = file.readlines(BLOCK_SIZE)
+                if not block:
+                    return
+                yield from block
+
+        yield from parse_lines(blocks(), header, columns)
+
+
+# Main execution function
+def execute():
+    """
+    Benchmarks csv.DictReader against the projected reader on deliveries.csv.
+    """
+    file_path = "data/deliveries.csv"
+    columns = ["batting_team", "total_runs"]
+
+    start = time.perf_counter()
+    with open(file_path, 'r', encoding='utf-8') as file:
+        dict_rows = sum(1 for _ in csv.DictReader(file))
+    dict_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fast_rows = sum(1 for _ in read_columns(file_path, columns))
+    fast_seconds = time.perf_counter() - start
+
+    print(f"csv.DictReader: {dict_rows} rows in {dict_seconds:.2f} s")
+    print(f"fast_csv ({', '.join(columns)}): {fast_rows} rows in {fast_seconds:.2f} s "
+          f"({dict_seconds / fast_seconds:.1f}x faster)")
+
+
+# Run the script
+if __name__ == "__main__":
+    execute()
@@ -1,45 +1,195 @@
 """
-foreign_umpire_analysis.py
+foreign_umpires.py
 
-This script analyzes the foreign umpires in IPL using hardcoded data,
-counts the number of umpires by country (excluding India), and plots a bar chart.
+This script analyzes the foreign umpires in IPL from matches.csv. Every
+umpire of every match (umpire1, umpire2 and umpire3) is looked up in
+data/umpire_countries.csv, and the appearances of umpires from outside India
+are counted per country and per season in a single streaming pass, so it
+scales to any number of matches. It plots a bar chart by country and a
+stacked bar chart by season.
+
+Umpires missing from the lookup file are reported so the file can be extended.
 """
 
-import matplotlib.pyplot as plt
-
-# List of umpires with their country (directly in code)
-umpires = [
-    ("Aleem Dar", "Pakistan"),
-    ("Asad Rauf", "Pakistan"),
-    ("Billy Bowden", "New Zealand"),
-    ("Bruce Oxenford", "Australia"),
-    ("Ian Gould", "England"),
-    ("Marais Erasmus", "South Africa"),
-    ("Nigel Llong", "England"),
-    ("Richard Illingworth", "England"),
-    ("Rod Tucker", "Australia"),
-    ("Kumar Dharmasena", "Sri Lanka"),
-    ("Simon Taufel", "Australia"),
-    ("Tonny Hill", "New Zealand"),
-    ("Steve Davis", "Australia"),
-    ("Jeff Crowe", "New Zealand"),
-    ("Richard kettleborough", "England"),
-]
-
-# Count foreign umpires by country (ignore India)
-counts = {}
-for _, country in umpires:
-    if country.lower() == "india":
-        continue
-    counts[country] = counts.get(country, 0) + 1
-
-# Plot bar chart
-plt.figure(figsize=(10, 6))
-plt.bar(counts.keys(), counts.values(), color="skyblue")
-plt.title("Number of Foreign Umpires in IPL by Country (Excl. India)")
-plt.xlabel("Country")
-plt.ylabel("Number of Umpires")
-plt.xticks(rotation=45)
-plt.tight_layout()
-plt.savefig("plots/foreign_umpires_by_country.png", dpi=300)
-plt.show()
+import csv
+import sys
+
+import cli
+import compressed
+import fast_csv
+from cache_files import source_stamp
+
+COUNTRIES_FILE = "data/umpire_countries.csv"
+HOME_COUNTRY = "India"
+
+# Columns used by count_appearances()
+UMPIRE_COLUMNS = ["umpire1", "umpire2", "umpire3"]
+MATCH_COLUMNS = ["season"] + UMPIRE_COLUMNS
+
+# Loaded lookup files: path -> (stamp, {umpire: country})
+_countries = {}
+
+
+# Function to stream CSV rows one at a time
+def read_data(file_path):
+    """
+    Reads IPL match data from a CSV file (plain, .gz or .zst).
+
+    Args:
+        file_path (str): Path to the CSV file containing match data.
+
+    Yields:
+        dict: One match record at a time.
+    """
+    with compressed.open_text(file_path) as file:
+        # Yield rows lazily so only the current row is held in memory
+        yield from csv.DictReader(file)
+
+
+# Function to load the umpire -> country lookup
+def load_countries(file_path=COUNTRIES_FILE):
+    """
+    Loads the country of every umpire, once per process (again only if the
+    file changes). Names and countries are interned, so the few country
+    strings are shared by every umpire.
+
+    Args:
+        file_path (str): Path to a CSV file with "umpire" and "country" columns.
+
+    Returns:
+        dict: Umpire names mapped to their countries.
+    """
+    stamp = source_stamp(file_path)
+    if file_path not in _countries or _countries[file_path][0] != stamp:
+        intern = sys.intern
+        countries = {intern(row["umpire"].strip()): intern(row["country"].strip())
+                     for row in read_data(file_path)}
+        _countries[file_path] = (stamp, countries)
+    return _countries[file_path][1]
+
+
+# Function to count foreign umpire appearances in one pass
+def count_appearances(matches, countries):
+    """
+    Counts the appearances of foreign umpires per country and per season.
+
+    Args:
+        matches (iterable): Match records (dicts) from matches.csv.
+        countries (dict): Umpire names mapped to their countries.
+
+    Returns:
+        tuple: ({country: appearances}, {season: {country: appearances}},
+                {unknown umpire: appearances}).
+    """
+    by_country = {}
+    by_season = {}
+    unknown = {}
+    for match in matches:
+        for column in UMPIRE_COLUMNS:
+            umpire = match[column]
+            if not umpire:
+                continue                # No third umpire recorded
+            country = countries.get(umpire)
+            if country is None:
+                unknown[umpire] = unknown.get(umpire, 0) + 1
+                continue
+            # Ignore Indian umpires
+            if country == HOME_COUNTRY:
+                continue
+            by_country[country] = by_country.get(country, 0) + 1
+            season = by_season.setdefault(match["season"], {})
+            season[country] = season.get(country, 0) + 1
+    return by_country, by_season, unknown
+
+
+# Function to count foreign umpires by country
+def calculate(matches, countries=None):
+    """
+    Counts the appearances of foreign umpires per country, excluding India.
+
+    Args:
+        matches (iterable): Match records (dicts) from matches.csv.
+        countries (dict, optional): Umpire lookup (COUNTRIES_FILE by default).
+
+    Returns:
+        dict: Dictionary with countries as keys and umpire appearances as values.
+    """
+    return count_appearances(matches, countries or load_countries())[0]
+
+
+# Function to plot foreign umpires by country as a bar chart
+def plot(counts, show=True):
+    """
+    Plots a bar chart of foreign umpire appearances by country.
+
+    Args:
+        counts (dict): Dictionary of countries and their umpire appearances.
+        show (bool): Display the chart after saving it (False for batch rendering).
+    """
+    # Imported here so computing without plotting never loads matplotlib
+    import matplotlib.pyplot as plt  # pylint: disable=import-outside-toplevel
+    import charts  # pylint: disable=import-outside-toplevel
+
+    charts.figure("bar")
+    plt.bar(counts.keys(), counts.values(), color="skyblue")
+    plt.title("Foreign Umpire Appearances in IPL by Country (Excl. India)")
+    plt.xlabel("Country")
+    plt.ylabel("Appearances")
+    plt.xticks(rotation=45)
+    plt.tight_layout()
+    charts.save("plots/foreign_umpires_by_country.png")
+    if show:
+        plt.show()
+
+
+# Function to plot foreign umpires by season as a stacked bar chart
+def plot_by_season(counts_by_season, show=True):
+    """
+    Plots a stacked bar chart of foreign umpire appearances per season.
+
+    Args:
+        counts_by_season (dict): Nested dictionary {season: {country: appearances}}.
+        show (bool): Display the chart after saving it (False for batch rendering).
+    """
+    # Imported here so computing without plotting never loads matplotlib
+    import matplotlib.pyplot as plt  # pylint: disable=import-outside-toplevel
+    import charts  # pylint: disable=import-outside-toplevel
+
+    charts.figure("stacked")
+    charts.stacked_bars(plt.gca(), counts_by_season)   # One segment per country
+
+    plt.title("Foreign Umpire Appearances per IPL Season")
+    plt.xlabel("Season")
+    plt.ylabel("Appearances")
+    plt.tight_layout()
+    charts.save("plots/foreign_umpires_by_season.png")
+    if show:
+        plt.show()
+
+
+# Main execution function
+def execute(show=True, output_format=None):
+    """
+    Counts foreign umpire appearances by country and season and plots the results.
+
+    Args:
+        show (bool): Display the charts after saving them.
+        output_format (str, optional): "json" or "csv" to print the counts by
+            country instead of plotting them.
+    """
+    matches = fast_csv.read_columns("data/matches.csv", MATCH_COLUMNS)   # Stream needed columns
+    counts, counts_by_season, unknown = count_appearances(matches, load_countries())
+    if unknown:
+        print(f"Umpires missing from {COUNTRIES_FILE} (not counted): {', '.join(sorted(unknown))}",
+              file=sys.stderr)
+
+    if output_format:
+        cli.emit(counts, output_format, ["country", "appearances"])
+    else:
+        plot(counts, show)                      # Generate bar chart by country
+        plot_by_season(counts_by_season, show)  # Generate stacked chart by season
+
+
+# Run the script
+if __name__ == "__main__":
+    execute(output_format=cli.output_format(__doc__))
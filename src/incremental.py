@@ -0,0 +1,343 @@
+"""
+incremental.py
+
+This script keeps the aggregates of every chart up to date as new rows are
+appended to matches.csv and deliveries.csv during a season. The aggregate
+state is persisted together with a high-water mark (byte offset and last
+match ID) per file, so each update only reads the rows added since the last
+run. If a file was rewritten instead of appended to, the state is rebuilt.
+"""
+
+import csv
+import json
+import os
+
+import leaderboard
+from cache_files import CACHE_FOLDER
+from delivery_scan import load_analysis
+
+MATCHES_FILE = "data/matches.csv"
+DELIVERIES_FILE = "data/deliveries.csv"
+STATE_FILE = os.path.join("data", CACHE_FOLDER, "incremental_state.json")
+TAIL_BYTES = 256     # Bytes before the high-water mark used to detect rewrites
+
+# Match-based analyses: (module name, script file, key in the state)
+MATCH_ANALYSES = [
+    ("matches_per_year", "matches_played_per_year.py", "matches_per_year"),
+    ("matches_played_by_team", " matches_played by_team_by_season.py", "matches_played"),
+    ("matches_won_per_team", "matches_won-per_team_per_year.py", "matches_won"),
+]
+
+
+# Function to create an empty aggregate state
+def empty_state():
+    """
+    Returns the aggregate state before any rows are ingested.
+
+    Returns:
+        dict: Per-file high-water marks and running aggregates.
+    """
+    return {
+        "matches": {"offset": 0, "header": None, "tail": "", "last_id": None,
+                    "season_by_id": {}, "matches_per_year": {},
+                    "matches_played": {}, "matches_won": {}},
+        "deliveries": {"offset": 0, "header": None, "tail": "",
+                       "team_runs": {}, "batsman_runs": {},
+                       "extra_runs": {}, "bowler_runs": {}, "bowler_balls": {},
+                       "pending": []},
+    }
+
+
+# Function to load the persisted state
+def load_state():
+    """
+    Loads the persisted aggregate state.
+
+    Returns:
+        dict: The saved state, or an empty state if none exists.
+    """
+    try:
+        with open(STATE_FILE, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return empty_state()
+
+
+# Function to save the state
+def save_state(state):
+    """
+    Saves the aggregate state, replacing the previous file atomically.
+
+    Args:
+        state (dict): Aggregate state to save.
+    """
+    os.makedirs(os.path.dirname(STATE_FILE), exist_ok=True)
+    temporary = STATE_FILE + ".tmp"
+    with open(temporary, 'w', encoding='utf-8') as file:
+        json.dump(state, file)
+    os.replace(temporary, STATE_FILE)
+
+
+# Function to check that a file only grew since the last update
+def is_appended(file_path, mark):
+    """
+    Checks that the header and the bytes just before the high-water mark are
+    unchanged, i.e. the file was only appended to.
+
+    Args:
+        file_path (str): Path to the CSV file.
+        mark (dict): High-water mark with "offset", "header" and "tail".
+
+    Returns:
+        bool: True if rows can be read incrementally from the mark.
+    """
+    if mark["header"] is None:
+        return True
+    with open(file_path, 'rb') as file:
+        header = next(csv.reader([file.readline().decode('utf-8')]))
+        file.seek(max(0, mark["offset"] - TAIL_BYTES))
+        tail = file.read(min(TAIL_BYTES, mark["offset"])).decode('latin-1')
+    return header == mark["header"] and tail == mark["tail"]
+
+
+# Function to stream the rows appended after the high-water mark
+def new_rows(file_path, mark):
+    """
+    Streams the complete rows appended to a CSV file since the last update.
+    The high-water mark is moved past them once the rows are consumed.
+
+    A trailing line without a newline (a row still being written) is left
+    for the next update.
+
+    Args:
+        file_path (str): Path to the CSV file.
+        mark (dict): High-water mark with "offset", "header" and "tail";
+                     updated in place.
+
+    Yields:
+        dict: One new record at a time.
+    """
+    with open(file_path, 'rb') as file:
+        header_line = file.readline()
+        if mark["header"] is None:
+            header = next(csv.reader([header_line.decode('utf-8')]))
+            mark.update(header=header, offset=len(header_line), tail="")
+
+        file.seek(mark["offset"])
+        offset = mark["offset"]
+
+        def complete_lines():
+            nonlocal offset
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break
+                offset += len(line)
+                yield line.decode('utf-8')
+
+        yield from csv.DictReader(complete_lines(), fieldnames=mark["header"])
+
+        file.seek(max(0, offset - TAIL_BYTES))
+        mark["tail"] = file.read(min(TAIL_BYTES, offset)).decode('latin-1')
+        mark["offset"] = offset
+
+
+# Function to add new counts into persisted counts
+def merge_counts(total, new):
+    """
+    Adds counts (optionally nested one level, e.g. {season: {team: n}}) into
+    the running totals. New keys are appended, keeping first-appearance order.
+
+    Args:
+        total (dict): Running totals, updated in place.
+        new (dict): Counts from the newly ingested rows.
+    """
+    for key, value in new.items():
+        if isinstance(value, dict):
+            merge_counts(total.setdefault(key, {}), value)
+        else:
+            total[key] = total.get(key, 0) + value
+
+
+# Function to fold new match rows into the state
+def update_matches(state, matches, modules):
+    """
+    Updates the match-based aggregates with newly appended matches.
+
+    Args:
+        state (dict): Match part of the aggregate state.
+        matches (list): New match records.
+        modules (dict): Loaded match analysis modules.
+    """
+    for name, _, key in MATCH_ANALYSES:
+        merge_counts(state[key], modules[name].calculate(matches))
+
+    for match in matches:
+        state["season_by_id"][match["id"]] = match["season"]
+        state["last_id"] = match["id"]
+
+
+# Function to add one delivery to the season totals
+def add_season_totals(state, season, bowling_team, bowler, total_runs, extra_runs):
+    """
+    Adds one delivery to the extra runs and bowler totals of its season.
+
+    Args:
+        state (dict): Delivery part of the aggregate state.
+        season (str): Season of the delivery's match.
+        bowling_team (str): Bowling team.
+        bowler (str): Bowler.
+        total_runs (int): Runs conceded on the delivery.
+        extra_runs (int): Extra runs conceded on the delivery.
+    """
+    extras = state["extra_runs"].setdefault(season, {})
+    extras[bowling_team] = extras.get(bowling_team, 0) + extra_runs
+    bowler_runs = state["bowler_runs"].setdefault(season, {})
+    bowler_runs[bowler] = bowler_runs.get(bowler, 0) + total_runs
+    bowler_balls = state["bowler_balls"].setdefault(season, {})
+    bowler_balls[bowler] = bowler_balls.get(bowler, 0) + 1
+
+
+# Function to fold in the deliveries whose match was not known yet
+def update_pending(state, season_by_id):
+    """
+    Adds the pending deliveries whose match has since been appended to
+    matches.csv to the season totals, and keeps the others pending.
+
+    Args:
+        state (dict): Delivery part of the aggregate state.
+        season_by_id (dict): Season of every known match ID.
+    """
+    pending = []
+    for delivery in state.setdefault("pending", []):
+        season = season_by_id.get(delivery[0])
+        if season is None:
+            pending.append(delivery)
+        else:
+            add_season_totals(state, season, *delivery[1:])
+    state["pending"] = pending
+
+
+# Function to fold new delivery rows into the state
+def update_deliveries(state, deliveries, season_by_id):
+    """
+    Updates the delivery-based totals with newly appended deliveries.
+
+    The season totals need the season of the delivery's match. Deliveries
+    whose match is not in matches.csv yet are kept pending (the high-water
+    mark moves past them) and added by update_pending() once it appears.
+
+    Args:
+        state (dict): Delivery part of the aggregate state.
+        deliveries (iterable): New delivery records.
+        season_by_id (dict): Season of every known match ID.
+
+    Returns:
+        int: Number of deliveries ingested.
+    """
+    team_runs = state["team_runs"]
+    count = 0
+    for delivery in deliveries:
+        count += 1
+        batting_team = delivery["batting_team"]
+        bowling_team = delivery["bowling_team"]
+        batsman = delivery["batsman"]
+        bowler = delivery["bowler"]
+        total_runs = int(delivery["total_runs"])
+        season = season_by_id.get(delivery["match_id"])
+
+        team_runs[batting_team] = team_runs.get(batting_team, 0) + total_runs
+
+        batsman_runs = state["batsman_runs"].setdefault(batting_team, {})
+        batsman_runs[batsman] = batsman_runs.get(batsman, 0) + int(delivery["batsman_runs"])
+
+        extra_runs = int(delivery["extra_runs"])
+        if season is None:
+            # Match not in matches.csv yet: keep what the season totals need
+            state.setdefault("pending", []).append(
+                [delivery["match_id"], bowling_team, bowler, total_runs, extra_runs])
+        else:
+            add_season_totals(state, season, bowling_team, bowler, total_runs, extra_runs)
+
+    return count
+
+
+# Function to ingest the rows appended since the last update
+def update(state, modules, matches_path=MATCHES_FILE, deliveries_path=DELIVERIES_FILE):
+    """
+    Ingests newly appended matches and deliveries into the state.
+
+    Args:
+        state (dict): Aggregate state, updated in place.
+        modules (dict): Loaded match analysis modules.
+        matches_path (str): Path to matches.csv.
+        deliveries_path (str): Path to deliveries.csv.
+
+    Returns:
+        tuple: (state, new match rows, new delivery rows). The state is a
+               fresh one if a file was rewritten instead of appended to.
+    """
+    if not (is_appended(matches_path, state["matches"])
+            and is_appended(deliveries_path, state["deliveries"])):
+        # A file changed in place: rebuild everything from the start
+        state = empty_state()
+
+    matches = list(new_rows(matches_path, state["matches"]))    # Small, used by 3 analyses
+    update_matches(state["matches"], matches, modules)
+    # Pending deliveries come before the new ones in deliveries.csv
+    update_pending(state["deliveries"], state["matches"]["season_by_id"])
+    delivery_count = update_deliveries(state["deliveries"],
+                                       new_rows(deliveries_path, state["deliveries"]),
+                                       state["matches"]["season_by_id"])
+    return state, len(matches), delivery_count
+
+
+# Function to derive the chart results from the state
+def results(state, team="Royal Challengers Bangalore", extras_season="2016",
+            economy_season="2015", count=leaderboard.DEFAULT_COUNT, min_balls=0):
+    """
+    Builds the result of every chart from the aggregate state.
+
+    Args:
+        state (dict): Aggregate state.
+        team (str): Team for the top batsmen ranking.
+        extras_season (str): Season for the extra runs chart.
+        economy_season (str): Season for the economy chart.
+        count (int): Number of batsmen and bowlers to rank (10 by default).
+        min_balls (int): Minimum balls bowled to be ranked (0 ranks everybody).
+
+    Returns:
+        dict: Chart results keyed by module name.
+    """
+    deliveries = state["deliveries"]
+    batsman_runs = deliveries["batsman_runs"].get(team, {})
+    bowler_runs = deliveries["bowler_runs"].get(economy_season, {})
+    bowler_balls = deliveries["bowler_balls"].get(economy_season, {})
+
+    # Calculate economy rate for each bowler
+    economy = leaderboard.economy_rates(bowler_runs, bowler_balls, min_balls)
+
+    chart_results = {name: state["matches"][key] for name, _, key in MATCH_ANALYSES}
+    chart_results.update({
+        "top_batsmen_rcb": leaderboard.top_k(batsman_runs, count),
+        "total_runs_by_team": deliveries["team_runs"],
+        "extra_runs_2016": deliveries["extra_runs"].get(extras_season, {}),
+        "economical_bowlers_2015": leaderboard.top_k(economy, count, descending=False),
+    })
+    return chart_results
+
+
+# Main execution function
+def execute():
+    """
+    Ingests rows appended since the last run and saves the updated state.
+    """
+    modules = {name: load_analysis(name, script_file) for name, script_file, _ in MATCH_ANALYSES}
+    state, new_matches, new_deliveries = update(load_state(), modules)
+    save_state(state)
+    print(f"Ingested {new_matches} matches and {new_deliveries} deliveries "
+          f"(last match ID: {state['matches']['last_id']})")
+
+
+# Run the script
+if __name__ == "__main__":
+    execute()
@@ -0,0 +1,306 @@
+"""
+instrument.py
+
+This script instruments every analysis script stage by stage. For each
+analysis it times reading the input with the readers the scripts use in
+production (fast_csv column streaming, and the match index for season
+analyses), calculate() (int() conversion, aggregation and ranking) and
+plot(). Each stage is timed as a whole; the rows read, the rows per second
+and the peak memory (max RSS) of the process after each stage are recorded.
+The run can optionally be profiled with cProfile or with a built-in sampling
+profiler.
+
+Each run writes a JSON metrics report and a human-readable summary to
+metrics/, so throughput can be tracked across production runs.
+
+Usage:
+    python src/instrument.py [--profile cprofile|sample] [--no-plot] [analysis ...]
+"""
+
+import argparse
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+
+import backends
+import fast_csv
+from benchmark import git_commit, peak_rss_mb
+
+METRICS_DIR = "metrics"
+TOP_FUNCTIONS = 15            # Functions listed per profile in the summary
+SAMPLE_INTERVAL = 0.005       # Seconds between samples of the sampling profiler
+
+# Instrumented analyses: (module name, backends.ANALYSES name, chart parameters, plot function)
+ANALYSES = [
+    ("top_batsmen_rcb", "top_batsmen", {"team": "Royal Challengers Bangalore", "count": 10}, "plot"),
+    ("total_runs_by_team", "total_runs_by_team", {}, "plot"),
+    ("extra_runs_2016", "extra_runs", {"season": "2016"}, "plot"),
+    ("economical_bowlers_2015", "economical_bowlers",
+     {"season": "2015", "count": 10, "min_balls": 0}, "plot_economical_bowlers"),
+    ("matches_per_year", "matches_per_year", {}, "plot"),
+    ("matches_played_by_team", "matches_played_by_team", {}, "plot"),
+    ("matches_won_per_team", "matches_won_per_team", {}, "plot"),
+    ("foreign_umpires", None, {}, "plot"),          # Python only, not in backends.py
+]
+
+
+# Function to open the inputs of an analysis with the production readers
+def open_inputs(analysis, data_dir="data"):
+    """
+    Returns the calculate function of an analysis, its record streams and
+    its extra arguments, as the python backend of backends.py runs it.
+
+    Args:
+        analysis (tuple): Entry of ANALYSES.
+        data_dir (str): Folder holding matches.csv and deliveries.csv.
+
+    Returns:
+        tuple: (module, calculate function, list of record iterables, arguments).
+    """
+    name, backend_name, parameters, _ = analysis
+    module = backends.analysis_module(name)
+    matches_path = os.path.join(data_dir, "matches.csv")
+    if backend_name is None:
+        # foreign_umpires.py streams the season and umpire columns of matches.csv
+        matches = fast_csv.read_columns(matches_path, module.MATCH_COLUMNS)
+        return module, module.calculate, [matches], []
+
+    _, function, _, parameter_names = backends.ANALYSES[backend_name]
+    arguments = [parameters[key] for key in parameter_names]
+    inputs = backends.python_inputs(backend_name, arguments, matches_path,
+                                    os.path.join(data_dir, "deliveries.csv"))
+    return module, getattr(module, function), inputs, arguments
+
+
+# Function to measure the stages of one analysis
+def measure(analysis, data_dir="data", plot=True):
+    """
+    Runs one analysis and measures its read, calculate and plot stages.
+
+    The input is read into lists first, so reading and calculating are timed
+    as two whole phases instead of row by row.
+
+    Args:
+        analysis (tuple): Entry of ANALYSES.
+        data_dir (str): Folder holding matches.csv and deliveries.csv.
+        plot (bool): Also time the plot stage (headless, nothing is shown).
+
+    Returns:
+        dict: Metrics of every stage.
+    """
+    name, _, _, plot_function = analysis
+
+    module, calculate, inputs, arguments = open_inputs(analysis, data_dir)
+    start = time.perf_counter()
+    data = [list(records) for records in inputs]
+    read_seconds = time.perf_counter() - start
+    rows = sum(len(records) for records in data)
+
+    start = time.perf_counter()
+    result = calculate(*data, *arguments)
+    calculate_seconds = time.perf_counter() - start
+    del data
+
+    stages = {
+        "read": {"seconds": read_seconds, "rows": rows,
+                 "rows_per_second": rows / read_seconds if read_seconds else 0.0,
+                 "peak_rss_mb": peak_rss_mb()},
+        "calculate": {"seconds": calculate_seconds,
+                      "rows_per_second": rows / calculate_seconds if calculate_seconds else 0.0,
+                      "peak_rss_mb": peak_rss_mb()},
+    }
+
+    if plot:
+        start = time.perf_counter()
+        getattr(module, plot_function)(result, show=False)
+        stages["plot"] = {"seconds": time.perf_counter() - start, "peak_rss_mb": peak_rss_mb()}
+
+    total = read_seconds + calculate_seconds
+    return {"analysis": name, "rows": rows,
+            "seconds": sum(stage["seconds"] for stage in stages.values()),
+            "rows_per_second": rows / total if total else 0.0, "stages": stages}
+
+
+# Function to sample the call stack of a thread at a fixed interval
+def sample_stacks(thread_id, interval, stop, samples):
+    """
+    Records which functions a thread is running, every interval seconds,
+    until stop is set. Runs in a background thread.
+
+    Samples are taken when the interpreter switches threads, so time spent
+    inside C code (e.g. the csv module) is attributed to its Python caller.
+
+    Args:
+        thread_id (int): Thread to sample.
+        interval (float): Seconds between samples.
+        stop (threading.Event): Set to end sampling.
+        samples (dict): {"self": {...}, "total": {...}, "count": n}, updated in place.
+    """
+    while not stop.wait(interval):
+        frame = sys._current_frames().get(thread_id)    # pylint: disable=protected-access
+        if frame is None:
+            continue
+        samples["count"] += 1
+
+        # The innermost frame is running; every frame on the stack is active
+        innermost = True
+        seen = set()
+        while frame is not None:
+            code = frame.f_code
+            function = f"{os.path.basename(code.co_filename)}:{code.co_firstlineno}({code.co_name})"
+            if innermost:
+                samples["self"][function] = samples["self"].get(function, 0) + 1
+                innermost = False
+            if function not in seen:
+                seen.add(function)
+                samples["total"][function] = samples["total"].get(function, 0) + 1
+            frame = frame.f_back
+
+
+# Function to run every analysis, optionally under a profiler
+def run(analyses, data_dir="data", plot=True, profiler=None):
+    """
+    Measures a list of analyses.
+
+    Args:
+        analyses (list): Entries of ANALYSES.
+        data_dir (str): Folder holding matches.csv and deliveries.csv.
+        plot (bool): Also time the plot stages.
+        profiler (str, optional): "cprofile", "sample" or None.
+
+    Returns:
+        tuple: (list of per-analysis metrics, profile report dict or None).
+    """
+    if plot:
+        # Headless rendering, as in render_all.py
+        from render_all import init_worker  # pylint: disable=import-outside-toplevel
+        init_worker()
+
+    metrics = []
+    if profiler == "cprofile":
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            metrics = [measure(analysis, data_dir, plot) for analysis in analyses]
+        finally:
+            profile.disable()
+
+        text = io.StringIO()
+        stats = pstats.Stats(profile, stream=text)
+        stats.sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+        stats.sort_stats("tottime").print_stats(TOP_FUNCTIONS)
+        return metrics, {"profiler": "cprofile", "profile": profile, "text": text.getvalue()}
+
+    if profiler == "sample":
+        samples = {"self": {}, "total": {}, "count": 0}
+        stop = threading.Event()
+        sampler = threading.Thread(target=sample_stacks, daemon=True,
+                                   args=(threading.get_ident(), SAMPLE_INTERVAL, stop, samples))
+        sampler.start()
+        try:
+            metrics = [measure(analysis, data_dir, plot) for analysis in analyses]
+        finally:
+            stop.set()
+            sampler.join()
+
+        report = {"profiler": "sample", "interval_seconds": SAMPLE_INTERVAL, "samples": samples["count"]}
+        for kind in ("self", "total"):
+            ranked = sorted(samples[kind].items(), key=lambda x: x[1], reverse=True)[:TOP_FUNCTIONS]
+            report[kind] = [{"function": function, "samples": count,
+                             "share": count / samples["count"] if samples["count"] else 0.0}
+                            for function, count in ranked]
+        return metrics, report
+
+    metrics = [measure(analysis, data_dir, plot) for analysis in analyses]
+    return metrics, None
+
+
+# Function to format the human-readable summary of a run
+def summary(report):
+    """
+    Formats a metrics report as a text table.
+
+    Args:
+        report (dict): Metrics report written by execute().
+
+    Returns:
+        str: The summary.
+    """
+    lines = [f"Run {report['created']}  commit {report['commit'][:12]}  "
+             f"peak RSS {report['peak_rss_mb']:.1f} MiB",
+             f"{'analysis':<26}{'stage':<11}{'seconds':>10}{'rows':>12}{'rows/s':>14}{'RSS MiB':>10}"]
+    for metrics in report["analyses"]:
+        for stage, values in metrics["stages"].items():
+            rows = values.get("rows", metrics["rows"] if stage == "calculate" else "")
+            rate = f"{values['rows_per_second']:,.0f}" if "rows_per_second" in values else ""
+            lines.append(f"{metrics['analysis']:<26}{stage:<11}{values['seconds']:>10.3f}"
+                         f"{rows:>12}{rate:>14}{values['peak_rss_mb']:>10.1f}")
+
+    profile = report.get("profile")
+    if profile and profile["profiler"] == "sample":
+        lines.append(f"\nSampling profile ({profile['samples']} samples, "
+                     f"every {profile['interval_seconds'] * 1000:.0f} ms)")
+        for kind in ("self", "total"):
+            lines.append(f"  {kind} time:")
+            lines += [f"    {entry['share']:6.1%}  {entry['function']}" for entry in profile[kind]]
+    elif profile:
+        lines.append("\ncProfile (cumulative, then own time):")
+        lines.append(profile["text"])
+    return "\n".join(lines)
+
+
+# Main execution function
+def execute():
+    """
+    Instruments the analyses from the command line and writes the report.
+    """
+    parser = argparse.ArgumentParser(description="Time every stage of the IPL analyses.")
+    parser.add_argument("analyses", nargs="*", help="analysis names (all by default)")
+    parser.add_argument("--profile", choices=["cprofile", "sample"], help="also profile the run")
+    parser.add_argument("--no-plot", action="store_true", help="skip the plot stage")
+    parser.add_argument("--data-dir", default="data", help="folder holding the CSV files")
+    parser.add_argument("--output-dir", default=METRICS_DIR, help="folder for the reports")
+    args = parser.parse_args()
+
+    names = [analysis[0] for analysis in ANALYSES]
+    unknown = set(args.analyses) - set(names)
+    if unknown:
+        parser.error(f"unknown analyses: {', '.join(sorted(unknown))} (choose from {', '.join(names)})")
+    analyses = [analysis for analysis in ANALYSES if not args.analyses or analysis[0] in args.analyses]
+
+    metrics, profile = run(analyses, args.data_dir, not args.no_plot, args.profile)
+    report = {
+        "commit": git_commit(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "peak_rss_mb": peak_rss_mb(),
+        "analyses": metrics,
+    }
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    base = os.path.join(args.output_dir, "run-" + time.strftime("%Y%m%d-%H%M%S"))
+    if profile and profile["profiler"] == "cprofile":
+        # Keep the raw profile for snakeviz/pstats; the report gets the text
+        profile["profile"].dump_stats(base + ".prof")
+        profile = {"profiler": "cprofile", "stats_file": base + ".prof", "text": profile["text"]}
+    if profile:
+        report["profile"] = profile
+
+    with open(base + ".json", 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=2)
+    text = summary(report)
+    with open(base + ".txt", 'w', encoding='utf-8') as file:
+        file.write(text + "\n")
+
+    print(text)
+    print(f"\nReport saved to {base}.json and {base}.txt")
+
+
+# Run the script
+if __name__ == "__main__":
+    execute()
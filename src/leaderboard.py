@@ -0,0 +1,192 @@
+"""
+leaderboard.py
+
+This script ranks players for leaderboards without sorting every player.
+top_k() keeps only the best K entries with a bounded heap (heapq), which
+costs O(n log K) instead of the O(n log n) of sorting the whole dictionary.
+Ties are broken deterministically by first appearance, exactly like
+sorted(...)[:K] on an insertion-ordered dict, so the charts do not change.
+
+Ranking keeps a leaderboard sorted while its scores change one at a time
+(e.g. ball by ball in live_scoring.py), so the top K can be read at any
+moment without ranking the whole table again.
+
+Run it to build the batting and economy leaderboards of every season and
+team in one pass over the data and to time the heap against a full sort.
+"""
+
+import heapq
+import time
+from bisect import bisect_left, insort
+from operator import itemgetter
+
+import fast_csv
+
+DEFAULT_COUNT = 10    # Entries per leaderboard (K)
+
+# Columns used by leaderboards()
+MATCH_COLUMNS = ["id", "season"]
+DELIVERY_COLUMNS = ["match_id", "batting_team", "bowling_team", "batsman", "bowler",
+                    "batsman_runs", "total_runs"]
+
+
+# Function to select the best K entries of a dictionary
+def top_k(totals, count=DEFAULT_COUNT, descending=True):
+    """
+    Selects the count best entries of a dictionary with a bounded heap.
+
+    heapq.nlargest/nsmallest are equivalent to a stable sort followed by a
+    slice, so entries with equal values keep their insertion order.
+
+    Args:
+        totals (dict): Names mapped to their values.
+        count (int): Number of entries to keep (K).
+        descending (bool): True to keep the highest values, False the lowest.
+
+    Returns:
+        dict: The selected entries in ranked order.
+    """
+    select = heapq.nlargest if descending else heapq.nsmallest
+    return dict(select(count, totals.items(), key=itemgetter(1)))
+
+
+# Function to turn runs and balls into economy rates
+def economy_rates(bowler_runs, bowler_balls, min_balls=0):
+    """
+    Calculates the economy rate of every bowler who qualifies.
+
+    Args:
+        bowler_runs (dict): Bowler names mapped to runs conceded.
+        bowler_balls (dict): Bowler names mapped to balls bowled.
+        min_balls (int): Minimum balls bowled to be ranked (0 ranks everybody).
+
+    Returns:
+        dict: Bowler names mapped to runs conceded per over.
+    """
+    economy = {}
+    for bowler, runs in bowler_runs.items():
+        balls = bowler_balls[bowler]
+        if balls < min_balls:
+            continue            # Too few balls to qualify
+        overs = balls / 6  # 6 balls per over
+        economy[bowler] = runs / overs if overs > 0 else 0
+    return economy
+
+
+# Leaderboard that stays sorted while scores change
+class Ranking:
+    """
+    Keeps every entry sorted by score, with ties in first-appearance order,
+    so top() gives the same result as top_k() on the current totals.
+
+    Changing a score moves one entry: a binary search finds it and insort
+    puts it back in place, O(log n) comparisons plus a short list move.
+    """
+
+    def __init__(self, descending=True):
+        self.sign = -1 if descending else 1
+        self.entries = []       # Sorted (sign * score, first appearance, name)
+        self.positions = {}     # name -> its current entry
+
+    def update(self, name, score):
+        entry = self.positions.get(name)
+        if entry is None:
+            first_seen = len(self.positions)
+        else:
+            first_seen = entry[1]
+            del self.entries[bisect_left(self.entries, entry)]
+        entry = (self.sign * score, first_seen, name)
+        insort(self.entries, entry)
+        self.positions[name] = entry
+
+    def top(self, count=DEFAULT_COUNT, qualifies=None):
+        # qualifies(name) can skip entries, e.g. bowlers below a minimum of balls
+        best = {}
+        for score, _, name in self.entries:
+            if len(best) >= count:
+                break
+            if qualifies is None or qualifies(name):
+                best[name] = self.sign * score
+        return best
+
+
+# Function to build the leaderboards of every season and team
+def leaderboards(matches, deliveries, count=DEFAULT_COUNT, min_balls=0):
+    """
+    Builds the top batsmen and most economical bowlers of every season and
+    team from one pass over the deliveries.
+
+    Args:
+        matches (iterable): Match records (dicts) from matches.csv.
+        deliveries (iterable): Delivery records (dicts) from deliveries.csv.
+        count (int): Number of entries per leaderboard (K).
+        min_balls (int): Minimum balls bowled to enter an economy leaderboard.
+
+    Returns:
+        dict: {"batsmen": {season: {team: {batsman: runs}}},
+               "economy": {season: {team: {bowler: economy}}}}.
+    """
+    season_by_id = {match["id"]: match["season"] for match in matches}
+
+    # (season, team) -> player -> total
+    batsman_runs = {}
+    bowler_runs = {}
+    bowler_balls = {}
+    for delivery in deliveries:
+        season = season_by_id.get(delivery["match_id"])
+
+        batting = batsman_runs.setdefault((season, delivery["batting_team"]), {})
+        batsman = delivery["batsman"]
+        batting[batsman] = batting.get(batsman, 0) + int(delivery["batsman_runs"])
+
+        key = (season, delivery["bowling_team"])
+        runs = bowler_runs.setdefault(key, {})
+        balls = bowler_balls.setdefault(key, {})
+        bowler = delivery["bowler"]
+        runs[bowler] = runs.get(bowler, 0) + int(delivery["total_runs"])
+        balls[bowler] = balls.get(bowler, 0) + 1
+
+    boards = {"batsmen": {}, "economy": {}}
+    for (season, team), totals in batsman_runs.items():
+        boards["batsmen"].setdefault(season, {})[team] = top_k(totals, count)
+    for (season, team), runs in bowler_runs.items():
+        economy = economy_rates(runs, bowler_balls[(season, team)], min_balls)
+        boards["economy"].setdefault(season, {})[team] = top_k(economy, count, descending=False)
+    return boards
+
+
+# Main execution function
+def execute():
+    """
+    Builds every leaderboard and times top_k() against a full sort.
+    """
+    matches = list(fast_csv.read_columns("data/matches.csv", MATCH_COLUMNS))
+    deliveries = list(fast_csv.read_columns("data/deliveries.csv", DELIVERY_COLUMNS))
+
+    start = time.perf_counter()
+    boards = leaderboards(matches, deliveries, min_balls=60)
+    print(f"Built {sum(len(teams) for teams in boards['batsmen'].values())} batting and "
+          f"{sum(len(teams) for teams in boards['economy'].values())} economy leaderboards "
+          f"in {time.perf_counter() - start:.2f} s")
+
+    # Compare the selection step alone on the all-time batting table
+    totals = {}
+    for delivery in deliveries:
+        totals[delivery["batsman"]] = totals.get(delivery["batsman"], 0) + int(delivery["batsman_runs"])
+
+    repeats = 1000
+    start = time.perf_counter()
+    for _ in range(repeats):
+        dict(sorted(totals.items(), key=lambda x: x[1], reverse=True)[:DEFAULT_COUNT])
+    sort_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(repeats):
+        top_k(totals)
+    heap_seconds = time.perf_counter() - start
+    print(f"Top {DEFAULT_COUNT} of {len(totals)} batsmen x{repeats}: full sort {sort_seconds:.3f} s, "
+          f"heap {heap_seconds:.3f} s")
+
+
+# Run the script
+if __name__ == "__main__":
+    execute()
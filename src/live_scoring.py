@@ -0,0 +1,381 @@
+"""
+live_scoring.py
+
+This script ingests deliveries ball by ball during a match and keeps the
+standings up to date as each ball arrives: team run totals, batsman totals,
+bowler runs and balls (for economy) and extras per season. Each ball costs a
+few dictionary updates plus moving one batsman and one bowler in their
+leaderboard.Ranking, instead of re-running the chart scripts over the whole
+file.
+
+Deliveries arrive as CSV lines in the deliveries.csv format, either on a
+local TCP socket or appended to a file that is tailed. A header line
+(starting with "match_id") may be sent first to change the column order.
+Deliveries of matches not yet in matches.csv count towards the live season
+(the latest season in matches.csv unless --season is given).
+
+Standings are answered from memory on a second port, one request per line,
+one JSON response per line:
+
+    top_batsmen?team=Mumbai+Indians&count=5
+    total_runs
+    extra_runs?season=2017
+    economical_bowlers?season=2017&count=10&min_balls=24
+    status
+
+Usage:
+    python src/live_scoring.py [--tail FILE] [--port 9000] [--query-port 9001] [--history]
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import time
+from urllib.parse import parse_qsl, urlsplit
+
+import compressed
+import fast_csv
+import leaderboard
+
+MATCHES_FILE = "data/matches.csv"
+DELIVERIES_FILE = "data/deliveries.csv"
+POLL_INTERVAL = 0.05      # Seconds between checks of a tailed file
+
+
+# Function to create the live standings
+def empty_scores(season_by_id, live_season):
+    """
+    Returns the standings before any ball is ingested.
+
+    Args:
+        season_by_id (dict): Season of every match ID in matches.csv.
+        live_season (str): Season of matches missing from matches.csv.
+
+    Returns:
+        dict: Running totals and rankings.
+    """
+    return {
+        "season_by_id": season_by_id, "live_season": live_season,
+        "balls": 0, "last_ball": None,
+        "team_runs": {},
+        # Per batting team
+        "batsman_runs": {}, "batsman_rankings": {},
+        # Per season
+        "extra_runs": {}, "bowler_runs": {}, "bowler_balls": {}, "economy_rankings": {},
+    }
+
+
+# Function to add one ball to the standings
+def add_delivery(scores, delivery):
+    """
+    Updates every total and ranking touched by one delivery.
+
+    Args:
+        scores (dict): Standings, updated in place.
+        delivery (dict): One delivery record.
+    """
+    # Read every field first, so a malformed delivery changes nothing
+    batting_team = delivery["batting_team"]
+    bowling_team = delivery["bowling_team"]
+    batsman = delivery["batsman"]
+    bowler = delivery["bowler"]
+    match_id = delivery["match_id"]
+    total_runs = int(delivery["total_runs"])
+    runs_scored = int(delivery["batsman_runs"])
+    extras = int(delivery["extra_runs"])
+
+    team_runs = scores["team_runs"]
+    team_runs[batting_team] = team_runs.get(batting_team, 0) + total_runs
+
+    batsman_runs = scores["batsman_runs"].setdefault(batting_team, {})
+    batsman_runs[batsman] = batsman_runs.get(batsman, 0) + runs_scored
+    ranking = scores["batsman_rankings"].get(batting_team)
+    if ranking is None:
+        ranking = scores["batsman_rankings"][batting_team] = leaderboard.Ranking()
+    ranking.update(batsman, batsman_runs[batsman])
+
+    season = scores["season_by_id"].get(match_id, scores["live_season"])
+    extra_runs = scores["extra_runs"].setdefault(season, {})
+    extra_runs[bowling_team] = extra_runs.get(bowling_team, 0) + extras
+
+    bowler_runs = scores["bowler_runs"].setdefault(season, {})
+    bowler_balls = scores["bowler_balls"].setdefault(season, {})
+    bowler_runs[bowler] = bowler_runs.get(bowler, 0) + total_runs
+    bowler_balls[bowler] = bowler_balls.get(bowler, 0) + 1
+    ranking = scores["economy_rankings"].get(season)
+    if ranking is None:
+        ranking = scores["economy_rankings"][season] = leaderboard.Ranking(descending=False)
+    # Same float operations as leaderboard.economy_rates: runs / (balls / 6)
+    ranking.update(bowler, bowler_runs[bowler] / (bowler_balls[bowler] / 6))
+
+    scores["balls"] += 1
+    scores["last_ball"] = time.time()
+
+
+# Function to parse and add one line received from a source
+def ingest_line(scores, line, header):
+    """
+    Adds the delivery on one CSV line. A header line replaces the columns;
+    a malformed line is reported and skipped.
+
+    Args:
+        scores (dict): Standings, updated in place.
+        line (str): One line of CSV text.
+        header (list): Column names of the source; replaced in place.
+    """
+    if not line.strip():
+        return
+    values = next(csv.reader([line]))
+    if values[0] == "match_id":
+        header[:] = values
+        return
+    try:
+        add_delivery(scores, dict(zip(header, values)))
+    except (KeyError, ValueError) as error:
+        print(f"Skipped malformed delivery {line.strip()!r}: {error!r}")
+
+
+# Function to read the batting leaderboard of a team
+def top_batsmen(scores, team, count):
+    """
+    Returns the top batsmen of a team from its live ranking.
+
+    Args:
+        scores (dict): Standings.
+        team (str): Batting team.
+        count (int): Number of batsmen to return.
+
+    Returns:
+        dict: Batsmen with their total runs, best first.
+    """
+    ranking = scores["batsman_rankings"].get(team)
+    return ranking.top(count) if ranking is not None else {}
+
+
+# Function to read the economy leaderboard of a season
+def economical_bowlers(scores, season, count, min_balls):
+    """
+    Returns the most economical bowlers of a season from its live ranking.
+
+    Args:
+        scores (dict): Standings.
+        season (str): Season to rank.
+        count (int): Number of bowlers to return.
+        min_balls (int): Minimum balls bowled to be ranked (0 ranks everybody).
+
+    Returns:
+        dict: Bowlers with their economy rates, best first.
+    """
+    ranking = scores["economy_rankings"].get(season)
+    if ranking is None:
+        return {}
+    balls = scores["bowler_balls"][season]
+    return ranking.top(count, (lambda bowler: balls[bowler] >= min_balls) if min_balls else None)
+
+
+# Standings served on the query port: name -> (answer(scores, parameters), default parameters)
+QUERIES = {
+    "top_batsmen": (
+        lambda scores, p: top_batsmen(scores, p["team"], p["count"]),
+        {"team": "Royal Challengers Bangalore", "count": leaderboard.DEFAULT_COUNT}),
+    "total_runs": (
+        lambda scores, p: scores["team_runs"], {}),
+    "extra_runs": (
+        lambda scores, p: scores["extra_runs"].get(p["season"] or scores["live_season"], {}),
+        {"season": ""}),
+    "economical_bowlers": (
+        lambda scores, p: economical_bowlers(scores, p["season"] or scores["live_season"],
+                                             p["count"], p["min_balls"]),
+        {"season": "", "count": leaderboard.DEFAULT_COUNT, "min_balls": 0}),
+    "status": (
+        lambda scores, p: {"balls": scores["balls"], "last_ball": scores["last_ball"],
+                           "live_season": scores["live_season"]}, {}),
+}
+
+
+# Function to answer one query line
+def answer(scores, request):
+    """
+    Answers a request such as "top_batsmen?team=Mumbai+Indians&count=5".
+
+    Args:
+        scores (dict): Standings.
+        request (str): Query name and optional parameters.
+
+    Returns:
+        dict: {"result": ...} or {"error": ...}.
+    """
+    url = urlsplit(request.strip())
+    name = url.path.strip("/")
+    if name not in QUERIES:
+        return {"error": f"unknown query {name!r}; choose from {', '.join(QUERIES)}"}
+
+    compute, defaults = QUERIES[name]
+    parameters = dict(defaults)
+    try:
+        for key, value in parse_qsl(url.query):
+            if key not in defaults:
+                raise ValueError(f"unknown parameter {key}")
+            # Parameters take the type of their default (e.g. count is an int)
+            parameters[key] = type(defaults[key])(value)
+    except ValueError as error:
+        return {"error": str(error)}
+    return {"result": compute(scores, parameters)}
+
+
+# Function to ingest the lines sent on one socket connection
+async def read_connection(scores, header, reader, writer):
+    """
+    Adds every delivery line received on a connection until it closes.
+
+    Args:
+        scores (dict): Standings, updated in place.
+        header (list): Default column names (each connection gets a copy).
+        reader (asyncio.StreamReader): Incoming side of the connection.
+        writer (asyncio.StreamWriter): Outgoing side of the connection.
+    """
+    header = list(header)
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            ingest_line(scores, line.decode('utf-8'), header)
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+# Function to follow a file and ingest the lines appended to it
+async def tail_file(scores, header, file_path):
+    """
+    Reads a file from the start and keeps reading the lines appended to it.
+    A line without its newline yet is kept until the rest arrives.
+
+    Args:
+        scores (dict): Standings, updated in place.
+        header (list): Default column names.
+        file_path (str): File to follow.
+    """
+    header = list(header)
+    partial = ""
+    with open(file_path, 'r', encoding='utf-8', newline='') as file:
+        while True:
+            line = file.readline()
+            if not line:
+                await asyncio.sleep(POLL_INTERVAL)
+                continue
+            partial += line
+            if partial.endswith("\n"):
+                ingest_line(scores, partial, header)
+                partial = ""
+
+
+# Function to answer the query lines of one connection
+async def serve_queries(scores, reader, writer):
+    """
+    Answers query lines on a connection until it closes.
+
+    Args:
+        scores (dict): Standings.
+        reader (asyncio.StreamReader): Incoming side of the connection.
+        writer (asyncio.StreamWriter): Outgoing side of the connection.
+    """
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            # Answered on the event loop: reading the standings never blocks
+            writer.write(json.dumps(answer(scores, line.decode('utf-8'))).encode('utf-8') + b"\n")
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+# Function to load the match seasons and the delivery columns
+def load_reference(matches_path=MATCHES_FILE, deliveries_path=DELIVERIES_FILE):
+    """
+    Reads the season of every known match and the deliveries.csv header.
+
+    Args:
+        matches_path (str): Path to matches.csv.
+        deliveries_path (str): Path to deliveries.csv.
+
+    Returns:
+        tuple: (season_by_id dict, latest season, header list).
+    """
+    season_by_id = {match["id"]: match["season"]
+                    for match in fast_csv.read_columns(matches_path, ["id", "season"])}
+    latest = max(season_by_id.values(), key=int, default=None)
+    with compressed.open_text(deliveries_path) as file:
+        header = next(csv.reader(file))
+    return season_by_id, latest, header
+
+
+# Function to run the ingestion source and the query server
+async def run(scores, header, host, port, query_port, tail=None):
+    """
+    Ingests deliveries from a socket (or a tailed file) and serves queries
+    until interrupted.
+
+    Args:
+        scores (dict): Standings, updated in place.
+        header (list): Default column names of the deliveries.
+        host (str): Interface to listen on.
+        port (int): TCP port receiving delivery lines (unused with tail).
+        query_port (int): TCP port answering queries.
+        tail (str, optional): File to follow instead of listening on port.
+    """
+    queries = await asyncio.start_server(
+        lambda reader, writer: serve_queries(scores, reader, writer), host, query_port)
+    print(f"Answering queries on {host}:{query_port}")
+
+    async with queries:
+        if tail:
+            print(f"Following {tail}")
+            await tail_file(scores, header, tail)
+        else:
+            source = await asyncio.start_server(
+                lambda reader, writer: read_connection(scores, header, reader, writer), host, port)
+            print(f"Receiving deliveries on {host}:{port}")
+            async with source:
+                await source.serve_forever()
+
+
+# Main execution function
+def execute():
+    """
+    Starts live ingestion from the command line.
+    """
+    parser = argparse.ArgumentParser(description="Keep IPL standings up to date ball by ball.")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to listen on")
+    parser.add_argument("--port", type=int, default=9000, help="TCP port receiving delivery lines")
+    parser.add_argument("--query-port", type=int, default=9001, help="TCP port answering queries")
+    parser.add_argument("--tail", help="follow this file instead of listening on --port")
+    parser.add_argument("--season", help="season of matches missing from matches.csv")
+    parser.add_argument("--history", action="store_true",
+                        help="start from the totals of data/deliveries.csv")
+    args = parser.parse_args()
+
+    season_by_id, latest, header = load_reference()
+    scores = empty_scores(season_by_id, args.season or latest)
+    if args.history:
+        start = time.perf_counter()
+        for delivery in fast_csv.read_columns(DELIVERIES_FILE):
+            add_delivery(scores, delivery)
+        print(f"Loaded {scores['balls']} past deliveries in {time.perf_counter() - start:.2f} s")
+
+    try:
+        asyncio.run(run(scores, header, args.host, args.port, args.query_port, args.tail))
+    except KeyboardInterrupt:
+        pass
+
+
+# Run the script
+if __name__ == "__main__":
+    execute()
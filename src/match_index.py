@@ -0,0 +1,229 @@
+"""
+match_index.py
+
+This script builds a persistent index that maps every match ID to its season
+and to the byte and row ranges of its deliveries in deliveries.csv.
+Season-filtered analyses use it to seek straight to that season's delivery
+blocks instead of scanning the whole file and discarding other seasons.
+"""
+
+import csv
+import json
+import os
+
+import compressed
+from cache_files import cache_path, source_stamp
+from fast_csv import parse_lines, read_columns
+
+
+# Function to locate the persisted index of a deliveries file
+def index_path(deliveries_path):
+    """
+    Returns the file used to persist the index of a deliveries file.
+
+    Args:
+        deliveries_path (str): Path to deliveries.csv.
+
+    Returns:
+        str: Path to the JSON index file.
+    """
+    return cache_path(deliveries_path) + ".index.json"
+
+
+# Function to build the match index in one pass over deliveries.csv
+def build_index(matches_path, deliveries_path):
+    """
+    Builds the match index and saves it next to the columnar cache.
+
+    Args:
+        matches_path (str): Path to matches.csv (plain, .gz or .zst).
+        deliveries_path (str): Path to deliveries.csv.
+
+    Returns:
+        dict: The index. "matches" maps each match ID to its season and a list
+              of [start_byte, end_byte, start_row, end_row] delivery blocks.
+    """
+    seasons = {match["id"]: match["season"]
+               for match in read_columns(matches_path, ["id", "season"])}
+
+    matches = {match_id: {"season": season, "blocks": []}
+               for match_id, season in seasons.items()}
+
+    with open(deliveries_path, 'rb') as file:
+        header_line = file.readline()
+        header = next(csv.reader([header_line.decode('utf-8')]))
+        match_id_column = header.index("match_id")
+
+        offset = len(header_line)
+        row = 0
+        block = None    # [match_id, start_byte, start_row] of the current block
+        for line in file:
+            fields = next(csv.reader([line.decode('utf-8')]))
+            if not fields:
+                offset += len(line)     # Blank line: no delivery, readers skip it
+                continue
+            match_id = fields[match_id_column]
+
+            # Deliveries of one match are contiguous; close the block on change
+            if block is None or block[0] != match_id:
+                if block is not None:
+                    add_block(matches, block, offset, row)
+                block = [match_id, offset, row]
+
+            offset += len(line)
+            row += 1
+        if block is not None:
+            add_block(matches, block, offset, row)
+
+    index = {
+        "sources": {"matches": source_stamp(compressed.resolve(matches_path)),
+                    "deliveries": source_stamp(deliveries_path)},
+        "header": header,
+        "matches": matches,
+    }
+
+    target = index_path(deliveries_path)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target, 'w', encoding='utf-8') as file:
+        json.dump(index, file)
+    return index
+
+
+# Function to close a block of deliveries and attach it to its match
+def add_block(matches, block, end_byte, end_row):
+    """
+    Records a finished delivery block under its match ID.
+
+    Args:
+        matches (dict): Match entries of the index being built.
+        block (list): [match_id, start_byte, start_row] of the block.
+        end_byte (int): Byte offset just after the block.
+        end_row (int): Row number just after the block.
+    """
+    match_id, start_byte, start_row = block
+    # Deliveries of matches missing from matches.csv have no season
+    entry = matches.setdefault(match_id, {"season": None, "blocks": []})
+    entry["blocks"].append([start_byte, end_byte, start_row, end_row])
+
+
+# Function to load the index, rebuilding it when a source file changed
+def load_index(matches_path, deliveries_path):
+    """
+    Loads the persisted match index, rebuilding it if it is missing or if
+    either CSV file changed since it was built.
+
+    Args:
+        matches_path (str): Path to matches.csv.
+        deliveries_path (str): Path to deliveries.csv.
+
+    Returns:
+        dict: The match index.
+    """
+    try:
+        with open(index_path(deliveries_path), 'r', encoding='utf-8') as file:
+            index = json.load(file)
+    except (OSError, ValueError):
+        index = None
+
+    if (index is None
+            or index["sources"]["matches"] != source_stamp(compressed.resolve(matches_path))
+            or index["sources"]["deliveries"] != source_stamp(deliveries_path)):
+        index = build_index(matches_path, deliveries_path)
+    return index
+
+
+# Function to list the byte ranges holding one season's deliveries
+def season_blocks(index, season):
+    """
+    Returns the byte ranges of all deliveries played in a season.
+
+    Args:
+        index (dict): The match index.
+        season (str): Season to select, e.g. "2016".
+
+    Returns:
+        list: Sorted (start_byte, end_byte) ranges, with adjacent ranges merged.
+    """
+    ranges = sorted((start, end)
+                    for entry in index["matches"].values() if entry["season"] == season
+                    for start, end, _, _ in entry["blocks"])
+
+    merged = []
+    for start, end in ranges:
+        if merged and merged[-1][1] == start:
+            merged[-1] = (merged[-1][0], end)   # Extend the previous range
+        else:
+            merged.append((start, end))
+    return merged
+
+
+# Function to stream only the deliveries of one season
+def read_season(matches_path, deliveries_path, season, columns=None):
+    """
+    Reads the deliveries of one season by seeking to its indexed blocks.
+    A compressed deliveries file cannot be seeked, so it is streamed once
+    and filtered by the season's match IDs instead.
+
+    Args:
+        matches_path (str): Path to matches.csv.
+        deliveries_path (str): Path to deliveries.csv.
+        season (str): Season to read, e.g. "2016".
+        columns (list, optional): Columns to keep; all columns if omitted.
+
+    Yields:
+        dict: One delivery record of that season at a time.
+    """
+    if compressed.compression(deliveries_path):
+        match_ids = {match["id"] for match in read_columns(matches_path, ["id", "season"])
+                     if match["season"] == season}
+        needed = columns if columns is None or "match_id" in columns else columns + ["match_id"]
+        for delivery in read_columns(deliveries_path, needed):
+            if delivery["match_id"] in match_ids:
+                if needed is not columns:
+                    del delivery["match_id"]
+                yield delivery
+        return
+
+    index = load_index(matches_path, deliveries_path)
+    header = index["header"]
+
+    with open(deliveries_path, 'rb') as file:
+        for start, end in season_blocks(index, season):
+            yield from parse_lines(block_lines(file, start, end), header, columns)
+
+
+# Function to read the lines of one byte range
+def block_lines(file, start, end):
+    """
+    Reads the lines between two byte offsets of a binary file.
+
+    Args:
+        file (file): Deliveries file opened in binary mode.
+        start (int): Byte offset of the first line.
+        end (int): Byte offset just after the last line.
+
+    Yields:
+        str: One decoded line at a time.
+    """
+    file.seek(start)
+    position = start
+    while position < end:
+        line = file.readline()
+        if not line:
+            break
+        position += len(line)
+        yield line.decode('utf-8')
+
+
+# Main execution function
+def execute():
+    """
+    Builds (or refreshes) the match index for the files in data/.
+    """
+    index = load_index("data/matches.csv", "data/deliveries.csv")
+    print(f"{len(index['matches'])} matches indexed in {index_path('data/deliveries.csv')}")
+
+
+# Run the script
+if __name__ == "__main__":
+    execute()
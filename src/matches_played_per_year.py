@@ -6,26 +6,28 @@ using match data from a CSV file and generates a bar chart visualization.
 """
 
 import csv
-import matplotlib.pyplot as plt
 
-# Function to read CSV data and return a list of dictionaries
+import backends
+import cli
+import compressed
+
+# Match columns used by calculate()
+MATCH_COLUMNS = ["season"]
+
+# Function to stream CSV rows one at a time
 def read_data(file_path):
     """
-    Reads IPL match data from a CSV file.
+    Reads IPL match data from a CSV file (plain, .gz or .zst).
 
     Args:
         file_path (str): Path to the CSV file containing match data.
 
-    Returns:
-        list: List of dictionaries, each representing a match record.
+    Yields:
+        dict: One match record at a time.
     """
-    data = []
-    with open(file_path, 'r', encoding='utf-8') as file:
-        matches_reader = csv.DictReader(file)
-        # Append each match row as a dictionary to the data list
-        for match in matches_reader:
-            data.append(match)
-    return data
+    with compressed.open_text(file_path) as file:
+        # Yield rows lazily so only the current row is held in memory
+        yield from csv.DictReader(file)
 
 
 # Function to calculate number of matches played per season
@@ -34,7 +36,7 @@ def calculate(data):
     Calculates the number of matches played in each IPL season.
 
     Args:
-        data (list): List of IPL match records (dicts).
+        data (iterable): IPL match records (dicts).
 
     Returns:
         dict: Dictionary where keys are seasons and values are total matches played.
@@ -51,38 +53,63 @@ def calculate(data):
 
 
 # Function to plot number of matches per season as a bar chart
-def plot(matches_per_year):
+def plot(matches_per_year, show=True):
     """
     Plots a bar chart of the number of matches played per IPL season.
 
     Args:
         matches_per_year (dict): Dictionary of seasons and number of matches.
+        show (bool): Display the chart after saving it (False for batch rendering).
     """
+    # Imported here so computing without plotting never loads matplotlib
+    import matplotlib.pyplot as plt  # pylint: disable=import-outside-toplevel
+    import charts  # pylint: disable=import-outside-toplevel
+
     # Sort seasons for plotting
     years = sorted(matches_per_year.keys())
     matches = [matches_per_year[year] for year in years]
 
     # Create bar chart
-    plt.figure(figsize=(10, 6))
+    charts.figure("bar")
     plt.bar(years, matches, color='teal')
     plt.title("Number of Matches Played per Year in IPL")
     plt.xlabel("Season")
     plt.ylabel("Number of Matches")
     plt.tight_layout()                       # Adjust layout to fit labels
-    plt.savefig("plots/matches_per_year.png", dpi=300)  # Save plot
-    plt.show()                               # Display plot
+    charts.save("plots/matches_per_year.png")  # Save plot
+    if show:
+        plt.show()                           # Display plot
+
+
+# Function to compute the chart data with the configured backend
+def compute():
+    """
+    Computes the number of matches played per season with the IPL_BACKEND backend.
+
+    Returns:
+        dict: Dictionary where keys are seasons and values are total matches played.
+              Example: { '2008': 58, '2009': 57, ... }
+    """
+    return backends.compute("matches_per_year")
 
 
 # Main execution function
-def execute():
+def execute(show=True, output_format=None):
     """
     Reads match data, calculates matches per season, and plots the results.
+
+    Args:
+        show (bool): Display the chart after saving it.
+        output_format (str, optional): "json" or "csv" to print the result
+            instead of plotting it.
     """
-    file_path = "data/matches.csv"
-    data = read_data(file_path)               # Read match CSV data
-    matches_per_year = calculate(data)       # Calculate matches per season
-    plot(matches_per_year)                   # Generate bar chart
+    matches_per_year = compute()    # Calculate matches per season
+    if output_format:
+        cli.emit(matches_per_year, output_format, ["season", "matches"])
+    else:
+        plot(matches_per_year, show)             # Generate bar chart
 
 
 # Run the script
-execute()
+if __name__ == "__main__":
+    execute(output_format=cli.output_format(__doc__))
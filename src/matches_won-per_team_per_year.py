@@ -6,26 +6,28 @@ using match data from CSV files and generates a stacked bar chart visualization.
 """
 
 import csv
-import matplotlib.pyplot as plt
 
-# Function to read CSV data and return a list of dictionaries
+import backends
+import cli
+import compressed
+
+# Match columns used by calculate()
+MATCH_COLUMNS = ["season", "winner"]
+
+# Function to stream CSV rows one at a time
 def read_data(file_path):
     """
-    Reads IPL match data from a CSV file.
+    Reads IPL match data from a CSV file (plain, .gz or .zst).
 
     Args:
         file_path (str): Path to the CSV file containing match data.
 
-    Returns:
-        list: List of dictionaries, each representing a match record.
+    Yields:
+        dict: One match record at a time.
     """
-    data = []
-    with open(file_path, 'r', encoding='utf-8') as file:
-        matches_reader = csv.DictReader(file)
-        # Append each match row as a dictionary to the data list
-        for match in matches_reader:
-            data.append(match)
-    return data
+    with compressed.open_text(file_path) as file:
+        # Yield rows lazily so only the current row is held in memory
+        yield from csv.DictReader(file)
 
 
 # Function to calculate number of matches won per team per season
@@ -34,7 +36,7 @@ def calculate(data):
     Calculates the number of matches won by each team per season.
 
     Args:
-        data (list): List of IPL match records (dicts).
+        data (iterable): IPL match records (dicts).
 
     Returns:
         dict: Nested dictionary where keys are seasons and values are
@@ -65,49 +67,61 @@ def calculate(data):
 
 
 # Function to plot stacked bar chart of matches won per team per season
-def plot(matches_won):
+def plot(matches_won, show=True):
     """
     Plots a stacked bar chart showing the number of matches won per team per season.
 
     Args:
         matches_won (dict): Nested dictionary of seasons and team wins.
+        show (bool): Display the chart after saving it (False for batch rendering).
     """
-    seasons = sorted(matches_won.keys())
-
-    # Get a sorted list of all teams across all seasons
-    teams = sorted({team for year_data in matches_won.values() for team in year_data.keys()})
-
-    # Prepare data for plotting: list of wins per team for each season
-    team_wins = {team: [matches_won[season].get(team, 0) for season in seasons] for team in teams}
+    # Imported here so computing without plotting never loads matplotlib
+    import matplotlib.pyplot as plt  # pylint: disable=import-outside-toplevel
+    import charts  # pylint: disable=import-outside-toplevel
 
-    # Plot stacked bar chart
-    plt.figure(figsize=(12, 7))
-    bottom = [0] * len(seasons)  # Track cumulative bottom position for stacking
-
-    for team in teams:
-        plt.bar(seasons, team_wins[team], bottom=bottom, label=team)
-        # Update bottom for next team
-        bottom = [bottom[i] + team_wins[team][i] for i in range(len(seasons))]
+    # Plot stacked bar chart (sorted seasons and teams, one segment per team)
+    charts.figure("stacked")
+    charts.stacked_bars(plt.gca(), matches_won, legend_fontsize='small')
 
     plt.title("Number of Matches Won per Team per Year in IPL")
     plt.xlabel("Season")
     plt.ylabel("Number of Matches Won")
-    plt.legend(bbox_to_anchor=(1.05, 1), loc='upper left', fontsize='small')
     plt.tight_layout()
-    plt.savefig("plots/matches_won_per_team_per_year.png", dpi=300)
-    plt.show()
+    charts.save("plots/matches_won_per_team_per_year.png")
+    if show:
+        plt.show()
+
+
+# Function to compute the chart data with the configured backend
+def compute():
+    """
+    Computes the matches won by each team per season with the IPL_BACKEND backend.
+
+    Returns:
+        dict: Nested dictionary where keys are seasons and values are
+              dictionaries of team names and their number of wins.
+              Example: { '2008': {'RCB': 9, 'MI': 8}, ... }
+    """
+    return backends.compute("matches_won_per_team")
 
 
 # Main execution function
-def execute():
+def execute(show=True, output_format=None):
     """
     Reads match data, calculates matches won per team per season, and plots the results.
+
+    Args:
+        show (bool): Display the chart after saving it.
+        output_format (str, optional): "json" or "csv" to print the result
+            instead of plotting it.
     """
-    file_path = "data/matches.csv"
-    data = read_data(file_path)          # Read match CSV data
-    matches_won = calculate(data)        # Calculate matches won per team per season
-    plot(matches_won)                    # Generate stacked bar chart
+    matches_won = compute()    # Calculate matches won per team per season
+    if output_format:
+        cli.emit(matches_won, output_format, ["season", "team", "wins"])
+    else:
+        plot(matches_won, show)              # Generate stacked bar chart
 
 
 # Run the script
-execute()
+if __name__ == "__main__":
+    execute(output_format=cli.output_format(__doc__))
@@ -0,0 +1,184 @@
+"""
+parallel_scan.py
+
+This script splits deliveries.csv into byte-range chunks aligned to line
+boundaries and aggregates each chunk in a separate worker process. The
+per-chunk dictionaries (batsman runs, team runs, extra runs, bowler runs and
+balls) are merged in chunk order, which keeps the result identical to a
+single sequential pass, including the order of the dictionary keys.
+
+Set IPL_WORKERS to choose the number of worker processes (default: all cores).
+"""
+
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import leaderboard
+from delivery_scan import DELIVERY_ANALYSES, load_analysis
+from match_index import block_lines
+
+CHUNKS_PER_WORKER = 4    # Extra chunks smooth out uneven chunk costs
+
+
+# Function to split a CSV file into line-aligned byte ranges
+def chunk_ranges(file_path, chunk_count):
+    """
+    Splits the data rows of a CSV file into byte ranges that start and end
+    on line boundaries.
+
+    Args:
+        file_path (str): Path to the CSV file.
+        chunk_count (int): Number of chunks wanted.
+
+    Returns:
+        tuple: (header, ranges) where header is the list of column names and
+               ranges is a list of (start_byte, end_byte) pairs.
+    """
+    size = os.path.getsize(file_path)
+    with open(file_path, 'rb') as file:
+        header_line = file.readline()
+        header = next(csv.reader([header_line.decode('utf-8')]))
+        data_start = len(header_line)
+
+        step = max(1, (size - data_start) // max(1, chunk_count))
+        boundaries = [data_start]
+        while boundaries[-1] < size:
+            # Move each split point forward to the start of the next line
+            file.seek(min(size, boundaries[-1] + step))
+            file.readline()
+            boundaries.append(min(size, file.tell()))
+
+    return header, list(zip(boundaries, boundaries[1:]))
+
+
+# Function to aggregate one chunk of deliveries (runs in a worker process)
+def aggregate_chunk(task):
+    """
+    Aggregates the deliveries in one byte range.
+
+    Args:
+        task (tuple): (file_path, start, end, header, team, extras_match_ids,
+                      economy_match_ids).
+
+    Returns:
+        dict: Partial dictionaries for each aggregation.
+    """
+    file_path, start, end, header, team, extras_match_ids, economy_match_ids = task
+    partial = {"batsman_runs": {}, "team_runs": {}, "extra_runs": {},
+               "bowler_runs": {}, "bowler_balls": {}}
+    batsman_runs = partial["batsman_runs"]
+    team_runs = partial["team_runs"]
+    extra_runs = partial["extra_runs"]
+    bowler_runs = partial["bowler_runs"]
+    bowler_balls = partial["bowler_balls"]
+
+    with open(file_path, 'rb') as file:
+        for delivery in csv.DictReader(block_lines(file, start, end), fieldnames=header):
+            batting_team = delivery["batting_team"]
+            total_runs = int(delivery["total_runs"])
+            team_runs[batting_team] = team_runs.get(batting_team, 0) + total_runs
+
+            if batting_team == team:
+                batsman = delivery["batsman"]
+                batsman_runs[batsman] = batsman_runs.get(batsman, 0) + int(delivery["batsman_runs"])
+
+            match_id = delivery["match_id"]
+            if match_id in extras_match_ids:
+                bowling_team = delivery["bowling_team"]
+                extra_runs[bowling_team] = extra_runs.get(bowling_team, 0) + int(delivery["extra_runs"])
+
+            if match_id in economy_match_ids:
+                bowler = delivery["bowler"]
+                bowler_runs[bowler] = bowler_runs.get(bowler, 0) + total_runs
+                bowler_balls[bowler] = bowler_balls.get(bowler, 0) + 1
+
+    return partial
+
+
+# Function to merge one partial result into the running total
+def merge(total, partial):
+    """
+    Adds the counts of a partial result into the running total.
+
+    Merging chunks in file order keeps keys in first-appearance order, and
+    since addition is associative the result matches a sequential pass.
+
+    Args:
+        total (dict): Running totals, updated in place.
+        partial (dict): Partial totals of one chunk.
+    """
+    for name, counts in partial.items():
+        merged = total.setdefault(name, {})
+        for key, value in counts.items():
+            merged[key] = merged.get(key, 0) + value
+
+
+# Function to run the delivery aggregations on a process pool
+def calculate(matches, deliveries_path, workers=None, team="Royal Challengers Bangalore",
+              extras_season="2016", economy_season="2015", count=leaderboard.DEFAULT_COUNT,
+              min_balls=0):
+    """
+    Runs the batsman-runs, team-runs, extra-runs and economy aggregations in
+    parallel over chunks of deliveries.csv.
+
+    Args:
+        matches (iterable): Match records from matches.csv.
+        deliveries_path (str): Path to deliveries.csv.
+        workers (int, optional): Number of worker processes (default: all cores).
+        team (str): Team for the top batsmen ranking.
+        extras_season (str): Season for the extra runs aggregation.
+        economy_season (str): Season for the economy ranking.
+        count (int): Number of batsmen and bowlers to rank (10 by default).
+        min_balls (int): Minimum balls bowled to be ranked (0 ranks everybody).
+
+    Returns:
+        dict: Results keyed like delivery_scan.DELIVERY_ANALYSES.
+    """
+    workers = workers or os.cpu_count() or 1
+    matches = list(matches)
+    extras_match_ids = {match["id"] for match in matches if match["season"] == extras_season}
+    economy_match_ids = {match["id"] for match in matches if match["season"] == economy_season}
+
+    header, ranges = chunk_ranges(deliveries_path, workers * CHUNKS_PER_WORKER)
+    tasks = [(deliveries_path, start, end, header, team, extras_match_ids, economy_match_ids)
+             for start, end in ranges]
+
+    total = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # map() yields partials in chunk order, as merge() requires
+        for partial in executor.map(aggregate_chunk, tasks):
+            merge(total, partial)
+
+    # Calculate economy rate for each bowler
+    economy = leaderboard.economy_rates(total.get("bowler_runs", {}), total.get("bowler_balls", {}),
+                                        min_balls)
+
+    return {
+        "top_batsmen_rcb": leaderboard.top_k(total.get("batsman_runs", {}), count),
+        "total_runs_by_team": total.get("team_runs", {}),
+        "extra_runs_2016": total.get("extra_runs", {}),
+        "economical_bowlers_2015": leaderboard.top_k(economy, count, descending=False),
+    }
+
+
+# Main execution function
+def execute():
+    """
+    Reads match data, aggregates deliveries.csv on a process pool, and plots
+    every delivery chart.
+    """
+    workers = int(os.environ.get("IPL_WORKERS", "0")) or None
+    with open("data/matches.csv", 'r', encoding='utf-8') as file:
+        matches = list(csv.DictReader(file))
+
+    results = calculate(matches, "data/deliveries.csv", workers)
+
+    for name, script_file, _, plot_function in DELIVERY_ANALYSES:
+        module = load_analysis(name, script_file)
+        getattr(module, plot_function)(results[name])
+
+
+# Run the script
+if __name__ == "__main__":
+    execute()
@@ -0,0 +1,231 @@
+"""
+parquet_store.py
+
+This script reads and writes matches and deliveries as Parquet files with
+pyarrow, an optional dependency (pip install pyarrow). Only the columns an
+analysis needs are read. The deliveries file also stores the season of each
+delivery's match, and its row groups follow the file order, which is grouped
+by season. Season filters (e.g. the 2015 economy and 2016 extras analyses)
+are therefore pushed down to the row-group statistics, and other seasons
+are never read.
+
+load_table() returns the same (columns, dictionaries) pair as
+columnar_cache.load_table(), so the vectorized.py functions run on Arrow
+data unchanged. Numeric columns that arrive as one chunk are handed over as
+NumPy views of the Arrow buffers without copying; reads spanning several row
+groups are concatenated once.
+
+Run it to export data/*.csv to data/*.parquet and benchmark the Parquet path
+against the CSV path on the same data. Set IPL_BACKEND=parquet to make the
+analysis scripts read the Parquet files.
+"""
+
+import os
+import time
+
+import numpy as np
+
+from columnar_cache import DICTIONARY_GROUPS
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+except ImportError:     # pyarrow is optional; only this backend needs it
+    pa = None
+
+MATCHES_FILE = "data/matches.parquet"
+DELIVERIES_FILE = "data/deliveries.parquet"
+ROW_GROUP_SIZE = 16384    # Rows per row group; smaller groups prune more finely
+
+
+# Function to fail clearly when pyarrow is missing
+def require_pyarrow():
+    """
+    Raises an ImportError explaining how to enable the Parquet backend.
+    """
+    if pa is None:
+        raise ImportError("The Parquet backend needs pyarrow: pip install pyarrow")
+
+
+# Function to name the Parquet file of a CSV file
+def parquet_path(csv_path):
+    """
+    Returns the Parquet file that sits next to a CSV file.
+
+    Args:
+        csv_path (str): Path to the CSV file.
+
+    Returns:
+        str: Same path with a .parquet extension.
+    """
+    return os.path.splitext(csv_path)[0] + ".parquet"
+
+
+# Function to export a CSV file to Parquet
+def export(csv_path, target=None, matches_path=None):
+    """
+    Writes a CSV file as Parquet. Deliveries get an extra "season" column
+    (looked up from matches.csv) so season filters can skip row groups.
+
+    Args:
+        csv_path (str): Path to matches.csv or deliveries.csv.
+        target (str, optional): Parquet file to write (next to the CSV by default).
+        matches_path (str, optional): matches.csv to take seasons from when
+                                      exporting deliveries.
+
+    Returns:
+        str: Path to the written Parquet file.
+    """
+    require_pyarrow()
+    target = target or parquet_path(csv_path)
+    table = pa_csv.read_csv(csv_path)
+
+    if "match_id" in table.column_names and matches_path:
+        matches = pa_csv.read_csv(matches_path, convert_options=pa_csv.ConvertOptions(
+            include_columns=["id", "season"]))
+        match_ids = matches["id"].to_numpy()
+        delivery_match_ids = table["match_id"].to_numpy()
+
+        size = int(max(match_ids.max(initial=0), delivery_match_ids.max(initial=0))) + 1
+        season_by_id = np.full(size, -1, dtype=np.int64)
+        season_by_id[match_ids] = matches["season"].to_numpy()
+        table = table.append_column("season", pa.array(season_by_id[delivery_match_ids]))
+
+    # Keep the file order: it is grouped by season and defines first appearance
+    pq.write_table(table, target, row_group_size=ROW_GROUP_SIZE)
+    return target
+
+
+# Function to read a Parquet file into the columnar format of vectorized.py
+def load_table(file_path, columns=None, season=None):
+    """
+    Reads the needed columns of a Parquet file, optionally for one season only.
+
+    Args:
+        file_path (str): Path to matches.parquet or deliveries.parquet.
+        columns (list, optional): Columns to read; all columns if omitted.
+        season (str, optional): Only read rows of this season. Row groups
+                                whose statistics exclude it are skipped.
+
+    Returns:
+        tuple: (columns, dictionaries) like columnar_cache.load_table().
+    """
+    require_pyarrow()
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"{file_path} not found; export it with python src/parquet_store.py")
+
+    filters = [("season", "=", int(season))] if season is not None else None
+    table = pq.read_table(file_path, columns=columns, filters=filters)
+    return to_columns(table)
+
+
+# Function to convert an Arrow table into integer-coded NumPy columns
+def to_columns(table):
+    """
+    Converts an Arrow table into (columns, dictionaries).
+
+    Numeric columns become NumPy views of the Arrow buffers (no copy when the
+    column is a single chunk without nulls). Text columns are coded against
+    one dictionary per group (all team columns share one), as in columnar_cache.
+
+    Args:
+        table (pyarrow.Table): Table to convert.
+
+    Returns:
+        tuple: (columns, dictionaries).
+    """
+    columns = {}
+    dictionaries = {}
+    groups = {}     # group -> (labels list, label -> code)
+    for name in table.column_names:
+        column = table[name]
+        if pa.types.is_integer(column.type):
+            if column.num_chunks == 1 and column.null_count == 0:
+                columns[name] = column.chunk(0).to_numpy(zero_copy_only=True)
+            else:
+                columns[name] = column.fill_null(0).to_numpy()
+            continue
+
+        labels, codes = groups.setdefault(DICTIONARY_GROUPS.get(name, name), ([], {}))
+        encoded = column.cast(pa.string()).fill_null("").dictionary_encode().combine_chunks()
+
+        # Map this column's dictionary onto the shared group dictionary
+        lookup = np.empty(len(encoded.dictionary), dtype=np.int32)
+        for index, label in enumerate(encoded.dictionary.to_pylist()):
+            if label not in codes:
+                codes[label] = len(labels)
+                labels.append(label)
+            lookup[index] = codes[label]
+        columns[name] = lookup[encoded.indices.to_numpy()]
+        dictionaries[name] = labels
+    return columns, dictionaries
+
+
+# Function to count the row groups a season filter reads
+def row_groups_read(file_path, season):
+    """
+    Counts the row groups whose season statistics may contain a season.
+
+    Args:
+        file_path (str): Path to a Parquet file with a "season" column.
+        season (str): Season to filter on.
+
+    Returns:
+        tuple: (row groups read, total row groups).
+    """
+    require_pyarrow()
+    metadata = pq.ParquetFile(file_path).metadata
+    column = metadata.schema.names.index("season")
+    read = 0
+    for group in range(metadata.num_row_groups):
+        stats = metadata.row_group(group).column(column).statistics
+        if stats is None or not stats.has_min_max or stats.min <= int(season) <= stats.max:
+            read += 1
+    return read, metadata.num_row_groups
+
+
+# Main execution function
+def execute():
+    """
+    Exports the CSV files to Parquet and benchmarks both paths.
+    """
+    # Imported here: only the benchmark needs the CSV-side analyses
+    import fast_csv  # pylint: disable=import-outside-toplevel
+    import vectorized  # pylint: disable=import-outside-toplevel
+    from delivery_scan import load_analysis  # pylint: disable=import-outside-toplevel
+
+    require_pyarrow()
+    start = time.perf_counter()
+    export("data/matches.csv")
+    export("data/deliveries.csv", matches_path="data/matches.csv")
+    print(f"Exported {MATCHES_FILE} and {DELIVERIES_FILE} in {time.perf_counter() - start:.2f} s")
+
+    cases = [
+        ("extra_runs_2016", "Extra_runs _conceded_per_team.py", "calculate", "extra_runs", "2016"),
+        ("economical_bowlers_2015", "top_economic_ballers.py", "calculate_economical_bowlers_2015",
+         "economical_bowlers", "2015"),
+    ]
+    for name, script_file, calculate_function, vectorized_function, season in cases:
+        module = load_analysis(name, script_file)
+
+        start = time.perf_counter()
+        csv_result = getattr(module, calculate_function)(
+            fast_csv.read_columns("data/matches.csv", module.MATCH_COLUMNS),
+            fast_csv.read_columns("data/deliveries.csv", module.DELIVERY_COLUMNS))
+        csv_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        parquet_result = getattr(vectorized, vectorized_function)(
+            load_table(MATCHES_FILE, module.MATCH_COLUMNS),
+            load_table(DELIVERIES_FILE, module.DELIVERY_COLUMNS, season), season)
+        parquet_seconds = time.perf_counter() - start
+
+        read, total = row_groups_read(DELIVERIES_FILE, season)
+        print(f"{name:<26}CSV {csv_seconds:7.3f} s   Parquet {parquet_seconds:7.3f} s "
+              f"({read}/{total} row groups)   same result: {csv_result == parquet_result}")
+
+
+# Run the script
+if __name__ == "__main__":
+    execute()
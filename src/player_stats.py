@@ -0,0 +1,356 @@
+"""
+player_stats.py
+
+This script materializes a player x season x team stat table from one pass
+over deliveries.csv. Every row holds a player's runs, balls faced, balls
+bowled, runs conceded, extras conceded and dismissals for one team in one
+season. The table is saved as NumPy arrays next to the columnar cache and
+rebuilt only when matches.csv or deliveries.csv changes, so batsman and
+bowler rankings for any team or season are answered from a few thousand rows
+instead of a scan of every delivery.
+
+Each row also keeps the position of the delivery where the player first
+batted and first bowled, so rankings break ties in the same first-appearance
+order as the chart scripts and give identical results.
+
+Set IPL_BACKEND=players to make the top batsmen, economy and extra runs
+charts read from the table.
+"""
+
+import os
+import time
+
+import numpy as np
+
+import compressed
+import fast_csv
+from cache_files import cache_path, source_stamp
+
+MEASURES = ["runs", "balls_faced", "balls_bowled", "runs_conceded", "extras_conceded", "dismissals"]
+
+# Columns used by build_table()
+MATCH_COLUMNS = ["id", "season"]
+DELIVERY_COLUMNS = ["match_id", "batting_team", "bowling_team", "batsman", "bowler",
+                    "wide_runs", "batsman_runs", "extra_runs", "total_runs", "player_dismissed"]
+
+NOT_SEEN = np.iinfo(np.int64).max    # Position of a role the player never had
+UNKNOWN_SEASON = ""                  # Season of deliveries whose match is not in matches.csv
+
+
+# Function to locate the persisted table of a deliveries file
+def table_path(deliveries_path):
+    """
+    Returns the file used to persist the stat table of a deliveries file.
+
+    Args:
+        deliveries_path (str): Path to deliveries.csv.
+
+    Returns:
+        str: Path to the .npz table file.
+    """
+    return cache_path(deliveries_path) + ".players.npz"
+
+
+# Function to build the stat table in one pass over the deliveries
+def build_table(matches, deliveries):
+    """
+    Aggregates every measure per player, season and team.
+
+    Batting measures go to the batting team's row of the batsman, bowling
+    measures to the bowling team's row of the bowler. Balls faced leave out
+    wides; balls bowled count every delivery, as in the economy chart.
+    Dismissals go to the player dismissed, who may be the non-striker.
+
+    Args:
+        matches (iterable): Match records (dicts) from matches.csv.
+        deliveries (iterable): Delivery records (dicts) from deliveries.csv.
+
+    Returns:
+        dict: "players", "seasons" and "teams" labels, "keys" (row x 3 codes of
+              player, season and team), "values" (row x measure int64 array),
+              "first_batted" and "first_bowled" (delivery positions).
+    """
+    season_by_id = {match["id"]: match["season"] for match in matches}
+    labels = {"players": {}, "seasons": {}, "teams": {}}
+    rows = {}       # (player, season, team) codes -> row number
+    keys, values, first_batted, first_bowled = [], [], [], []
+
+    def code(kind, label):
+        codes = labels[kind]
+        if label not in codes:
+            codes[label] = len(codes)
+        return codes[label]
+
+    def row_of(player, season, team):
+        key = (code("players", player), season, code("teams", team))
+        if key not in rows:
+            rows[key] = len(keys)
+            keys.append(key)
+            values.append([0] * len(MEASURES))
+            first_batted.append(NOT_SEEN)
+            first_bowled.append(NOT_SEEN)
+        return rows[key]
+
+    for position, delivery in enumerate(deliveries):
+        season = code("seasons", season_by_id.get(delivery["match_id"], UNKNOWN_SEASON))
+        batting_team = delivery["batting_team"]
+
+        row = row_of(delivery["batsman"], season, batting_team)
+        stats = values[row]
+        stats[0] += int(delivery["batsman_runs"])
+        if int(delivery["wide_runs"]) == 0:
+            stats[1] += 1
+        if first_batted[row] == NOT_SEEN:
+            first_batted[row] = position
+
+        row = row_of(delivery["bowler"], season, delivery["bowling_team"])
+        stats = values[row]
+        stats[2] += 1
+        stats[3] += int(delivery["total_runs"])
+        stats[4] += int(delivery["extra_runs"])
+        if first_bowled[row] == NOT_SEEN:
+            first_bowled[row] = position
+
+        if delivery["player_dismissed"]:
+            values[row_of(delivery["player_dismissed"], season, batting_team)][5] += 1
+
+    return {
+        "players": list(labels["players"]), "seasons": list(labels["seasons"]),
+        "teams": list(labels["teams"]),
+        "keys": np.array(keys, dtype=np.int32).reshape(-1, 3),
+        "values": np.array(values, dtype=np.int64).reshape(-1, len(MEASURES)),
+        "first_batted": np.array(first_batted, dtype=np.int64),
+        "first_bowled": np.array(first_bowled, dtype=np.int64),
+    }
+
+
+# Function to record the size and mtime of both source files
+def source_stamps(matches_path, deliveries_path):
+    """
+    Returns the stamps the table is built from.
+
+    Args:
+        matches_path (str): Path to matches.csv.
+        deliveries_path (str): Path to deliveries.csv.
+
+    Returns:
+        list: [size, mtime_ns] of matches.csv, then of deliveries.csv.
+    """
+    stamps = []
+    for path in (matches_path, deliveries_path):
+        stamp = source_stamp(compressed.resolve(path))
+        stamps += [stamp["size"], stamp["mtime_ns"]]
+    return stamps
+
+
+# Function to save a table with the stamps of its source files
+def save_table(table, matches_path, deliveries_path):
+    """
+    Saves a stat table next to the columnar cache of deliveries.csv.
+
+    Args:
+        table (dict): Table returned by build_table().
+        matches_path (str): Path to the matches.csv it was built from.
+        deliveries_path (str): Path to the deliveries.csv it was built from.
+    """
+    target = table_path(deliveries_path)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+
+    # Write to a temporary file first so a failed save leaves no table
+    with open(target + ".tmp", 'wb') as file:
+        np.savez(file, players=np.array(table["players"], dtype=str),
+                 seasons=np.array(table["seasons"], dtype=str),
+                 teams=np.array(table["teams"], dtype=str), measures=np.array(MEASURES, dtype=str),
+                 keys=table["keys"], values=table["values"],
+                 first_batted=table["first_batted"], first_bowled=table["first_bowled"],
+                 stamp=np.array(source_stamps(matches_path, deliveries_path), dtype=np.int64))
+    os.replace(target + ".tmp", target)
+
+
+# Function to load the table, rebuilding it when a source file changed
+def load_table(matches_path, deliveries_path):
+    """
+    Loads the persisted stat table, rebuilding it if it is missing, was built
+    with other measures or a source file changed since it was built.
+
+    Args:
+        matches_path (str): Path to matches.csv.
+        deliveries_path (str): Path to deliveries.csv.
+
+    Returns:
+        dict: The table (see build_table()).
+    """
+    stamps = source_stamps(matches_path, deliveries_path)
+    try:
+        with np.load(table_path(deliveries_path)) as saved:
+            if saved["stamp"].tolist() == stamps and saved["measures"].tolist() == MEASURES:
+                table = {name: saved[name] for name in
+                         ("keys", "values", "first_batted", "first_bowled")}
+                table.update({name: saved[name].tolist() for name in ("players", "seasons", "teams")})
+                return table
+    except (OSError, KeyError, ValueError):
+        pass
+
+    table = build_table(fast_csv.read_columns(matches_path, MATCH_COLUMNS),
+                        fast_csv.read_columns(deliveries_path, DELIVERY_COLUMNS))
+    save_table(table, matches_path, deliveries_path)
+    return table
+
+
+# Function to select the rows of a team and/or season
+def select_rows(table, season=None, team=None):
+    """
+    Returns a mask of the rows of one season and/or one team.
+
+    Args:
+        table (dict): Table returned by load_table().
+        season (str, optional): Keep only this season.
+        team (str, optional): Keep only this team.
+
+    Returns:
+        ndarray: Boolean mask over the rows (all False for unknown labels).
+    """
+    mask = np.ones(len(table["keys"]), dtype=bool)
+    for column, label, labels in ((1, season, table["seasons"]), (2, team, table["teams"])):
+        if label is not None:
+            mask &= (table["keys"][:, column] == labels.index(label)) if label in labels else False
+    return mask
+
+
+# Function to total measures per group in first-appearance order
+def group_rows(codes, values, first_seen):
+    """
+    Sums the selected rows per group code (e.g. per player over seasons).
+
+    Args:
+        codes (ndarray): Group code of every selected row.
+        values (ndarray): Row x measure values of the selected rows.
+        first_seen (ndarray): First-appearance position of every selected row.
+
+    Returns:
+        tuple: (codes, totals, first_seen) of each group, ordered by first appearance.
+    """
+    groups, inverse = np.unique(codes, return_inverse=True)
+    totals = np.zeros((groups.size, values.shape[1]), dtype=np.int64)
+    np.add.at(totals, inverse, values)
+    first = np.full(groups.size, NOT_SEEN, dtype=np.int64)
+    np.minimum.at(first, inverse, first_seen)
+
+    order = np.argsort(first, kind='stable')
+    return groups[order], totals[order], first[order]
+
+
+# Table version of Top_batsmen_RCB.calculate, for any team and season
+def top_batsmen(table, team="Royal Challengers Bangalore", count=10, season=None):
+    """
+    Ranks the batsmen of a team by total runs.
+
+    Args:
+        table (dict): Table returned by load_table().
+        team (str): Batting team to rank batsmen for.
+        count (int): Number of batsmen to keep (10 by default).
+        season (str, optional): Rank one season only; all seasons if omitted.
+
+    Returns:
+        dict: Dictionary of top batsmen and their total runs.
+    """
+    rows = select_rows(table, season, team) & (table["first_batted"] != NOT_SEEN)
+    players, totals, _ = group_rows(table["keys"][rows, 0], table["values"][rows],
+                                    table["first_batted"][rows])
+    runs = totals[:, MEASURES.index("runs")]
+
+    # Stable sort: equal runs keep first-appearance order, as in leaderboard.top_k
+    order = np.argsort(-runs, kind='stable')[:max(count, 0)]
+    return {table["players"][players[index]]: int(runs[index]) for index in order}
+
+
+# Table version of top_economic_ballers.calculate_economical_bowlers
+def economical_bowlers(table, season="2015", count=10, min_balls=0, team=None):
+    """
+    Ranks the bowlers of a season by economy rate.
+
+    Args:
+        table (dict): Table returned by load_table().
+        season (str): Season to rank bowlers for (2015 by default).
+        count (int): Number of bowlers to keep (10 by default).
+        min_balls (int): Minimum balls bowled to be ranked (0 ranks everybody).
+        team (str, optional): Rank the bowlers of one team only.
+
+    Returns:
+        dict: Dictionary of top bowlers with their economy rates.
+    """
+    rows = select_rows(table, season, team) & (table["first_bowled"] != NOT_SEEN)
+    players, totals, _ = group_rows(table["keys"][rows, 0], table["values"][rows],
+                                    table["first_bowled"][rows])
+    runs = totals[:, MEASURES.index("runs_conceded")]
+    balls = totals[:, MEASURES.index("balls_bowled")]
+
+    qualified = balls >= min_balls
+    players, runs, balls = players[qualified], runs[qualified], balls[qualified]
+
+    # Same float operations as leaderboard.economy_rates: runs / (balls / 6)
+    economy = runs / (balls / 6)
+    order = np.argsort(economy, kind='stable')[:max(count, 0)]
+    return {table["players"][players[index]]: float(economy[index]) for index in order}
+
+
+# Table version of Extra_runs _conceded_per_team.calculate
+def extra_runs(table, season="2016"):
+    """
+    Totals the extra runs conceded by each team in a season.
+
+    Args:
+        table (dict): Table returned by load_table().
+        season (str): Season to count (2016 by default).
+
+    Returns:
+        dict: Dictionary with team names as keys and total extra runs conceded as values.
+    """
+    rows = select_rows(table, season) & (table["first_bowled"] != NOT_SEEN)
+    teams, totals, _ = group_rows(table["keys"][rows, 2], table["values"][rows],
+                                  table["first_bowled"][rows])
+    extras = totals[:, MEASURES.index("extras_conceded")]
+    return {table["teams"][team]: int(total) for team, total in zip(teams, extras)}
+
+
+# Main execution function
+def execute():
+    """
+    Builds (or loads) the stat table and times rankings from it against the
+    same rankings from a deliveries scan.
+    """
+    # Imported here: only the comparison needs the chart scripts
+    from delivery_scan import load_analysis  # pylint: disable=import-outside-toplevel
+
+    matches_path, deliveries_path = "data/matches.csv", "data/deliveries.csv"
+    start = time.perf_counter()
+    table = load_table(matches_path, deliveries_path)
+    print(f"{len(table['keys'])} player x season x team rows ready in "
+          f"{time.perf_counter() - start:.2f} s: {table_path(deliveries_path)}")
+
+    batting = load_analysis("top_batsmen_rcb", " Top_batsmen_RCB.py")
+    bowling = load_analysis("economical_bowlers_2015", "top_economic_ballers.py")
+    cases = [
+        ("top RCB batsmen",
+         lambda: batting.calculate(fast_csv.read_columns(deliveries_path, batting.DELIVERY_COLUMNS)),
+         lambda: top_batsmen(table)),
+        ("most economical bowlers 2015",
+         lambda: bowling.calculate_economical_bowlers_2015(
+             fast_csv.read_columns(matches_path, bowling.MATCH_COLUMNS),
+             fast_csv.read_columns(deliveries_path, bowling.DELIVERY_COLUMNS)),
+         lambda: economical_bowlers(table)),
+    ]
+    for name, scan, lookup in cases:
+        start = time.perf_counter()
+        scan_result = scan()
+        scan_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        table_result = lookup()
+        table_seconds = time.perf_counter() - start
+        print(f"{name:<30}scan {scan_seconds * 1000:8.1f} ms   table {table_seconds * 1000:6.2f} ms   "
+              f"same result: {list(scan_result.items()) == list(table_result.items())}")
+
+
+# Run the script
+if __name__ == "__main__":
+    execute()
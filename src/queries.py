@@ -0,0 +1,67 @@
+"""
+queries.py
+
+This script answers parameterized season/team queries for dashboards, such
+as the top batsmen of any team or the most economical bowlers of any season.
+Results go through the LRU cache in result_cache.py, so repeated requests do
+not touch the data. The backend (CSV loops, NumPy, Parquet, SQLite or the
+player stat table) follows IPL_BACKEND, through backends.py.
+"""
+
+import backends
+import result_cache
+
+MATCHES_FILE = backends.MATCHES_FILE
+DELIVERIES_FILE = backends.DELIVERIES_FILE
+
+
+# Function to query the top batsmen of a team
+def top_batsmen(team, count=10):
+    """
+    Returns the top 10 batsmen of a team by total runs.
+
+    Args:
+        team (str): Batting team, e.g. "Royal Challengers Bangalore".
+        count (int): Number of batsmen to return (10 by default).
+
+    Returns:
+        dict: Dictionary of top 10 batsmen and their total runs.
+    """
+    return result_cache.cached_result(
+        "top_batsmen", {"team": team, "count": count}, [DELIVERIES_FILE],
+        lambda: backends.compute("top_batsmen", team=team, count=count))
+
+
+# Function to query extra runs conceded per team in a season
+def extra_runs(season):
+    """
+    Returns the extra runs conceded by each team in a season.
+
+    Args:
+        season (str): Season, e.g. "2016".
+
+    Returns:
+        dict: Dictionary with team names as keys and total extra runs conceded as values.
+    """
+    return result_cache.cached_result(
+        "extra_runs", {"season": season}, [MATCHES_FILE, DELIVERIES_FILE],
+        lambda: backends.compute("extra_runs", season=season))
+
+
+# Function to query the most economical bowlers of a season
+def economical_bowlers(season, count=10, min_balls=0):
+    """
+    Returns the top 10 economical bowlers of a season.
+
+    Args:
+        season (str): Season, e.g. "2015".
+        count (int): Number of bowlers to return (10 by default).
+        min_balls (int): Minimum balls bowled to be ranked (0 ranks everybody).
+
+    Returns:
+        dict: Dictionary of top 10 bowlers with their economy rates.
+    """
+    parameters = {"season": season, "count": count, "min_balls": min_balls}
+    return result_cache.cached_result(
+        "economical_bowlers", parameters, [MATCHES_FILE, DELIVERIES_FILE],
+        lambda: backends.compute("economical_bowlers", **parameters))
@@ -0,0 +1,298 @@
+"""
+query_server.py
+
+This script runs a small local HTTP server (asyncio, standard library only)
+that answers the analyses from a warm dataset. matches.csv and deliveries.csv
+are loaded once from the columnar cache and kept memory-mapped, and every
+request runs the vectorized analysis on them, so a chart costs milliseconds
+instead of a fresh Python process that re-imports matplotlib and re-reads
+the CSVs. Results and rendered PNGs go through the LRU cache in
+result_cache.py. A changed CSV is reloaded on the next request.
+
+Endpoints (query parameters are optional):
+    /top_batsmen?team=...&count=10
+    /total_runs
+    /extra_runs?season=2016
+    /economical_bowlers?season=2015&count=10&min_balls=0
+    /matches_per_year
+    /matches_played
+    /matches_won
+
+Each endpoint returns JSON; add ".png" to the path for a chart instead
+(e.g. /extra_runs.png?season=2017). Requests are handled concurrently: the
+analyses run in worker threads while the event loop keeps serving.
+
+Usage:
+    python src/query_server.py [--host 127.0.0.1] [--port 8000]
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import threading
+import time
+from urllib.parse import parse_qsl, urlsplit
+
+import charts
+import columnar_cache
+import result_cache
+import vectorized
+
+MATCHES_FILE = "data/matches.csv"
+DELIVERIES_FILE = "data/deliveries.csv"
+PNG_DPI = 100                 # Charts are served for screens, not print
+MAX_HEADER_LINES = 100
+
+# Warm tables: CSV path -> (fingerprint, (columns, dictionaries))
+_tables = {}
+_tables_lock = threading.Lock()   # One worker at a time checks, rebuilds and maps the cache
+
+
+# Function to get the warm columnar table of a CSV file
+def table(csv_path):
+    """
+    Returns the columnar table of a CSV file, loading it only on first use
+    or after the file changed. Workers that find the file changed wait for
+    each other, so one rebuild never removes the cache folder while another
+    worker is mapping it.
+
+    Args:
+        csv_path (str): Path to the CSV file.
+
+    Returns:
+        tuple: (columns, dictionaries) as returned by columnar_cache.load_table().
+    """
+    with _tables_lock:
+        stamp = result_cache.fingerprint([csv_path])
+        if csv_path not in _tables or _tables[csv_path][0] != stamp:
+            _tables[csv_path] = (stamp, columnar_cache.load_table(csv_path))
+        return _tables[csv_path][1]
+
+
+# Served analyses: name -> (compute(parameters), default parameters, source files, chart title)
+ENDPOINTS = {
+    "top_batsmen": (
+        lambda p: vectorized.top_batsmen(table(DELIVERIES_FILE), p["team"], p["count"]),
+        {"team": "Royal Challengers Bangalore", "count": 10}, [DELIVERIES_FILE],
+        "Top {count} Batsmen for {team}"),
+    "total_runs": (
+        lambda p: vectorized.total_runs_by_team(table(DELIVERIES_FILE)),
+        {}, [DELIVERIES_FILE], "Total Runs Scored by Each IPL Team"),
+    "extra_runs": (
+        lambda p: vectorized.extra_runs(table(MATCHES_FILE), table(DELIVERIES_FILE), p["season"]),
+        {"season": "2016"}, [MATCHES_FILE, DELIVERIES_FILE],
+        "Extra Runs Conceded per Team in {season}"),
+    "economical_bowlers": (
+        lambda p: vectorized.economical_bowlers(table(MATCHES_FILE), table(DELIVERIES_FILE),
+                                                p["season"], p["count"], p["min_balls"]),
+        {"season": "2015", "count": 10, "min_balls": 0}, [MATCHES_FILE, DELIVERIES_FILE],
+        "Top {count} Economical Bowlers in IPL {season}"),
+    "matches_per_year": (
+        lambda p: vectorized.matches_per_year(table(MATCHES_FILE)),
+        {}, [MATCHES_FILE], "Matches Played per IPL Season"),
+    "matches_played": (
+        lambda p: vectorized.matches_played_by_team(table(MATCHES_FILE)),
+        {}, [MATCHES_FILE], "Matches Played by Team per Season"),
+    "matches_won": (
+        lambda p: vectorized.matches_won_per_team(table(MATCHES_FILE)),
+        {}, [MATCHES_FILE], "Matches Won per Team per Season"),
+}
+
+
+# Function to render a result as a PNG bar chart
+def render_png(title, result):
+    """
+    Draws a result as a bar chart (stacked per team for nested results).
+
+    Uses a standalone Figure instead of pyplot, so charts can be rendered
+    from several threads at once and nothing is written to plots/.
+
+    Args:
+        title (str): Chart title.
+        result (dict): Flat {label: value} or nested {season: {team: value}} result.
+
+    Returns:
+        bytes: The PNG image.
+    """
+    # Imported here so JSON-only use of the server never loads matplotlib
+    from matplotlib.figure import Figure    # pylint: disable=import-outside-toplevel
+
+    figure = Figure(figsize=charts.TEMPLATES["stacked"])
+    axes = figure.add_subplot()
+    nested = any(isinstance(value, dict) for value in result.values())
+
+    if nested:
+        charts.stacked_bars(axes, result, legend_fontsize='small')
+    else:
+        axes.bar(list(result.keys()), list(result.values()))
+        axes.tick_params(axis='x', labelrotation=45)
+
+    axes.set_title(title)
+    figure.tight_layout()
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format="png", dpi=PNG_DPI)
+    return buffer.getvalue()
+
+
+# Function to check the values of the query parameters
+def check_parameters(parameters):
+    """
+    Rejects parameter values the analyses cannot answer.
+
+    Args:
+        parameters (dict): Query parameters, already converted to their types.
+
+    Raises:
+        ValueError: If the season is not in matches.csv or a count is negative.
+    """
+    if "season" in parameters:
+        seasons = vectorized.matches_per_year(table(MATCHES_FILE))
+        if parameters["season"] not in seasons:
+            raise ValueError(f"unknown season {parameters['season']}")
+    for key in ("count", "min_balls"):
+        if parameters.get(key, 0) < 0:
+            raise ValueError(f"{key} must be 0 or more")
+
+
+# Function to answer one request (runs in a worker thread)
+def respond(path, query):
+    """
+    Computes the response to a GET request.
+
+    Args:
+        path (str): Request path, e.g. "/extra_runs.png".
+        query (dict): Query parameters.
+
+    Returns:
+        tuple: (status, content type, body bytes).
+    """
+    name = path.strip("/")
+    png = name.endswith(".png")
+    if png:
+        name = name[:-len(".png")]
+
+    if name == "":
+        index = {"endpoints": {endpoint: defaults for endpoint, (_, defaults, _, _) in ENDPOINTS.items()},
+                 "cache": result_cache.stats()}
+        return 200, "application/json", json.dumps(index).encode('utf-8')
+    if name not in ENDPOINTS:
+        return 404, "application/json", json.dumps({"error": f"unknown endpoint {path}"}).encode('utf-8')
+
+    compute, defaults, source_files, title = ENDPOINTS[name]
+    parameters = dict(defaults)
+    try:
+        for key, value in query.items():
+            if key not in defaults:
+                raise ValueError(f"unknown parameter {key}")
+            # Parameters take the type of their default (e.g. count is an int)
+            parameters[key] = type(defaults[key])(value)
+        check_parameters(parameters)
+    except ValueError as error:
+        return 400, "application/json", json.dumps({"error": str(error)}).encode('utf-8')
+
+    try:
+        result = result_cache.cached_result(name, parameters, source_files,
+                                            lambda: compute(parameters))
+        if png:
+            image = result_cache.cached_result(name + ".png", parameters, source_files,
+                                               lambda: render_png(title.format(**parameters), result))
+            return 200, "image/png", image
+    except Exception as error:  # pylint: disable=broad-except
+        # Answer instead of dropping the connection; the server keeps running
+        return 500, "application/json", json.dumps({"error": repr(error)}).encode('utf-8')
+    return 200, "application/json", json.dumps(result).encode('utf-8')
+
+
+# Function to serve the HTTP requests of one connection
+async def handle(reader, writer):
+    """
+    Reads GET requests from a connection and writes their responses.
+    Keep-alive connections are served until the client closes them.
+
+    Args:
+        reader (asyncio.StreamReader): Incoming side of the connection.
+        writer (asyncio.StreamWriter): Outgoing side of the connection.
+    """
+    reasons = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               500: "Internal Server Error"}
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line.strip():
+                break                   # Client closed the connection
+
+            headers = {}
+            for _ in range(MAX_HEADER_LINES):
+                line = await reader.readline()
+                if not line.strip():
+                    break
+                key, _, value = line.decode('latin-1').partition(":")
+                headers[key.strip().lower()] = value.strip()
+
+            method, target, version = (request_line.decode('latin-1').split() + ["", ""])[:3]
+            start = time.perf_counter()
+            if method == "GET":
+                url = urlsplit(target)
+                # Run the analysis in a thread so the event loop keeps serving
+                status, content_type, body = await asyncio.to_thread(
+                    respond, url.path, dict(parse_qsl(url.query)))
+            else:
+                status, content_type, body = 405, "text/plain", b"Only GET is supported\n"
+
+            keep_alive = (version == "HTTP/1.1" and headers.get("connection", "").lower() != "close")
+            writer.write(
+                f"HTTP/1.1 {status} {reasons[status]}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Server-Timing: app;dur={(time.perf_counter() - start) * 1000:.2f}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1')
+                + body)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+# Function to warm the dataset and serve until interrupted
+async def serve(host, port):
+    """
+    Loads both tables, then serves requests forever.
+
+    Args:
+        host (str): Interface to listen on.
+        port (int): TCP port to listen on.
+    """
+    start = time.perf_counter()
+    for csv_path in (MATCHES_FILE, DELIVERIES_FILE):
+        table(csv_path)
+    print(f"Dataset warm in {time.perf_counter() - start:.2f} s")
+
+    server = await asyncio.start_server(handle, host, port)
+    print(f"Serving on http://{host}:{port}/")
+    async with server:
+        await server.serve_forever()
+
+
+# Main execution function
+def execute():
+    """
+    Starts the query server from the command line.
+    """
+    parser = argparse.ArgumentParser(description="Serve the IPL analyses over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to listen on")
+    parser.add_argument("--port", type=int, default=8000, help="TCP port")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+# Run the script
+if __name__ == "__main__":
+    execute()
@@ -0,0 +1,95 @@
+"""
+render_all.py
+
+This script renders every chart in one unattended batch, for example on a
+headless render server. Charts are rendered in parallel worker processes
+with the non-interactive Agg backend and without plt.show(). Each worker
+imports matplotlib once and renders one chart after another, reusing the
+figure templates of charts.py. The rendering time of each chart is reported.
+
+Set IPL_PREVIEW=1 to render fast low-DPI drafts to plots/preview/ instead.
+
+Set IPL_WORKERS to choose the number of worker processes (default: all cores).
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Every chart script: (module name, script file)
+CHART_SCRIPTS = [
+    ("top_batsmen_rcb", " Top_batsmen_RCB.py"),
+    ("total_runs_by_team", "total_runs_by_eac_team.py"),
+    ("extra_runs_2016", "Extra_runs _conceded_per_team.py"),
+    ("economical_bowlers_2015", "top_economic_ballers.py"),
+    ("matches_per_year", "matches_played_per_year.py"),
+    ("matches_played_by_team", " matches_played by_team_by_season.py"),
+    ("matches_won_per_team", "matches_won-per_team_per_year.py"),
+    ("foreign_umpires", "foreign_umpires.py"),
+]
+
+
+# Function to prepare a worker process for headless rendering
+def init_worker():
+    """
+    Selects the non-interactive Agg backend before any script imports pyplot.
+    """
+    import matplotlib    # pylint: disable=import-outside-toplevel
+    matplotlib.use("Agg")
+
+
+# Function to render one chart (runs in a worker process)
+def render(chart):
+    """
+    Imports a chart script without side effects and renders its chart.
+
+    Args:
+        chart (tuple): (module name, script file).
+
+    Returns:
+        tuple: (module name, rendering time in seconds).
+    """
+    from delivery_scan import load_analysis    # pylint: disable=import-outside-toplevel
+
+    name, script_file = chart
+    start = time.perf_counter()
+    load_analysis(name, script_file).execute(show=False)   # Next chart reuses its template
+    return name, time.perf_counter() - start
+
+
+# Function to render all charts in parallel
+def render_all(charts=None, workers=None):
+    """
+    Renders charts in a pool of worker processes.
+
+    Args:
+        charts (list, optional): (module name, script file) pairs; all charts by default.
+        workers (int, optional): Number of worker processes (default: all cores).
+
+    Returns:
+        dict: Rendering time in seconds of every chart.
+    """
+    charts = charts or CHART_SCRIPTS
+    workers = min(len(charts), workers or os.cpu_count() or 1)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as executor:
+        return dict(executor.map(render, charts))
+
+
+# Main execution function
+def execute():
+    """
+    Renders all charts and prints the rendering time of each one.
+    """
+    workers = int(os.environ.get("IPL_WORKERS", "0")) or None
+    start = time.perf_counter()
+    timings = render_all(workers=workers)
+
+    for name, seconds in timings.items():
+        print(f"{name:<28}{seconds:8.2f} s")
+    print(f"{'total (wall clock)':<28}{time.perf_counter() - start:8.2f} s")
+
+
+# Run the script
+if __name__ == "__main__":
+    execute()
@@ -0,0 +1,258 @@
+"""
+report_graph.py
+
+This script builds the full chart report as one dependency graph. Each node
+declares the nodes it needs, e.g. "the match IDs of season 2016", "the
+deliveries of season 2016" or "runs and balls per bowler in 2015". The work
+the chart scripts repeat (parsing the CSV files, the season match-ID sets,
+the season deliveries and the per-bowler totals) becomes one node that is
+computed once and shared by every chart that needs it. The nodes call the
+functions of the chart scripts, so the results are the scripts' own.
+
+Deliveries are held as compact records (see compact_records.py), and a node
+result is dropped as soon as the last node using it is done, so the parsed
+deliveries do not outlive the season filters and charts that read them.
+
+Nodes are handed to a thread pool as soon as their inputs are ready. They
+are pure Python, so the GIL runs them one at a time: the gain comes from
+sharing nodes, not from running them side by side.
+
+Run it to compute every chart in one scheduled run, print the time of each
+node and render the charts.
+
+Usage:
+    python src/report_graph.py [--workers N] [--no-plot]
+"""
+
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import partial
+from operator import itemgetter
+
+import compact_records
+import fast_csv
+import leaderboard
+from delivery_scan import load_analysis
+
+# Charts of the report: (chart node, script file, plot function)
+CHARTS = [
+    ("top_batsmen_rcb", " Top_batsmen_RCB.py", "plot"),
+    ("total_runs_by_team", "total_runs_by_eac_team.py", "plot"),
+    ("extra_runs_2016", "Extra_runs _conceded_per_team.py", "plot"),
+    ("economical_bowlers_2015", "top_economic_ballers.py", "plot_economical_bowlers"),
+    ("matches_per_year", "matches_played_per_year.py", "plot"),
+    ("matches_played_by_team", " matches_played by_team_by_season.py", "plot"),
+    ("matches_won_per_team", "matches_won-per_team_per_year.py", "plot"),
+    ("foreign_umpires", "foreign_umpires.py", "plot"),
+    ("foreign_umpires_by_season", "foreign_umpires.py", "plot_by_season"),
+]
+
+
+# Function to collect the match IDs of a season
+def season_match_ids(matches, season):
+    """
+    Returns the IDs of the matches played in a season.
+
+    Args:
+        matches (list): Match records.
+        season (str): Season, e.g. "2016".
+
+    Returns:
+        set: Match IDs of that season.
+    """
+    return {match["id"] for match in matches if match["season"] == season}
+
+
+# Function to keep the deliveries of a set of matches
+def match_deliveries(deliveries, match_ids):
+    """
+    Filters deliveries to the given matches, keeping their order.
+
+    Args:
+        deliveries (list): Delivery records.
+        match_ids (set): Match IDs to keep.
+
+    Returns:
+        list: The deliveries of those matches.
+    """
+    return [delivery for delivery in deliveries if delivery["match_id"] in match_ids]
+
+
+# Function to declare the nodes of the report
+def report_graph(matches_path="data/matches.csv", deliveries_path="data/deliveries.csv",
+                 team="Royal Challengers Bangalore", extras_season="2016", economy_season="2015"):
+    """
+    Builds the dependency graph of every chart.
+
+    Nodes are named after what they hold, so a node several charts ask for
+    (e.g. "deliveries:2015" if both seasons were the same) exists only once.
+
+    Args:
+        matches_path (str): Path to matches.csv.
+        deliveries_path (str): Path to deliveries.csv.
+        team (str): Team of the top batsmen chart.
+        extras_season (str): Season of the extra runs chart.
+        economy_season (str): Season of the economy chart.
+
+    Returns:
+        dict: Node name mapped to (function, names of its input nodes). The
+              function receives the input results in that order.
+    """
+    modules = {name: load_analysis(name, script_file) for name, script_file, _ in CHARTS}
+
+    # Parse matches.csv once, with every column any chart needs
+    match_columns = ["id", "season"]
+    for module in modules.values():
+        match_columns += getattr(module, "MATCH_COLUMNS", [])
+    match_columns = list(dict.fromkeys(match_columns))      # Drop duplicates, keep order
+    economy = modules["economical_bowlers_2015"]
+
+    graph = {
+        "matches": (lambda: list(fast_csv.read_columns(matches_path, match_columns)), []),
+        # Compact records hold every delivery column the charts use
+        "deliveries": (lambda: list(compact_records.read_records(deliveries_path,
+                                                                 compact_records.Delivery)), []),
+        f"bowler_totals:{economy_season}": (economy.calculate_bowler_totals,
+                                            [f"match_ids:{economy_season}",
+                                             f"deliveries:{economy_season}"]),
+
+        "top_batsmen_rcb": (partial(modules["top_batsmen_rcb"].calculate, team=team,
+                                    count=leaderboard.DEFAULT_COUNT), ["deliveries"]),
+        "total_runs_by_team": (modules["total_runs_by_team"].calculate, ["deliveries"]),
+        "extra_runs_2016": (modules["extra_runs_2016"].calculate_for_matches,
+                            [f"match_ids:{extras_season}", f"deliveries:{extras_season}"]),
+        "economical_bowlers_2015": (partial(economy.rank_bowlers, count=leaderboard.DEFAULT_COUNT),
+                                    [f"bowler_totals:{economy_season}"]),
+        "umpire_countries": (modules["foreign_umpires"].load_countries, []),
+        "umpire_appearances": (modules["foreign_umpires"].count_appearances,
+                               ["matches", "umpire_countries"]),
+        "foreign_umpires": (itemgetter(0), ["umpire_appearances"]),
+        "foreign_umpires_by_season": (itemgetter(1), ["umpire_appearances"]),
+    }
+    for season in (extras_season, economy_season):
+        graph[f"match_ids:{season}"] = (partial(season_match_ids, season=season), ["matches"])
+        graph[f"deliveries:{season}"] = (match_deliveries, ["deliveries", f"match_ids:{season}"])
+
+    # The match charts only loop over the matches, so they take the shared list as is
+    for name in ("matches_per_year", "matches_played_by_team", "matches_won_per_team"):
+        graph[name] = (modules[name].calculate, ["matches"])
+    return graph
+
+
+# Function to list the nodes a set of targets depends on
+def required(graph, targets):
+    """
+    Returns every node needed to compute the targets, each one once.
+
+    Args:
+        graph (dict): Graph returned by report_graph().
+        targets (list): Names of the nodes wanted.
+
+    Returns:
+        set: Names of the targets and all their (indirect) inputs.
+    """
+    needed = set()
+    stack = list(targets)
+    while stack:
+        name = stack.pop()
+        if name in needed:
+            continue
+        if name not in graph:
+            raise KeyError(f"unknown node {name!r}")
+        needed.add(name)
+        stack += graph[name][1]
+    return needed
+
+
+# Function to compute a set of nodes, running ready nodes concurrently
+def run(graph, targets, workers=None):
+    """
+    Computes the targets and their inputs. Each node runs once, as soon as
+    all its inputs are done, in a pool of worker threads (one at a time
+    under the GIL, except while waiting on the disk). The result of a node
+    that is not a target is dropped once every node using it is done.
+
+    Args:
+        graph (dict): Graph returned by report_graph().
+        targets (list): Names of the nodes wanted.
+        workers (int, optional): Worker threads (default: all cores).
+
+    Returns:
+        tuple: (results of the targets, {node: (start, end)} times in seconds
+               since the run started, plus the thread name).
+    """
+    needed = required(graph, targets)
+    waiting = {name: set(graph[name][1]) for name in needed}
+    # Nodes still to run that use each node
+    users = {name: sum(name in graph[other][1] for other in needed) for name in needed}
+    results = {}
+    timings = {}
+    origin = time.perf_counter()
+
+    def compute(name):
+        function, inputs = graph[name]
+        start = time.perf_counter() - origin
+        result = function(*(results[key] for key in inputs))
+        timings[name] = (start, time.perf_counter() - origin, threading.current_thread().name)
+        return result
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+        running = {}
+        while waiting or running:
+            for name in [name for name, inputs in waiting.items() if not inputs]:
+                del waiting[name]
+                running[executor.submit(compute, name)] = name
+            if not running:
+                raise ValueError(f"dependency cycle between {', '.join(sorted(waiting))}")
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                results[name] = future.result()
+                for inputs in waiting.values():
+                    inputs.discard(name)
+                for key in graph[name][1]:
+                    users[key] -= 1
+                    if not users[key] and key not in targets:
+                        del results[key]     # e.g. the parsed deliveries, once filtered
+    return results, timings
+
+
+# Main execution function
+def execute():
+    """
+    Computes every chart in one scheduled run, prints the node timings and
+    renders the charts.
+    """
+    parser = argparse.ArgumentParser(description="Compute and render the IPL report as one graph.")
+    parser.add_argument("--workers", type=int, help="worker threads (default: all cores)")
+    parser.add_argument("--no-plot", action="store_true", help="only compute the results")
+    args = parser.parse_args()
+
+    graph = report_graph()
+    targets = [name for name, _, _ in CHARTS]
+    start = time.perf_counter()
+    results, timings = run(graph, targets, args.workers)
+    print(f"Computed {len(timings)} nodes for {len(targets)} charts in "
+          f"{time.perf_counter() - start:.2f} s")
+
+    for name, (begin, end, thread) in sorted(timings.items(), key=lambda item: item[1][0]):
+        users = [other for other, (_, inputs) in graph.items() if name in inputs and other in timings]
+        print(f"  {name:<30}{begin:7.3f} -> {end:7.3f} s  {thread:<24}"
+              f"{'used by ' + ', '.join(users) if users else ''}")
+
+    if not args.no_plot:
+        # pyplot is not thread-safe, so the charts are drawn one after another
+        from render_all import init_worker  # pylint: disable=import-outside-toplevel
+        init_worker()
+        for name, script_file, plot_function in CHARTS:
+            getattr(load_analysis(name, script_file), plot_function)(results[name], show=False)
+        print(f"Rendered {len(CHARTS)} charts to plots/")
+
+
+# Run the script
+if __name__ == "__main__":
+    execute()
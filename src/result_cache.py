@@ -0,0 +1,128 @@
+"""
+result_cache.py
+
+This script keeps a bounded LRU cache of analysis results. Entries are keyed
+on the analysis name, its parameters and a fingerprint (size and mtime) of
+the source files, so a repeated request is answered without touching the
+data and a changed CSV never serves a stale result. The least recently used
+entries are evicted once the entry or memory limit is reached. The cache can
+be shared by threads (e.g. the request handlers of query_server.py).
+"""
+
+import copy
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import compressed
+
+MAX_ENTRIES = 1024              # Most results kept at once
+MAX_BYTES = 64 * 1024 * 1024    # Approximate memory limit for cached results
+
+# Cache state: key -> (result, size in bytes), oldest entry first
+_entries = OrderedDict()
+_stats = {"hits": 0, "misses": 0, "bytes": 0}
+_lock = threading.Lock()        # Guards _entries and _stats, not the computation
+
+
+# Function to fingerprint the source files of a result
+def fingerprint(file_paths):
+    """
+    Returns a cheap fingerprint of the files a result was computed from.
+
+    Args:
+        file_paths (list): Paths of the source files (a missing CSV file is
+                           stamped by its .gz or .zst archive).
+
+    Returns:
+        tuple: (path, size, mtime_ns) of every file.
+    """
+    stamps = []
+    for file_path in file_paths:
+        stat = os.stat(compressed.resolve(file_path))
+        stamps.append((os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns))
+    return tuple(stamps)
+
+
+# Function to estimate the memory used by a result
+def result_size(value):
+    """
+    Estimates the memory held by a result, following dicts, lists and tuples.
+
+    Args:
+        value: Result to measure.
+
+    Returns:
+        int: Approximate size in bytes.
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(result_size(key) + result_size(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(result_size(item) for item in value)
+    return size
+
+
+# Function to return a cached result or compute and store it
+def cached_result(analysis, parameters, source_files, compute):
+    """
+    Returns the result of an analysis, computing it only on a cache miss.
+
+    Args:
+        analysis (str): Name of the analysis.
+        parameters (dict): Parameters of the request (e.g. season, team).
+        source_files (list): CSV files the result depends on.
+        compute (callable): Called without arguments to compute the result.
+
+    Returns:
+        Copy of the cached result, so callers cannot change the cache.
+    """
+    key = (analysis, tuple(sorted(parameters.items())), fingerprint(source_files))
+
+    with _lock:
+        if key in _entries:
+            _stats["hits"] += 1
+            _entries.move_to_end(key)           # Mark as most recently used
+            return copy.deepcopy(_entries[key][0])
+        _stats["misses"] += 1
+
+    # Computed outside the lock so other requests are not blocked meanwhile
+    result = compute()
+    size = result_size(result)
+
+    with _lock:
+        if key in _entries:
+            # Another thread computed the same result in the meantime
+            _stats["bytes"] -= _entries.pop(key)[1]
+        _entries[key] = (result, size)
+        _stats["bytes"] += size
+
+        # Evict least recently used entries until both limits hold again
+        while len(_entries) > MAX_ENTRIES or (_stats["bytes"] > MAX_BYTES and len(_entries) > 1):
+            _, (_, evicted_size) = _entries.popitem(last=False)
+            _stats["bytes"] -= evicted_size
+
+    return copy.deepcopy(result)
+
+
+# Function to empty the cache
+def clear():
+    """
+    Removes every cached result and resets the statistics.
+    """
+    with _lock:
+        _entries.clear()
+        _stats.update(hits=0, misses=0, bytes=0)
+
+
+# Function to report cache statistics
+def stats():
+    """
+    Returns cache statistics.
+
+    Returns:
+        dict: Hits, misses, cached bytes and number of entries.
+    """
+    with _lock:
+        return dict(_stats, entries=len(_entries))
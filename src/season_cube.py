@@ -0,0 +1,285 @@
+"""
+season_cube.py
+
+This script precomputes a dense season x team x measure cube from
+matches.csv in a single pass. The measures are matches played, wins, toss
+wins, wins batting first and wins chasing. The cube is saved next to the
+columnar cache and rebuilt only when matches.csv changes, so the match charts
+and any other season/team breakdown are answered from a small in-memory
+array instead of re-scanning the CSV.
+
+For every cell the cube also keeps the position of the first match that
+counted towards it, so slices return their seasons and teams in the same
+first-appearance order as the loop versions in the chart scripts.
+
+Set IPL_BACKEND=cube to make the three match charts read from the cube.
+"""
+
+import os
+import time
+
+import numpy as np
+
+import fast_csv
+from cache_files import cache_path, source_stamp
+
+MEASURES = ["played", "wins", "toss_wins", "wins_batting_first", "wins_chasing"]
+
+# Columns used by build_cube()
+MATCH_COLUMNS = ["season", "team1", "team2", "toss_winner", "toss_decision", "winner"]
+
+NOT_SEEN = np.iinfo(np.int64).max    # first_seen of cells that were never counted
+
+
+# Function to locate the persisted cube of a matches file
+def cube_path(matches_path):
+    """
+    Returns the file used to persist the cube of a matches file.
+
+    Args:
+        matches_path (str): Path to matches.csv.
+
+    Returns:
+        str: Path to the .npz cube file.
+    """
+    return cache_path(matches_path) + ".cube.npz"
+
+
+# Function to build the cube in one pass over the matches
+def build_cube(matches):
+    """
+    Counts every measure per season and team.
+
+    Args:
+        matches (iterable): Match records (dicts) from matches.csv.
+
+    Returns:
+        dict: "seasons" and "teams" labels of the first two axes, "counts"
+              (season x team x measure int64 array) and "first_seen" (the
+              position of the first count in each cell).
+    """
+    matches = list(matches)
+    seasons = sorted({match["season"] for match in matches}, key=int)
+    teams = sorted({team for match in matches
+                    for team in (match["team1"], match["team2"], match["winner"],
+                                 match["toss_winner"]) if team})
+    season_index = {season: index for index, season in enumerate(seasons)}
+    team_index = {team: index for index, team in enumerate(teams)}
+    measure_index = {measure: index for index, measure in enumerate(MEASURES)}
+
+    counts = np.zeros((len(seasons), len(teams), len(MEASURES)), dtype=np.int64)
+    first_seen = np.full(counts.shape, NOT_SEEN, dtype=np.int64)
+
+    def count(season, team, measure, position):
+        cell = (season, team_index[team], measure_index[measure])
+        counts[cell] += 1
+        if first_seen[cell] == NOT_SEEN:
+            first_seen[cell] = position
+
+    for row, match in enumerate(matches):
+        season = season_index[match["season"]]
+        team1, team2, winner = match["team1"], match["team2"], match["winner"]
+        # Two positions per match so team1 comes before team2 of the same match
+        position = 2 * row
+
+        count(season, team1, "played", position)
+        count(season, team2, "played", position + 1)
+        if match["toss_winner"]:
+            count(season, match["toss_winner"], "toss_wins", position)
+
+        # Skip matches with no winner (e.g., abandoned matches)
+        if winner == "":
+            continue
+        count(season, winner, "wins", position)
+
+        # The toss winner chose to bat or field; the other team did the opposite
+        other = team2 if match["toss_winner"] == team1 else team1
+        batting_first = match["toss_winner"] if match["toss_decision"] == "bat" else other
+        count(season, winner, "wins_batting_first" if winner == batting_first else "wins_chasing",
+              position)
+
+    return {"seasons": seasons, "teams": teams, "counts": counts, "first_seen": first_seen}
+
+
+# Function to save a cube with the stamp of its source file
+def save_cube(cube, matches_path):
+    """
+    Saves a cube next to the columnar cache of matches.csv.
+
+    Args:
+        cube (dict): Cube returned by build_cube().
+        matches_path (str): Path to the matches.csv it was built from.
+    """
+    target = cube_path(matches_path)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    stamp = source_stamp(matches_path)
+
+    # Write to a temporary file first so a failed save leaves no cube
+    with open(target + ".tmp", 'wb') as file:
+        np.savez(file, seasons=np.array(cube["seasons"], dtype=str),
+                 teams=np.array(cube["teams"], dtype=str), measures=np.array(MEASURES, dtype=str),
+                 counts=cube["counts"], first_seen=cube["first_seen"],
+                 stamp=np.array([stamp["size"], stamp["mtime_ns"]], dtype=np.int64))
+    os.replace(target + ".tmp", target)
+
+
+# Function to load the cube, rebuilding it when matches.csv changed
+def load_cube(matches_path):
+    """
+    Loads the persisted cube, rebuilding it if it is missing, was built
+    with other measures or matches.csv changed since it was built.
+
+    Args:
+        matches_path (str): Path to matches.csv.
+
+    Returns:
+        dict: The cube (see build_cube()).
+    """
+    stamp = source_stamp(matches_path)
+    try:
+        with np.load(cube_path(matches_path)) as saved:
+            if (saved["stamp"].tolist() == [stamp["size"], stamp["mtime_ns"]]
+                    and saved["measures"].tolist() == MEASURES):
+                return {"seasons": saved["seasons"].tolist(), "teams": saved["teams"].tolist(),
+                        "counts": saved["counts"], "first_seen": saved["first_seen"]}
+    except (OSError, KeyError, ValueError):
+        pass
+
+    cube = build_cube(fast_csv.read_columns(matches_path, MATCH_COLUMNS))
+    save_cube(cube, matches_path)
+    return cube
+
+
+# Function to slice one measure of the cube into a nested dictionary
+def slice_cube(cube, measure, season=None, team=None):
+    """
+    Returns the non-zero cells of one measure, optionally for one season
+    and/or one team.
+
+    Args:
+        cube (dict): Cube returned by load_cube().
+        measure (str): One of MEASURES.
+        season (str, optional): Keep only this season.
+        team (str, optional): Keep only this team.
+
+    Returns:
+        dict: Nested dictionary {season: {team: count}} in first-appearance order.
+    """
+    counts = cube["counts"][:, :, MEASURES.index(measure)]
+    first_seen = cube["first_seen"][:, :, MEASURES.index(measure)]
+
+    season_rows = range(len(cube["seasons"]))
+    if season is not None:
+        season_rows = [cube["seasons"].index(season)] if season in cube["seasons"] else []
+    team_columns = np.arange(len(cube["teams"]))
+    if team is not None:
+        team_columns = np.array([cube["teams"].index(team)] if team in cube["teams"] else [],
+                                dtype=np.int64)
+
+    # Order seasons by their first counted match, teams by theirs within the season
+    entries = []
+    for row in season_rows:
+        columns = team_columns[counts[row, team_columns] > 0]
+        if columns.size:
+            columns = columns[np.argsort(first_seen[row, columns], kind='stable')]
+            entries.append((first_seen[row, columns[0]], row, columns))
+    entries.sort(key=lambda entry: entry[0])
+
+    return {cube["seasons"][row]: {cube["teams"][column]: int(counts[row, column])
+                                   for column in columns}
+            for _, row, columns in entries}
+
+
+# Function to total one measure over seasons or teams
+def rollup(cube, measure, by="season"):
+    """
+    Totals one measure per season (over all teams) or per team (over all seasons).
+
+    Args:
+        cube (dict): Cube returned by load_cube().
+        measure (str): One of MEASURES.
+        by (str): "season" or "team".
+
+    Returns:
+        dict: Season or team labels mapped to totals, in first-appearance order.
+    """
+    counts = cube["counts"][:, :, MEASURES.index(measure)]
+    first_seen = cube["first_seen"][:, :, MEASURES.index(measure)]
+    axis = 1 if by == "season" else 0
+    labels = cube["seasons"] if by == "season" else cube["teams"]
+
+    totals = counts.sum(axis=axis)
+    order = np.argsort(first_seen.min(axis=axis), kind='stable')
+    return {labels[index]: int(totals[index]) for index in order if totals[index] > 0}
+
+
+# Cube version of matches_played_per_year.calculate
+def matches_per_year(cube):
+    """
+    Calculates the number of matches played in each IPL season.
+
+    Args:
+        cube (dict): Cube returned by load_cube().
+
+    Returns:
+        dict: Dictionary where keys are seasons and values are total matches played.
+    """
+    # Every match is played by two teams
+    return {season: played // 2 for season, played in rollup(cube, "played").items()}
+
+
+# Cube version of matches_played by_team_by_season.calculate
+def matches_played_by_team(cube):
+    """
+    Calculates the number of matches played by each team per season.
+
+    Args:
+        cube (dict): Cube returned by load_cube().
+
+    Returns:
+        dict: Nested dictionary {season: {team: matches played}}.
+    """
+    return slice_cube(cube, "played")
+
+
+# Cube version of matches_won-per_team_per_year.calculate
+def matches_won_per_team(cube):
+    """
+    Calculates the number of matches won by each team per season.
+
+    Args:
+        cube (dict): Cube returned by load_cube().
+
+    Returns:
+        dict: Nested dictionary {season: {team: wins}}.
+    """
+    return slice_cube(cube, "wins")
+
+
+# Main execution function
+def execute():
+    """
+    Builds (or loads) the cube and times a few slice and roll-up queries.
+    """
+    file_path = "data/matches.csv"
+    start = time.perf_counter()
+    cube = load_cube(file_path)
+    print(f"Cube {cube['counts'].shape} (season x team x measure) ready in "
+          f"{(time.perf_counter() - start) * 1000:.1f} ms: {cube_path(file_path)}")
+
+    queries = [
+        ("matches per season", lambda: matches_per_year(cube)),
+        ("wins per team per season", lambda: matches_won_per_team(cube)),
+        ("toss wins per team", lambda: rollup(cube, "toss_wins", by="team")),
+        ("wins chasing in the last season", lambda: slice_cube(cube, "wins_chasing",
+                                                               season=cube["seasons"][-1])),
+    ]
+    for name, query in queries:
+        start = time.perf_counter()
+        query()
+        print(f"{name:<34}{(time.perf_counter() - start) * 1e6:8.0f} us")
+
+
+# Run the script
+if __name__ == "__main__":
+    execute()
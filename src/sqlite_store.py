@@ -0,0 +1,424 @@
+"""
+sqlite_store.py
+
+This script loads matches.csv and deliveries.csv into a local SQLite database
+(data/ipl.sqlite) for ad-hoc SQL queries, and holds SQL versions of every
+calculate() function. The CSV files are bulk-loaded with batched executemany()
+calls inside one transaction, then indexed on match_id, season, batting_team,
+bowling_team, batsman and bowler. The database is rebuilt automatically when
+a CSV file changes.
+
+Results are identical to the CSV implementations, including the order of the
+returned dictionaries: rows keep their file order as rowid, so ordering groups
+by MIN(rowid) reproduces first appearance, and ties in the rankings are broken
+the same way.
+
+Run it to build the database, check every SQL query against its CSV version
+and print the query plans. Set IPL_BACKEND=sqlite to make the analysis scripts
+query the database.
+"""
+
+import csv
+import os
+import sqlite3
+import time
+from itertools import islice
+
+import compressed
+from cache_files import source_stamp
+from columnar_cache import NUMERIC_COLUMNS
+
+DATABASE_FILE = "data/ipl.sqlite"
+BATCH_SIZE = 10000        # Rows per executemany() call
+
+# Indexed columns: (table, column)
+INDEXES = [
+    ("deliveries", "match_id"),
+    ("matches", "season"),
+    ("deliveries", "batting_team"),
+    ("deliveries", "bowling_team"),
+    ("deliveries", "batsman"),
+    ("deliveries", "bowler"),
+]
+
+# SQL of every analysis; groups are ordered by their first row, like the loops
+QUERIES = {
+    "top_batsmen": """
+        SELECT batsman, SUM(batsman_runs) AS runs FROM deliveries
+        WHERE batting_team = ?
+        GROUP BY batsman ORDER BY runs DESC, MIN(rowid) LIMIT ?""",
+    "total_runs": """
+        SELECT batting_team, SUM(total_runs) FROM deliveries
+        GROUP BY batting_team ORDER BY MIN(rowid)""",
+    "extra_runs": """
+        SELECT bowling_team, SUM(extra_runs) FROM deliveries
+        WHERE match_id IN (SELECT id FROM matches WHERE season = ?)
+        GROUP BY bowling_team ORDER BY MIN(rowid)""",
+    # Same float operations as leaderboard.economy_rates: runs / (balls / 6)
+    "economical_bowlers": """
+        SELECT bowler, SUM(total_runs) / (COUNT(*) / 6.0) AS economy FROM deliveries
+        WHERE match_id IN (SELECT id FROM matches WHERE season = ?)
+        GROUP BY bowler HAVING COUNT(*) >= ?
+        ORDER BY economy, MIN(rowid) LIMIT ?""",
+    "matches_per_year": """
+        SELECT season, COUNT(*) FROM matches
+        GROUP BY season ORDER BY MIN(rowid)""",
+    # team1 and team2 are interleaved so rows keep the loop's visiting order
+    "matches_played": """
+        SELECT season, team, COUNT(*) FROM (
+            SELECT season, team1 AS team, rowid * 2 AS position FROM matches
+            UNION ALL
+            SELECT season, team2 AS team, rowid * 2 + 1 AS position FROM matches)
+        GROUP BY season, team ORDER BY MIN(position)""",
+    "matches_won": """
+        SELECT season, winner, COUNT(*) FROM matches
+        WHERE winner != ''
+        GROUP BY season, winner ORDER BY MIN(rowid)""",
+}
+
+
+# Function to create a table and bulk-load a CSV file into it
+def load_csv(connection, table, csv_path):
+    """
+    Creates a table from a CSV header and inserts every row in batches.
+
+    Numeric columns get INTEGER affinity, so SQLite converts their text
+    values while inserting and no per-value Python conversion is needed.
+
+    Args:
+        connection (sqlite3.Connection): Open database, inside a transaction.
+        table (str): Table to create ("matches" or "deliveries").
+        csv_path (str): Path to the CSV file (plain, .gz or .zst).
+
+    Returns:
+        int: Number of rows loaded.
+    """
+    rows = 0
+    with compressed.open_text(csv_path) as file:
+        reader = csv.reader(file)
+        header = next(reader)
+
+        # Quote every name: "over" is an SQL keyword
+        definitions = ", ".join(f'"{name}" {"INTEGER" if name in NUMERIC_COLUMNS else "TEXT"}'
+                                for name in header)
+        connection.execute(f'CREATE TABLE "{table}" ({definitions})')
+        insert = f'INSERT INTO "{table}" VALUES ({", ".join("?" * len(header))})'
+
+        while True:
+            batch = list(islice(reader, BATCH_SIZE))
+            if not batch:
+                return rows
+            connection.executemany(insert, batch)
+            rows += len(batch)
+
+
+# Function to record the size and mtime of the source CSV files
+def source_stamps(matches_path, deliveries_path):
+    """
+    Returns the stamps the database is built from.
+
+    Args:
+        matches_path (str): Path to matches.csv.
+        deliveries_path (str): Path to deliveries.csv.
+
+    Returns:
+        list: (absolute path, size, mtime_ns) of each file actually read.
+    """
+    stamps = []
+    for path in (matches_path, deliveries_path):
+        stamp = source_stamp(compressed.resolve(path))
+        stamps.append((os.path.abspath(path), stamp["size"], stamp["mtime_ns"]))
+    return stamps
+
+
+# Function to build the database from the CSV files
+def ingest(matches_path="data/matches.csv", deliveries_path="data/deliveries.csv",
+           database=DATABASE_FILE):
+    """
+    Builds the SQLite database from scratch in a single transaction.
+
+    Args:
+        matches_path (str): Path to matches.csv.
+        deliveries_path (str): Path to deliveries.csv.
+        database (str): Database file to write.
+
+    Returns:
+        dict: Rows loaded per table.
+    """
+    temporary = database + ".tmp"
+    if os.path.exists(temporary):
+        os.remove(temporary)
+
+    # Transactions are managed explicitly so the tables, rows and indexes
+    # are all written by a single BEGIN ... COMMIT
+    connection = sqlite3.connect(temporary, isolation_level=None)
+    try:
+        # The file is only published once complete, so the journal is not needed
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("PRAGMA synchronous = OFF")
+        connection.execute("BEGIN")
+        rows = {"matches": load_csv(connection, "matches", matches_path),
+                "deliveries": load_csv(connection, "deliveries", deliveries_path)}
+
+        # Indexes are built after the load, in one sorted pass each
+        for table, column in INDEXES:
+            connection.execute(f'CREATE INDEX "{table}_{column}" ON "{table}" ("{column}")')
+
+        # Remember the sources so a changed CSV triggers a rebuild
+        connection.execute("CREATE TABLE sources (path TEXT, size INTEGER, mtime_ns INTEGER)")
+        connection.executemany("INSERT INTO sources VALUES (?, ?, ?)",
+                               source_stamps(matches_path, deliveries_path))
+        connection.execute("COMMIT")
+        connection.execute("ANALYZE")    # Statistics for the query planner
+    finally:
+        connection.close()
+
+    os.replace(temporary, database)
+    return rows
+
+
+# Function to check whether the database matches the CSV files
+def is_current(matches_path, deliveries_path, database=DATABASE_FILE):
+    """
+    Checks that the database exists and was built from the current CSV files.
+
+    Args:
+        matches_path (str): Path to matches.csv.
+        deliveries_path (str): Path to deliveries.csv.
+        database (str): Database file.
+
+    Returns:
+        bool: True if the database can be used as is.
+    """
+    if not os.path.exists(database):
+        return False
+    connection = sqlite3.connect(database)
+    try:
+        stored = set(connection.execute("SELECT path, size, mtime_ns FROM sources"))
+    except sqlite3.Error:
+        return False
+    finally:
+        connection.close()
+
+    return stored == set(source_stamps(matches_path, deliveries_path))
+
+
+# Function to open the database, building it when needed
+def connect(matches_path="data/matches.csv", deliveries_path="data/deliveries.csv",
+            database=DATABASE_FILE):
+    """
+    Opens the SQLite database of the CSV files, (re)building it if it is
+    missing or stale.
+
+    Args:
+        matches_path (str): Path to matches.csv.
+        deliveries_path (str): Path to deliveries.csv.
+        database (str): Database file.
+
+    Returns:
+        sqlite3.Connection: Open connection to the database.
+    """
+    if not is_current(matches_path, deliveries_path, database):
+        ingest(matches_path, deliveries_path, database)
+    return sqlite3.connect(database)
+
+
+# SQL version of Top_batsmen_RCB.calculate
+def top_batsmen(connection, team="Royal Challengers Bangalore", count=10):
+    """
+    Calculates the top 10 batsmen for a team by total runs.
+
+    Args:
+        connection (sqlite3.Connection): Open database.
+        team (str): Batting team to rank batsmen for.
+        count (int): Number of batsmen to keep (10 by default).
+
+    Returns:
+        dict: Dictionary of top 10 batsmen and their total runs.
+    """
+    return dict(connection.execute(QUERIES["top_batsmen"], (team, max(count, 0))))
+
+
+# SQL version of total_runs_by_eac_team.calculate
+def total_runs_by_team(connection):
+    """
+    Calculates total runs scored by each IPL team.
+
+    Args:
+        connection (sqlite3.Connection): Open database.
+
+    Returns:
+        dict: Dictionary with team names as keys and total runs as values.
+    """
+    return dict(connection.execute(QUERIES["total_runs"]))
+
+
+# SQL version of Extra_runs _conceded_per_team.calculate
+def extra_runs(connection, season="2016"):
+    """
+    Calculates the total extra runs conceded by each IPL team in a season.
+
+    Args:
+        connection (sqlite3.Connection): Open database.
+        season (str): Season to count (2016 by default).
+
+    Returns:
+        dict: Dictionary with team names as keys and total extra runs conceded as values.
+    """
+    return dict(connection.execute(QUERIES["extra_runs"], (int(season),)))
+
+
+# SQL version of top_economic_ballers.calculate_economical_bowlers
+def economical_bowlers(connection, season="2015", count=10, min_balls=0):
+    """
+    Calculates the top 10 economical bowlers in an IPL season.
+
+    Args:
+        connection (sqlite3.Connection): Open database.
+        season (str): Season to rank bowlers for (2015 by default).
+        count (int): Number of bowlers to keep (10 by default).
+        min_balls (int): Minimum balls bowled to be ranked (0 ranks everybody).
+
+    Returns:
+        dict: Dictionary of top 10 bowlers with their economy rates.
+    """
+    return dict(connection.execute(QUERIES["economical_bowlers"],
+                                   (int(season), min_balls, max(count, 0))))
+
+
+# SQL version of matches_played_per_year.calculate
+def matches_per_year(connection):
+    """
+    Calculates the number of matches played in each IPL season.
+
+    Args:
+        connection (sqlite3.Connection): Open database.
+
+    Returns:
+        dict: Dictionary where keys are seasons and values are total matches played.
+    """
+    return {str(season): count for season, count in connection.execute(QUERIES["matches_per_year"])}
+
+
+# Function to nest (season, team, count) rows into a dictionary
+def nested(rows):
+    """
+    Builds {season: {team: count}} from rows in first-appearance order.
+
+    Args:
+        rows (iterable): (season, team, count) tuples.
+
+    Returns:
+        dict: Nested dictionary keyed by season (as text) and team.
+    """
+    result = {}
+    for season, team, count in rows:
+        result.setdefault(str(season), {})[team] = count
+    return result
+
+
+# SQL version of matches_played by_team_by_season.calculate
+def matches_played_by_team(connection):
+    """
+    Calculates the number of matches played by each team per season.
+
+    Args:
+        connection (sqlite3.Connection): Open database.
+
+    Returns:
+        dict: Nested dictionary {season: {team: matches played}}.
+    """
+    return nested(connection.execute(QUERIES["matches_played"]))
+
+
+# SQL version of matches_won-per_team_per_year.calculate
+def matches_won_per_team(connection):
+    """
+    Calculates the number of matches won by each team per season.
+
+    Args:
+        connection (sqlite3.Connection): Open database.
+
+    Returns:
+        dict: Nested dictionary {season: {team: wins}}.
+    """
+    return nested(connection.execute(QUERIES["matches_won"]))
+
+
+# Function to describe how SQLite runs a query
+def query_plan(connection, name):
+    """
+    Returns the EXPLAIN QUERY PLAN lines of one of the QUERIES.
+
+    Args:
+        connection (sqlite3.Connection): Open database.
+        name (str): Key of QUERIES.
+
+    Returns:
+        list: One line per plan step.
+    """
+    sql = QUERIES[name]
+    parameters = [0] * sql.count("?")    # The plan does not depend on the values
+    return [row[-1] for row in connection.execute("EXPLAIN QUERY PLAN " + sql, parameters)]
+
+
+# Main execution function
+def execute():
+    """
+    Builds the database, checks every SQL query against its CSV version and
+    prints the timings and query plans.
+    """
+    # Imported here: only the check needs the CSV-side analyses
+    import fast_csv  # pylint: disable=import-outside-toplevel
+    from delivery_scan import load_analysis  # pylint: disable=import-outside-toplevel
+
+    matches_path, deliveries_path = "data/matches.csv", "data/deliveries.csv"
+    start = time.perf_counter()
+    rows = ingest(matches_path, deliveries_path)
+    print(f"Loaded {rows['matches']} matches and {rows['deliveries']} deliveries into "
+          f"{DATABASE_FILE} in {time.perf_counter() - start:.2f} s")
+
+    # (query, script file, input files, calculate function, SQL function)
+    checks = [
+        ("top_batsmen", " Top_batsmen_RCB.py", ("deliveries",), "calculate", top_batsmen),
+        ("total_runs", "total_runs_by_eac_team.py", ("deliveries",), "calculate", total_runs_by_team),
+        ("extra_runs", "Extra_runs _conceded_per_team.py", ("matches", "deliveries"),
+         "calculate", extra_runs),
+        ("economical_bowlers", "top_economic_ballers.py", ("matches", "deliveries"),
+         "calculate_economical_bowlers_2015", economical_bowlers),
+        ("matches_per_year", "matches_played_per_year.py", ("matches",), "calculate", matches_per_year),
+        ("matches_played", " matches_played by_team_by_season.py", ("matches",),
+         "calculate", matches_played_by_team),
+        ("matches_won", "matches_won-per_team_per_year.py", ("matches",),
+         "calculate", matches_won_per_team),
+    ]
+    paths = {"matches": matches_path, "deliveries": deliveries_path}
+
+    connection = connect(matches_path, deliveries_path)
+    try:
+        for name, script_file, inputs, calculate_function, query in checks:
+            module = load_analysis(name, script_file)
+            columns = {"matches": getattr(module, "MATCH_COLUMNS", None),
+                       "deliveries": getattr(module, "DELIVERY_COLUMNS", None)}
+
+            start = time.perf_counter()
+            csv_result = getattr(module, calculate_function)(
+                *(fast_csv.read_columns(paths[key], columns[key]) for key in inputs))
+            csv_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            sql_result = query(connection)
+            sql_seconds = time.perf_counter() - start
+
+            same = csv_result == sql_result and list(csv_result) == list(sql_result)
+            print(f"{name:<20}CSV {csv_seconds:7.3f} s   SQLite {sql_seconds:7.3f} s   "
+                  f"same result: {same}")
+            for step in query_plan(connection, name):
+                print(f"    {step}")
+    finally:
+        connection.close()
+
+
+# Run the script
+if __name__ == "__main__":
+    execute()
@@ -0,0 +1,191 @@
+"""
+synthetic_data.py
+
+This script writes synthetic IPL data in the exact column layout of the
+Kaggle matches.csv and deliveries.csv files, at any number of delivery rows
+(10^5 to 10^8 and beyond). The output is reproducible for a given seed and
+is used by benchmark.py to see how the analyses scale.
+
+Usage:
+    python src/synthetic_data.py <delivery rows> <output folder> [seed]
+"""
+
+import csv
+import os
+import random
+import sys
+
+MATCH_COLUMNS = [
+    "id", "season", "city", "date", "team1", "team2", "toss_winner",
+    "toss_decision", "result", "dl_applied", "winner", "win_by_runs",
+    "win_by_wickets", "player_of_match", "venue", "umpire1", "umpire2", "umpire3",
+]
+
+DELIVERY_COLUMNS = [
+    "match_id", "inning", "batting_team", "bowling_team", "over", "ball",
+    "batsman", "non_striker", "bowler", "is_super_over", "wide_runs",
+    "bye_runs", "legbye_runs", "noball_runs", "penalty_runs", "batsman_runs",
+    "extra_runs", "total_runs", "player_dismissed", "dismissal_kind", "fielder",
+]
+
+SEASONS = [str(year) for year in range(2008, 2018)]
+
+# Team name -> (city, home venue); some venues contain commas and need quoting
+TEAMS = {
+    "Chennai Super Kings": ("Chennai", "MA Chidambaram Stadium, Chepauk"),
+    "Delhi Daredevils": ("Delhi", "Feroz Shah Kotla"),
+    "Kings XI Punjab": ("Chandigarh", "Punjab Cricket Association Stadium, Mohali"),
+    "Kolkata Knight Riders": ("Kolkata", "Eden Gardens"),
+    "Mumbai Indians": ("Mumbai", "Wankhede Stadium"),
+    "Rajasthan Royals": ("Jaipur", "Sawai Mansingh Stadium"),
+    "Royal Challengers Bangalore": ("Bangalore", "M Chinnaswamy Stadium"),
+    "Sunrisers Hyderabad": ("Hyderabad", "Rajiv Gandhi International Stadium, Uppal"),
+}
+
+UMPIRES = [
+    "Aleem Dar", "Asad Rauf", "BF Bowden", "BNJ Oxenford", "IJ Gould",
+    "M Erasmus", "NJ Llong", "RK Illingworth", "RJ Tucker", "HDPK Dharmasena",
+    "SJA Taufel", "AY Dandekar", "S Ravi", "CK Nandan", "Nitin Menon",
+]
+
+PLAYERS_PER_TEAM = 25
+BALLS_PER_INNING = 120
+BATSMAN_RUNS = [0, 0, 0, 1, 1, 1, 1, 2, 3, 4, 4, 6]
+DISMISSAL_KINDS = ["caught", "bowled", "lbw", "run out", "stumped"]
+
+
+# Function to build the squad of every team
+def squads():
+    """
+    Returns a fixed list of player names for every team.
+
+    Returns:
+        dict: Team names mapped to lists of player names.
+    """
+    squad = {}
+    for team in TEAMS:
+        initials = "".join(word[0] for word in team.split())
+        squad[team] = [f"{initials} Player {number}" for number in range(1, PLAYERS_PER_TEAM + 1)]
+    return squad
+
+
+# Function to write one match and its deliveries
+def write_match(match_id, season, rng, squad, match_writer, delivery_writer, rows_left):
+    """
+    Writes one match row and up to rows_left delivery rows for it.
+
+    Args:
+        match_id (int): ID of the match.
+        season (str): Season of the match.
+        rng (random.Random): Seeded random generator.
+        squad (dict): Team names mapped to player names.
+        match_writer (csv.writer): Writer for matches.csv.
+        delivery_writer (csv.writer): Writer for deliveries.csv.
+        rows_left (int): Delivery rows still to be written.
+
+    Returns:
+        int: Number of delivery rows written.
+    """
+    team1, team2 = rng.sample(list(TEAMS), 2)
+    city, venue = TEAMS[team1]
+    toss_winner = rng.choice([team1, team2])
+    toss_decision = rng.choice(["bat", "field"])
+    batting_first = toss_winner if toss_decision == "bat" else (team2 if toss_winner == team1 else team1)
+    chasing = team2 if batting_first == team1 else team1
+
+    rows = 0
+    scores = {}
+    for inning, (batting, bowling) in enumerate([(batting_first, chasing), (chasing, batting_first)], 1):
+        batsmen = squad[batting][:11]
+        bowlers = squad[bowling][6:11]
+        score = 0
+        for ball_number in range(BALLS_PER_INNING):
+            if rows == rows_left:
+                break
+            batsman_runs = rng.choice(BATSMAN_RUNS)
+            wide_runs = 1 if rng.random() < 0.03 else 0
+            legbye_runs = 1 if rng.random() < 0.02 else 0
+            extra_runs = wide_runs + legbye_runs
+            dismissed = rng.random() < 0.04
+            batsman = batsmen[min(10, ball_number // 12)]
+            score += batsman_runs + extra_runs
+            delivery_writer.writerow([
+                match_id, inning, batting, bowling, ball_number // 6 + 1, ball_number % 6 + 1,
+                batsman, batsmen[min(10, ball_number // 12 + 1)],
+                bowlers[(ball_number // 6) % len(bowlers)], 0, wide_runs, 0, legbye_runs, 0, 0,
+                batsman_runs, extra_runs, batsman_runs + extra_runs,
+                batsman if dismissed else "", rng.choice(DISMISSAL_KINDS) if dismissed else "",
+                rng.choice(squad[bowling][:11]) if dismissed else "",
+            ])
+            rows += 1
+        scores[batting] = score
+
+    winner = max(scores, key=scores.get) if scores else ""
+    first_won = winner == batting_first
+    match_writer.writerow([
+        match_id, season, city, f"{season}-04-{match_id % 28 + 1:02d}", team1, team2,
+        toss_winner, toss_decision, "normal", 0, winner,
+        abs(scores.get(batting_first, 0) - scores.get(chasing, 0)) if first_won else 0,
+        0 if first_won else rng.randint(1, 10),
+        rng.choice(squad[winner][:11]) if winner else "", venue,
+        *rng.sample(UMPIRES, 2), "",
+    ])
+    return rows
+
+
+# Function to generate a full synthetic dataset
+def generate(delivery_rows, output_dir, seed=2008):
+    """
+    Writes matches.csv and deliveries.csv with the given number of delivery rows.
+
+    Matches are spread evenly over the seasons 2008-2017, so season-filtered
+    analyses select the same share of the data at every size.
+
+    Args:
+        delivery_rows (int): Number of rows to write to deliveries.csv.
+        output_dir (str): Folder to write the two CSV files into.
+        seed (int): Seed of the random generator.
+
+    Returns:
+        tuple: (matches path, deliveries path).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    matches_path = os.path.join(output_dir, "matches.csv")
+    deliveries_path = os.path.join(output_dir, "deliveries.csv")
+
+    rng = random.Random(seed)
+    squad = squads()
+    match_count = max(1, -(-delivery_rows // (2 * BALLS_PER_INNING)))
+
+    with open(matches_path, 'w', encoding='utf-8', newline='') as match_file, \
+            open(deliveries_path, 'w', encoding='utf-8', newline='') as delivery_file:
+        match_writer = csv.writer(match_file)
+        delivery_writer = csv.writer(delivery_file)
+        match_writer.writerow(MATCH_COLUMNS)
+        delivery_writer.writerow(DELIVERY_COLUMNS)
+
+        rows_left = delivery_rows
+        for match_id in range(1, match_count + 1):
+            season = SEASONS[(match_id - 1) * len(SEASONS) // match_count]
+            rows_left -= write_match(match_id, season, rng, squad,
+                                     match_writer, delivery_writer, rows_left)
+
+    return matches_path, deliveries_path
+
+
+# Main execution function
+def execute():
+    """
+    Generates a synthetic dataset from the command-line arguments.
+    """
+    if len(sys.argv) < 3:
+        print(__doc__)
+        sys.exit(1)
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 2008
+    for path in generate(int(float(sys.argv[1])), sys.argv[2], seed):
+        print(f"Wrote {path}")
+
+
+# Run the script
+if __name__ == "__main__":
+    execute()
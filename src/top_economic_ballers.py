@@ -7,50 +7,77 @@ in a bar chart.
 """
 
 import csv
-import matplotlib.pyplot as plt
 
-# Function to read CSV data and return a list of dictionaries
+import backends
+import cli
+import compressed
+import leaderboard
+
+# Columns used by calculate_economical_bowlers()
+MATCH_COLUMNS = ["id", "season"]
+DELIVERY_COLUMNS = ["match_id", "bowler", "total_runs"]
+
+# Function to stream CSV rows one at a time
 def read_data(file_path):
     """
-    Reads IPL data from a CSV file.
+    Reads IPL data from a CSV file (plain, .gz or .zst).
 
     Args:
         file_path (str): Path to the CSV file.
 
-    Returns:
-        list: List of dictionaries representing rows in the CSV.
+    Yields:
+        dict: One row of the CSV at a time.
     """
-    data = []
-    with open(file_path, 'r', encoding='utf-8') as file:
-        reader = csv.DictReader(file)
-        # Append each row as a dictionary
-        for match in reader:
-            data.append(match)
-    return data
+    with compressed.open_text(file_path) as file:
+        # Yield rows lazily so only the current row is held in memory
+        yield from csv.DictReader(file)
 
 
-# Function to calculate top 10 economical bowlers for IPL 2015
-def calculate_economical_bowlers_2015(matches, deliveries):
+# Function to create a running accumulator for one season's bowler economy
+def accumulator(matches, season="2015", count=10, min_balls=0):
     """
-    Calculates the top 10 economical bowlers in IPL 2015.
+    Creates an accumulator that tracks runs and balls per bowler in a season
+    one delivery at a time.
 
     Args:
-        matches (list): List of match records (dicts) from matches.csv.
-        deliveries (list): List of delivery records (dicts) from deliveries.csv.
+        matches (iterable): Match records (dicts) from matches.csv.
+        season (str): Season to rank bowlers for (2015 by default).
+        count (int): Number of bowlers to keep (10 by default).
+        min_balls (int): Minimum balls bowled to be ranked (0 ranks everybody).
 
     Returns:
-        dict: Dictionary of top 10 bowlers with their economy rates.
+        tuple: (update, finalize) functions. update(delivery) adds one delivery
+               record and finalize() returns the top 10 bowlers by economy.
     """
-    # Get all match IDs for the 2015 season
-    match_ids_2015 = {match["id"] for match in matches if match["season"] == "2015"}
+    # Get all match IDs for the season
+    season_match_ids = {match["id"] for match in matches if match["season"] == season}
+    update, totals = totals_accumulator(season_match_ids)
+
+    def finalize():
+        return rank_bowlers(totals(), count, min_balls)
+
+    return update, finalize
+
 
+# Function to create a running accumulator for runs and balls per bowler
+def totals_accumulator(match_ids):
+    """
+    Creates an accumulator that sums runs conceded and balls bowled per
+    bowler over a set of matches, e.g. the matches of one season.
+
+    Args:
+        match_ids (set): IDs of the matches to count.
+
+    Returns:
+        tuple: (update, finalize) functions. update(delivery) adds one delivery
+               record and finalize() returns (runs per bowler, balls per bowler).
+    """
     # Dictionaries to track total runs and balls bowled per bowler
     bowler_runs = {}
     bowler_balls = {}
 
-    # Loop through each delivery
-    for delivery in deliveries:
-        if delivery["match_id"] in match_ids_2015:
+    def update(delivery):
+        if delivery["match_id"] in match_ids:
             bowler = delivery["bowler"]
             total_runs = int(delivery["total_runs"])
 
@@ -59,49 +86,151 @@ def calculate_economical_bowlers_2015(matches, deliveries):
             # Count the number of balls bowled
             bowler_balls[bowler] = bowler_balls.get(bowler, 0) + 1
 
-    # Calculate economy rate for each bowler
-    economy = {}
-    for bowler in bowler_runs:
-        overs = bowler_balls[bowler] / 6  # 6 balls per over
-        economy[bowler] = bowler_runs[bowler] / overs if overs > 0 else 0
+    def finalize():
+        return bowler_runs, bowler_balls
+
+    return update, finalize
 
-    # Sort bowlers by economy rate (ascending) and take top 10
-    top_10 = dict(sorted(economy.items(), key=lambda x: x[1])[:10])
-    return top_10
+
+# Function to rank bowlers by economy from their runs and balls
+def rank_bowlers(totals, count=10, min_balls=0):
+    """
+    Ranks bowlers by economy rate (runs conceded per over).
+
+    Args:
+        totals (tuple): (runs per bowler, balls per bowler) dictionaries.
+        count (int): Number of bowlers to keep (10 by default).
+        min_balls (int): Minimum balls bowled to be ranked (0 ranks everybody).
+
+    Returns:
+        dict: Dictionary of the most economical bowlers with their economy rates.
+    """
+    bowler_runs, bowler_balls = totals
+
+    # Calculate economy rate for each qualifying bowler
+    economy = leaderboard.economy_rates(bowler_runs, bowler_balls, min_balls)
+
+    # Select the lowest economy rates with a bounded heap
+    return leaderboard.top_k(economy, count, descending=False)
+
+
+# Function to total runs conceded and balls bowled per bowler over some matches
+def calculate_bowler_totals(match_ids, deliveries):
+    """
+    Sums runs conceded and balls bowled per bowler over a set of matches
+    whose IDs are already known (e.g. shared by report_graph.py).
+
+    Args:
+        match_ids (set): IDs of the matches to count.
+        deliveries (iterable): Delivery records (dicts) from deliveries.csv.
+
+    Returns:
+        tuple: (runs per bowler, balls per bowler) dictionaries.
+    """
+    update, finalize = totals_accumulator(match_ids)
+
+    # Loop through each delivery
+    for delivery in deliveries:
+        update(delivery)
+
+    return finalize()
+
+
+# Function to calculate top 10 economical bowlers for a season
+def calculate_economical_bowlers(matches, deliveries, season, count=10, min_balls=0):
+    """
+    Calculates the top 10 economical bowlers in an IPL season.
+
+    Args:
+        matches (iterable): Match records (dicts) from matches.csv.
+        deliveries (iterable): Delivery records (dicts) from deliveries.csv.
+        season (str): Season to rank bowlers for, e.g. "2015".
+        count (int): Number of bowlers to keep (10 by default).
+        min_balls (int): Minimum balls bowled to be ranked (0 ranks everybody).
+
+    Returns:
+        dict: Dictionary of top 10 bowlers with their economy rates.
+    """
+    update, finalize = accumulator(matches, season, count, min_balls)
+
+    # Loop through each delivery
+    for delivery in deliveries:
+        update(delivery)
+
+    return finalize()
+
+
+# Function to calculate top 10 economical bowlers for IPL 2015
+def calculate_economical_bowlers_2015(matches, deliveries):
+    """
+    Calculates the top 10 economical bowlers in IPL 2015.
+
+    Args:
+        matches (iterable): Match records (dicts) from matches.csv.
+        deliveries (iterable): Delivery records (dicts) from deliveries.csv.
+
+    Returns:
+        dict: Dictionary of top 10 bowlers with their economy rates.
+    """
+    return calculate_economical_bowlers(matches, deliveries, "2015")
 
 
 # Function to plot top 10 economical bowlers as a bar chart
-def plot_economical_bowlers(top_10):
+def plot_economical_bowlers(top_10, show=True):
     """
     Plots a bar chart of top 10 economical bowlers in IPL 2015.
 
     Args:
         top_10 (dict): Dictionary of bowlers and their economy rates.
+        show (bool): Display the chart after saving it (False for batch rendering).
     """
+    # Imported here so computing without plotting never loads matplotlib
+    import matplotlib.pyplot as plt  # pylint: disable=import-outside-toplevel
+    import charts  # pylint: disable=import-outside-toplevel
+
     bowlers = list(top_10.keys())
     economies = list(top_10.values())
 
-    plt.figure(figsize=(10, 6))
+    charts.figure("bar")
     plt.bar(bowlers, economies, color='orange')
     plt.title("Top 10 Economical Bowlers in IPL 2015")
     plt.xlabel("Bowler")
     plt.ylabel("Economy Rate")
     plt.xticks(rotation=45)           # Rotate names for readability
     plt.tight_layout()                # Adjust layout to fit labels
-    plt.savefig("plots/top10_economical_bowlers_2015.png", dpi=300)  # Save figure
-    plt.show()                        # Display the plot
+    charts.save("plots/top10_economical_bowlers_2015.png")  # Save figure
+    if show:
+        plt.show()                    # Display the plot
+
+
+# Function to compute the chart data with the configured backend
+def compute():
+    """
+    Computes the top 10 economical bowlers of 2015 with the IPL_BACKEND backend.
+
+    Returns:
+        dict: Dictionary of top 10 bowlers with their economy rates.
+    """
+    return backends.compute("economical_bowlers", season="2015", count=10, min_balls=0)
 
 
 # Main execution function
-def execute():
+def execute(show=True, output_format=None):
     """
     Reads data, calculates top 10 economical bowlers, and plots the results.
+
+    Args:
+        show (bool): Display the chart after saving it.
+        output_format (str, optional): "json" or "csv" to print the result
+            instead of plotting it.
     """
-    matches = read_data("data/matches.csv")        # Read match data
-    deliveries = read_data("data/deliveries.csv")  # Read delivery data
-    top_10 = calculate_economical_bowlers_2015(matches, deliveries)  # Calculate top 10
-    plot_economical_bowlers(top_10)               # Plot chart
+    top_10 = compute()    # Calculate top 10
+    if output_format:
+        cli.emit(top_10, output_format, ["bowler", "economy"])
+    else:
+        plot_economical_bowlers(top_10, show)         # Plot chart
 
 
 # Run the script
-execute()
+if __name__ == "__main__":
+    execute(output_format=cli.output_format(__doc__))
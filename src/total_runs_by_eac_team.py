@@ -7,27 +7,56 @@ and generates a bar chart visualization.
 """
 
 import csv
-import matplotlib.pyplot as plt
 
-# Function to read data from a CSV file
+import backends
+import cli
+import compressed
+
+# Delivery columns used by calculate()
+DELIVERY_COLUMNS = ["batting_team", "total_runs"]
+
+# Function to stream data from a CSV file
 def read_data(file_path):
     """
-    Reads IPL delivery data from a CSV file.
+    Reads IPL delivery data from a CSV file (plain, .gz or .zst).
 
     Args:
         file_path (str): Path to the CSV file containing delivery data.
 
+    Yields:
+        dict: One delivery record at a time.
+    """
+    # Open the CSV file as UTF-8 text, decompressing .gz or .zst files
+    with compressed.open_text(file_path) as file:
+        # Yield rows lazily so only the current row is held in memory
+        yield from csv.DictReader(file)
+
+
+# Function to create a running accumulator for team run totals
+def accumulator():
+    """
+    Creates an accumulator that sums runs per batting team one delivery at a time.
+
     Returns:
-        list: List of dictionaries, each representing a delivery record.
+        tuple: (update, finalize) functions. update(delivery) adds one delivery
+               record and finalize() returns the runs per team.
     """
-    data = []
-    # Open the CSV file with UTF-8 encoding
-    with open(file_path, 'r', encoding='utf-8') as file:
-        deliveries_data = csv.DictReader(file)
-        # Append each delivery row as a dictionary to the data list
-        for match in deliveries_data:
-            data.append(match)
-    return data
+    total_runs_by_team = {}
+
+    def update(delivery):
+        team = delivery["batting_team"]             # Get the batting team
+        runs = int(delivery["total_runs"])          # Convert total_runs to integer
+
+        # Add runs to the existing team total or initialize if first occurrence
+        if team in total_runs_by_team:
+            total_runs_by_team[team] += runs
+        else:
+            total_runs_by_team[team] = runs
+
+    def finalize():
+        return total_runs_by_team
+
+    return update, finalize
 
 
 # Function to calculate total runs scored by each team
@@ -36,60 +65,77 @@ def calculate(data):
     Calculates total runs scored by each IPL team.
 
     Args:
-        data (list): List of IPL delivery records (dicts).
+        data (iterable): IPL delivery records (dicts).
 
     Returns:
         dict: Dictionary with team names as keys and total runs as values.
     """
-    total_runs_by_team = {}
+    update, finalize = accumulator()
 
     # Loop through each delivery in the data
-    for match in data:
-        team = match["batting_team"]             # Get the batting team
-        runs = int(match["total_runs"])          # Convert total_runs to integer
+    for delivery in data:
+        update(delivery)
 
-        # Add runs to the existing team total or initialize if first occurrence
-        if team in total_runs_by_team:
-            total_runs_by_team[team] += runs
-        else:
-            total_runs_by_team[team] = runs
-
-    return total_runs_by_team
+    return finalize()
 
 
 # Function to plot total runs by team as a bar chart
-def plot(total_runs_by_team):
+def plot(total_runs_by_team, show=True):
     """
     Plots a bar chart of total runs scored by each IPL team.
 
     Args:
         total_runs_by_team (dict): Team names as keys and total runs as values.
+        show (bool): Display the chart after saving it (False for batch rendering).
     """
+    # Imported here so computing without plotting never loads matplotlib
+    import matplotlib.pyplot as plt  # pylint: disable=import-outside-toplevel
+    import charts  # pylint: disable=import-outside-toplevel
+
     teams = list(total_runs_by_team.keys())
     runs = list(total_runs_by_team.values())
 
     # Create a figure for the plot
-    plt.figure(figsize=(12, 6))
+    charts.figure("wide_bar")
     plt.bar(teams, runs, color='crimson')            # Bar chart
     plt.title("Total Runs Scored by Each IPL Team")  # Title
     plt.xlabel("Teams")                              # X-axis label
     plt.ylabel("Total Runs")                         # Y-axis label
     plt.xticks(rotation=90)                          # Rotate team names for readability
     plt.tight_layout()                               # Adjust layout to fit labels
-    plt.savefig("plots/total_runs_by_team.png", dpi=300)  # Save plot as PNG
-    plt.show()                                      # Display plot
+    charts.save("plots/total_runs_by_team.png")  # Save plot as PNG
+    if show:
+        plt.show()                                  # Display plot
+
+
+# Function to compute the chart data with the configured backend
+def compute():
+    """
+    Computes the total runs scored by each team with the IPL_BACKEND backend.
+
+    Returns:
+        dict: Dictionary with team names as keys and total runs as values.
+    """
+    return backends.compute("total_runs_by_team")
 
 
 # Main execution function
-def execute():
+def execute(show=True, output_format=None):
     """
     Main function to execute the data reading, calculation, and plotting steps.
+
+    Args:
+        show (bool): Display the chart after saving it.
+        output_format (str, optional): "json" or "csv" to print the result
+            instead of plotting it.
     """
-    file_path = "data/deliveries.csv"       # Path to CSV file
-    data = read_data(file_path)             # Read delivery data
-    total_runs_by_team = calculate(data)    # Calculate total runs by team
-    plot(total_runs_by_team)                # Generate bar chart
+    total_runs_by_team = compute()    # Calculate total runs by team
+    if output_format:
+        cli.emit(total_runs_by_team, output_format, ["team", "runs"])
+    else:
+        plot(total_runs_by_team, show)          # Generate bar chart
 
 
 # Run the program
-execute()
+if __name__ == "__main__":
+    execute(output_format=cli.output_format(__doc__))
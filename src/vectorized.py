@@ -0,0 +1,280 @@
+"""
+vectorized.py
+
+This script holds NumPy group-by versions of every calculate() function.
+They work on the integer-coded columns of the columnar cache
+(columnar_cache.load_table) and use np.bincount instead of per-row Python
+loops. Results are identical to the loop versions, including the order of
+the returned dictionaries, which follows first appearance in the data just
+like the loops do.
+
+Set the IPL_BACKEND environment variable to "numpy" (read in cli.py) to make
+the analysis scripts use these functions.
+"""
+
+import numpy as np
+
+
+# Function to total values per group code in first-appearance order
+def grouped_totals(codes, values=None):
+    """
+    Sums values per integer code, like a dict built with a loop would.
+
+    Args:
+        codes (ndarray): Integer group code of every row.
+        values (ndarray, optional): Value of every row. Rows are counted if omitted.
+
+    Returns:
+        tuple: (keys, totals, first_rows) arrays, ordered by the first row in
+               which each code appears.
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    if codes.size == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty
+
+    keys, first_rows = np.unique(codes, return_index=True)
+    order = np.argsort(first_rows, kind='stable')
+    keys, first_rows = keys[order], first_rows[order]
+
+    if values is None:
+        totals = np.bincount(codes)
+    else:
+        # Float weights are exact for integer sums below 2**53
+        totals = np.bincount(codes, weights=values).astype(np.int64)
+    return keys, totals[keys], first_rows
+
+
+# Function to pick the top N groups, ties kept in first-appearance order
+def top_n(keys, scores, count, descending):
+    """
+    Selects the best groups exactly like sorted(...)[:count] on an
+    insertion-ordered dict (a stable sort).
+
+    np.argpartition finds the count-th best score without sorting every
+    group. Only the groups scoring at least as well (ties included) are then
+    sorted, keeping ties in first-appearance order.
+
+    Args:
+        keys (ndarray): Group codes in first-appearance order.
+        scores (ndarray): Score of each group.
+        count (int): Number of groups to keep (none if 0 or less).
+        descending (bool): True to keep the highest scores.
+
+    Returns:
+        tuple: (keys, scores) of the selected groups in ranked order.
+    """
+    if count <= 0:
+        return keys[:0], scores[:0]
+    ranked = -scores if descending else scores
+    if count < ranked.size:
+        # Threshold score of the last selected group
+        threshold = ranked[np.argpartition(ranked, count - 1)[count - 1]]
+        candidates = np.flatnonzero(ranked <= threshold)
+    else:
+        candidates = np.arange(ranked.size)
+    order = candidates[np.argsort(ranked[candidates], kind='stable')[:count]]
+    return keys[order], scores[order]
+
+
+# Function to map each delivery to the season of its match
+def delivery_seasons(matches, deliveries):
+    """
+    Looks up the season of every delivery through its match ID.
+
+    Args:
+        matches (tuple): (columns, dictionaries) of matches.csv.
+        deliveries (tuple): (columns, dictionaries) of deliveries.csv.
+
+    Returns:
+        ndarray: Season of each delivery, or -1 if its match is unknown.
+    """
+    match_columns, _ = matches
+    delivery_columns, _ = deliveries
+    match_ids = np.asarray(match_columns["id"])
+    delivery_match_ids = np.asarray(delivery_columns["match_id"])
+
+    size = int(max(match_ids.max(initial=0), delivery_match_ids.max(initial=0))) + 1
+    season_by_id = np.full(size, -1, dtype=np.int32)
+    season_by_id[match_ids] = match_columns["season"]
+    return season_by_id[delivery_match_ids]
+
+
+# Vectorized version of Top_batsmen_RCB.calculate
+def top_batsmen(deliveries, team, count=10):
+    """
+    Calculates the top 10 batsmen for a team by total runs.
+
+    Args:
+        deliveries (tuple): (columns, dictionaries) of deliveries.csv.
+        team (str): Batting team to rank batsmen for.
+        count (int): Number of batsmen to keep (10 by default).
+
+    Returns:
+        dict: Dictionary of top 10 batsmen and their total runs.
+    """
+    columns, dictionaries = deliveries
+    teams = dictionaries["batting_team"]
+    players = dictionaries["batsman"]
+    if team not in teams:
+        return {}
+
+    batting = np.asarray(columns["batting_team"]) == teams.index(team)
+    keys, totals, _ = grouped_totals(columns["batsman"][batting], columns["batsman_runs"][batting])
+    keys, totals = top_n(keys, totals, count, descending=True)
+    return {players[key]: int(total) for key, total in zip(keys, totals)}
+
+
+# Vectorized version of total_runs_by_eac_team.calculate
+def total_runs_by_team(deliveries):
+    """
+    Calculates total runs scored by each IPL team.
+
+    Args:
+        deliveries (tuple): (columns, dictionaries) of deliveries.csv.
+
+    Returns:
+        dict: Dictionary with team names as keys and total runs as values.
+    """
+    columns, dictionaries = deliveries
+    teams = dictionaries["batting_team"]
+    keys, totals, _ = grouped_totals(columns["batting_team"], columns["total_runs"])
+    return {teams[key]: int(total) for key, total in zip(keys, totals)}
+
+
+# Vectorized version of Extra_runs _conceded_per_team.calculate
+def extra_runs(matches, deliveries, season):
+    """
+    Calculates the total extra runs conceded by each IPL team in a season.
+
+    Args:
+        matches (tuple): (columns, dictionaries) of matches.csv.
+        deliveries (tuple): (columns, dictionaries) of deliveries.csv.
+        season (str): Season to count, e.g. "2016".
+
+    Returns:
+        dict: Dictionary with team names as keys and total extra runs conceded as values.
+    """
+    columns, dictionaries = deliveries
+    teams = dictionaries["bowling_team"]
+    in_season = delivery_seasons(matches, deliveries) == int(season)
+    keys, totals, _ = grouped_totals(columns["bowling_team"][in_season],
+                                     columns["extra_runs"][in_season])
+    return {teams[key]: int(total) for key, total in zip(keys, totals)}
+
+
+# Vectorized version of top_economic_ballers.calculate_economical_bowlers
+def economical_bowlers(matches, deliveries, season, count=10, min_balls=0):
+    """
+    Calculates the top 10 economical bowlers in an IPL season.
+
+    Args:
+        matches (tuple): (columns, dictionaries) of matches.csv.
+        deliveries (tuple): (columns, dictionaries) of deliveries.csv.
+        season (str): Season to rank bowlers for, e.g. "2015".
+        count (int): Number of bowlers to keep (10 by default).
+        min_balls (int): Minimum balls bowled to be ranked (0 ranks everybody).
+
+    Returns:
+        dict: Dictionary of top 10 bowlers with their economy rates.
+    """
+    columns, dictionaries = deliveries
+    players = dictionaries["bowler"]
+    in_season = delivery_seasons(matches, deliveries) == int(season)
+    bowlers = columns["bowler"][in_season]
+
+    keys, runs, _ = grouped_totals(bowlers, columns["total_runs"][in_season])
+    _, balls, _ = grouped_totals(bowlers)
+
+    # Drop bowlers below the qualification threshold
+    qualified = balls >= min_balls
+    keys, runs, balls = keys[qualified], runs[qualified], balls[qualified]
+
+    # Same float operations as the loop: runs / (balls / 6)
+    economy = runs / (balls / 6)
+    keys, economy = top_n(keys, economy, count, descending=False)
+    return {players[key]: float(rate) for key, rate in zip(keys, economy)}
+
+
+# Vectorized version of matches_played_per_year.calculate
+def matches_per_year(matches):
+    """
+    Calculates the number of matches played in each IPL season.
+
+    Args:
+        matches (tuple): (columns, dictionaries) of matches.csv.
+
+    Returns:
+        dict: Dictionary where keys are seasons and values are total matches played.
+    """
+    columns, _ = matches
+    keys, counts, _ = grouped_totals(columns["season"])
+    return {str(key): int(count) for key, count in zip(keys, counts)}
+
+
+# Function to count (season, team) pairs into a nested dictionary
+def season_team_counts(seasons, teams, team_names):
+    """
+    Counts rows per season and team.
+
+    Args:
+        seasons (ndarray): Season of every row.
+        teams (ndarray): Team code of every row.
+        team_names (list): Labels of the team codes.
+
+    Returns:
+        dict: Nested dictionary {season: {team: count}} in first-appearance order.
+    """
+    seasons = np.asarray(seasons, dtype=np.int64)
+    teams = np.asarray(teams, dtype=np.int64)
+    team_count = len(team_names)
+
+    # Encode (season, team) as one key so a single bincount does the grouping
+    keys, counts, _ = grouped_totals(seasons * team_count + teams)
+
+    result = {}
+    for key, count in zip(keys.tolist(), counts.tolist()):
+        season, team = divmod(key, team_count)
+        result.setdefault(str(season), {})[team_names[team]] = count
+    return result
+
+
+# Vectorized version of matches_played by_team_by_season.calculate
+def matches_played_by_team(matches):
+    """
+    Calculates the number of matches played by each team per season.
+
+    Args:
+        matches (tuple): (columns, dictionaries) of matches.csv.
+
+    Returns:
+        dict: Nested dictionary {season: {team: matches played}}.
+    """
+    columns, dictionaries = matches
+    # Interleave team1/team2 so rows keep the loop's visiting order
+    teams = np.stack([columns["team1"], columns["team2"]], axis=1).ravel()
+    seasons = np.repeat(np.asarray(columns["season"]), 2)
+    return season_team_counts(seasons, teams, dictionaries["team1"])
+
+
+# Vectorized version of matches_won-per_team_per_year.calculate
+def matches_won_per_team(matches):
+    """
+    Calculates the number of matches won by each team per season.
+
+    Args:
+        matches (tuple): (columns, dictionaries) of matches.csv.
+
+    Returns:
+        dict: Nested dictionary {season: {team: wins}}.
+    """
+    columns, dictionaries = matches
+    team_names = dictionaries["winner"]
+    winners = np.asarray(columns["winner"])
+    seasons = np.asarray(columns["season"])
+
+    # Skip matches with no winner (e.g., abandoned matches)
+    if "" in team_names:
+        decided = winners != team_names.index("")
+        winners, seasons = winners[decided], seasons[decided]
+    return season_team_counts(seasons, winners, team_names)